@@ -0,0 +1,120 @@
+"""
+Pruebas de los bucles para: el código intermedio y el Python generado deben
+imprimir lo mismo, también con pasos distintos de 1 y con bucles que bajan.
+"""
+import contextlib
+import io
+import operator
+import os
+import subprocess
+import sys
+import tempfile
+
+from compilador import Compilador
+from intermediate_code import compilar
+
+OPERADORES = {'+': operator.add, '-': operator.sub, '*': operator.mul,
+              '==': operator.eq, '!=': operator.ne, '<': operator.lt,
+              '>': operator.gt, '<=': operator.le, '>=': operator.ge}
+
+CASOS = {
+    'baja de 1 en 1': """
+para (entero i = 3; i > 0; i = i - 1) {
+  print(i);
+}
+""",
+    'sube de 3 en 3': """
+para (entero j = 0; j <= 10; j = j + 3) {
+  print(j);
+}
+""",
+    'baja de 2 en 2': """
+para (entero k = 10; k > 0; k = k - 2) {
+  print(k);
+}
+""",
+    'decremento --': """
+para (entero m = 7; m >= 5; m--) {
+  print(m);
+}
+""",
+    'sin iteraciones': """
+para (entero n = 0; n > 5; n++) {
+  print(n);
+}
+""",
+    'anidados': """
+entero total = 0;
+para (entero a = 4; a != 0; a = a - 2) {
+  para (entero b = 1; b < a; b = b + 2) {
+    total = total + b;
+    print(total);
+  }
+}
+""",
+}
+
+
+def interpretar(codigo_intermedio):
+    """Ejecuta el código intermedio en texto y devuelve lo que imprime"""
+    lineas = [linea.split() for linea in codigo_intermedio]
+    etiquetas = {partes[0][:-1]: i for i, partes in enumerate(lineas) if partes and partes[0].endswith(':')}
+    valores = {}
+    salida = []
+
+    def valor(texto):
+        if texto in valores:
+            return valores[texto]
+        return float(texto) if '.' in texto else int(texto)
+
+    i = 0
+    while i < len(lineas):
+        partes = lineas[i]
+        i += 1
+        if partes[0] == 'goto':
+            i = etiquetas[partes[1]]
+        elif partes[0] == 'if':
+            if valor(partes[1]):
+                i = etiquetas[partes[3]]
+        elif partes[0] == 'print':
+            salida.append(str(valor(partes[1])))
+        elif len(partes) == 3:
+            valores[partes[0]] = valor(partes[2])
+        elif len(partes) == 5:
+            valores[partes[0]] = OPERADORES[partes[3]](valor(partes[2]), valor(partes[4]))
+    return salida
+
+
+def ejecutar_python(codigo_fuente):
+    """Compila a Python con el Compilador completo, lo ejecuta y devuelve lo que imprime"""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'programa.py')
+        with contextlib.redirect_stdout(io.StringIO()):
+            compilado = Compilador().compilar(codigo_fuente, ruta)
+        if not compilado:
+            return None
+        resultado = subprocess.run([sys.executable, ruta], capture_output=True, text=True, check=True)
+        return resultado.stdout.split()
+
+
+def main():
+    fallidas = 0
+    for nombre, codigo_fuente in CASOS.items():
+        codigo_intermedio, errores = compilar(codigo_fuente)
+        if errores:
+            print(f"FALLA {nombre}: {errores}")
+            fallidas += 1
+            continue
+        esperado = interpretar(codigo_intermedio)
+        obtenido = ejecutar_python(codigo_fuente)
+        if obtenido == esperado:
+            print(f"ok    {nombre}: {' '.join(esperado)}")
+        else:
+            print(f"FALLA {nombre}: código intermedio {esperado}, Python {obtenido}")
+            fallidas += 1
+    print(f"{len(CASOS) - fallidas} de {len(CASOS)} casos iguales")
+    return fallidas
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
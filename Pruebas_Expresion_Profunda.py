@@ -0,0 +1,74 @@
+"""
+Pruebas de expresiones profundas: el Compilador completo debe compilar una
+expresión de un millón de términos (un árbol inclinado a la izquierda de esa
+profundidad) sin RecursionError y en un tiempo lineal en la cantidad de
+términos, con ambos motores sintácticos.
+"""
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+from compilador import Compilador
+from benchmarks import generar_expresion_profunda
+
+TERMINOS = 1_000_000
+# Parecido al límite de benchmark_expresion_profunda, pero para todas las fases juntas
+LIMITE_US = 100.0
+
+
+def generar_parentesis_profundos(niveles):
+    """Programa con 'niveles' paréntesis anidados: ((((x + 1) + 2) + 3) ...)"""
+    partes = ['entero x = 1;\nprint(', '(' * niveles, 'x']
+    partes.extend(f' + {i % 10})' for i in range(1, niveles + 1))
+    partes.append(');\n')
+    return ''.join(partes)
+
+
+def compilar(codigo_fuente, motor, terminos):
+    """Compila con el Compilador completo; devuelve un mensaje de error o None"""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'programa.py')
+        inicio = time.perf_counter()
+        # La salida del compilador repite los tokens y el AST: millones de líneas
+        with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+            try:
+                compilado = Compilador(motor_sintactico=motor).compilar(codigo_fuente, ruta)
+            except RecursionError:
+                return "RecursionError"
+        segundos = time.perf_counter() - inicio
+        if not compilado:
+            return "la compilación falló"
+        with open(ruta) as archivo:
+            impresion = next(linea for linea in archivo if 'print(' in linea)
+        operadores = impresion.count(' + ') + impresion.count(' - ')
+    us = segundos / terminos * 1e6
+    print(f"      {motor:<12} {terminos} términos  {segundos:.2f} s  {us:.2f} us/término")
+    if operadores != terminos - 1:
+        return f"el código generado tiene {operadores + 1} términos"
+    if us > LIMITE_US:
+        return f"{us:.2f} us/término supera el límite de {LIMITE_US}"
+    return None
+
+
+def main():
+    casos = (
+        ('suma inclinada a la izquierda', generar_expresion_profunda(TERMINOS), TERMINOS),
+        ('paréntesis anidados', generar_parentesis_profundos(TERMINOS // 10), TERMINOS // 10 + 1),
+    )
+    fallidas = 0
+    for nombre, codigo_fuente, terminos in casos:
+        print(nombre)
+        for motor in ('lalr', 'descendente'):
+            error = compilar(codigo_fuente, motor, terminos)
+            if error:
+                print(f"FALLA {nombre} ({motor}): {error}")
+                fallidas += 1
+    total = 2 * len(casos)
+    print(f"{total - fallidas} de {total} compilaciones correctas")
+    return fallidas
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
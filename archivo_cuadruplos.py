@@ -0,0 +1,262 @@
+"""
+Código intermedio en archivos: formato binario y lectura del texto.
+
+El formato binario guarda las columnas de una TablaCuadruplos (ver
+cuadruplos.py) tal como están en memoria, en little-endian:
+
+    cabecera   MAGIA, VERSION, 0, instrucciones, nombres, constantes
+    columnas   resultados, operandos1, operandos2 (int32 cada uno),
+               operaciones y tipos (un byte cada uno), relleno hasta 4 bytes
+    textos     nombres + constantes + 1 desplazamientos (uint32) y después
+               los textos en UTF-8, uno tras otro
+
+Los operandos se guardan con la misma codificación que en la tabla, así que
+ArchivoCuadruplos proyecta el archivo con mmap y lee cada instrucción
+directamente de las columnas, sin copiarlas; los textos de nombres y
+constantes se decodifican la primera vez que se usan. VERSION cambia cada vez
+que cambia el formato o el orden de OPERACIONES o TIPOS_RESULTADO.
+
+leer_texto reconstruye la tabla a partir del texto (print, goto, if ...
+goto, x = a, t = a op b, L:). El texto no lleva los tipos y una constante
+caracter se escribe igual que una variable de una letra, que es como se lee;
+el formato binario conserva ambas cosas.
+"""
+import mmap
+import struct
+import sys
+from array import array
+
+from cuadruplos import (VistaCuadruplos, TablaCuadruplos, ID_OPERACION, LABEL, GOTO, IF, PRINT, COPIA,
+                        NOMBRE, CONSTANTE, TEMPORAL)
+
+MAGIA = b'CUAD'
+VERSION = 1
+EXTENSION = '.cuad'
+
+# magia, versión, reservado, cantidad de instrucciones, de nombres y de constantes
+_CABECERA = struct.Struct('<4sHHIII')
+_INVERTIR = sys.byteorder != 'little'
+
+# Operaciones de 't = a op b'; '=' sola es una copia
+_BINARIAS = {operacion: codigo for operacion, codigo in ID_OPERACION.items() if codigo > COPIA}
+
+
+def _bytes(columna):
+    """Bytes de una columna en little-endian"""
+    if _INVERTIR:
+        columna = array(columna.typecode, columna)
+        columna.byteswap()
+    return columna
+
+
+def guardar(codigo, ruta):
+    """Guarda en formato binario una TablaCuadruplos (o un ArchivoCuadruplos)"""
+    n = len(codigo)
+    nombres = codigo.textos_nombre()
+    textos = [texto.encode('utf-8') for texto in (*nombres, *codigo.constantes)]
+    desplazamientos = array('I', [0])
+    for texto in textos:
+        desplazamientos.append(desplazamientos[-1] + len(texto))
+    with open(ruta, 'wb') as archivo:
+        archivo.write(_CABECERA.pack(MAGIA, VERSION, 0, n, len(nombres), len(codigo.constantes)))
+        for columna in (codigo.resultados, codigo.operandos1, codigo.operandos2):
+            archivo.write(_bytes(columna))
+        archivo.write(codigo.operaciones)
+        archivo.write(codigo.tipos)
+        archivo.write(bytes(-2 * n % 4))
+        archivo.write(_bytes(desplazamientos))
+        archivo.write(b''.join(textos))
+
+
+class ArchivoCuadruplos(VistaCuadruplos):
+    """
+    Código intermedio en formato binario, proyectado en memoria.
+
+    Se recorre igual que una TablaCuadruplos (len, [], iteración, linea,
+    lineas) pero es de solo lectura; tabla() lo copia a una TablaCuadruplos.
+
+    Args:
+        ruta: Archivo escrito con guardar()
+    """
+    __slots__ = ('ruta', 'operaciones', 'resultados', 'operandos1', 'operandos2', 'tipos',
+                 'cantidad_nombres', 'cantidad_constantes', '_memoria', '_vistas',
+                 '_desplazamientos', '_textos', '_cache')
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with open(ruta, 'rb') as archivo:
+            self._memoria = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self._vistas = []
+        try:
+            self._proyectar()
+        except Exception:
+            self.cerrar()
+            raise
+
+    def _proyectar(self):
+        memoria = self._memoria
+        if len(memoria) < _CABECERA.size:
+            raise ValueError(f"{self.ruta}: no es un archivo de código intermedio")
+        magia, version, _, n, nombres, constantes = _CABECERA.unpack_from(memoria)
+        if magia != MAGIA:
+            raise ValueError(f"{self.ruta}: no es un archivo de código intermedio")
+        if version != VERSION:
+            raise ValueError(f"{self.ruta}: versión {version} del formato no soportada (se espera {VERSION})")
+        self.cantidad_nombres = nombres
+        self.cantidad_constantes = constantes
+        inicio = _CABECERA.size
+        self.resultados, inicio = self._columna(inicio, n, 'i')
+        self.operandos1, inicio = self._columna(inicio, n, 'i')
+        self.operandos2, inicio = self._columna(inicio, n, 'i')
+        self.operaciones, inicio = self._columna(inicio, n, 'B')
+        self.tipos, inicio = self._columna(inicio, n, 'B')
+        inicio += -inicio % 4
+        self._desplazamientos, inicio = self._columna(inicio, nombres + constantes + 1, 'I')
+        self._textos = self._vista(inicio, len(memoria))
+        if len(self._textos) != self._desplazamientos[-1]:
+            raise ValueError(f"{self.ruta}: archivo truncado o dañado")
+        # Texto de cada nombre y constante ya decodificado (None si aún no se usó)
+        self._cache = [None] * (nombres + constantes)
+
+    def _vista(self, inicio, fin):
+        vista = memoryview(self._memoria)[inicio:fin]
+        self._vistas.append(vista)
+        return vista
+
+    def _columna(self, inicio, n, codigo):
+        """Columna de n elementos desde inicio, y dónde termina"""
+        fin = inicio + n * struct.calcsize(codigo)
+        if fin > len(self._memoria):
+            raise ValueError(f"{self.ruta}: archivo truncado o dañado")
+        columna = self._vista(inicio, fin).cast(codigo)
+        self._vistas.append(columna)
+        if _INVERTIR and columna.itemsize > 1:
+            columna = array(codigo, columna)
+            columna.byteswap()
+        return columna, fin
+
+    def _texto(self, i):
+        texto = self._cache[i]
+        if texto is None:
+            desplazamientos = self._desplazamientos
+            texto = self._cache[i] = str(self._textos[desplazamientos[i]:desplazamientos[i + 1]], 'utf-8')
+        return texto
+
+    def texto(self, operando):
+        """Texto de un operando (None si es SIN_OPERANDO)"""
+        if operando < 0:
+            return None
+        clase = operando & 3
+        if clase == NOMBRE:
+            return self._texto(operando >> 2)
+        if clase == CONSTANTE:
+            return self._texto(self.cantidad_nombres + (operando >> 2))
+        return ('t%d' if clase == TEMPORAL else 'L%d') % (operando >> 2)
+
+    def textos_nombre(self):
+        """Texto de cada nombre, indexado por id"""
+        return [self._texto(i) for i in range(self.cantidad_nombres)]
+
+    @property
+    def constantes(self):
+        """Texto de cada constante, indexado por su número en los operandos"""
+        inicio = self.cantidad_nombres
+        return [self._texto(inicio + i) for i in range(self.cantidad_constantes)]
+
+    def tabla(self):
+        """Copia completa en una TablaCuadruplos nueva, con su propia tabla de nombres"""
+        tabla = TablaCuadruplos()
+        for texto in self.textos_nombre():
+            tabla.nombres.internar(texto)
+        tabla.constantes.extend(self.constantes)
+        tabla.ids_constante.update(zip(tabla.constantes, range(len(tabla.constantes))))
+        for columna in ('operaciones', 'resultados', 'operandos1', 'operandos2', 'tipos'):
+            getattr(tabla, columna).frombytes(memoryview(getattr(self, columna)).cast('B'))
+        return tabla
+
+    def cerrar(self):
+        """Libera la proyección; las instrucciones dejan de poder leerse"""
+        for vista in reversed(self._vistas):
+            vista.release()
+        self._vistas = []
+        self._memoria.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+def cargar(ruta):
+    """Lee un archivo binario completo en una TablaCuadruplos"""
+    with ArchivoCuadruplos(ruta) as archivo:
+        return archivo.tabla()
+
+
+def es_binario(ruta):
+    """True si el archivo empieza con la marca del formato binario"""
+    with open(ruta, 'rb') as archivo:
+        return archivo.read(len(MAGIA)) == MAGIA
+
+
+def leer_texto(lineas, nombres=None):
+    """
+    Reconstruye una TablaCuadruplos a partir del código intermedio en texto.
+
+    Args:
+        lineas: Las instrucciones, una por línea (una lista o un archivo abierto)
+        nombres: Tabla de nombres donde internar las variables
+
+    Raises:
+        ValueError: Si una línea no es una instrucción válida
+    """
+    tabla = TablaCuadruplos(nombres)
+    agregar, operando = tabla.agregar, tabla.operando
+    for numero, linea in enumerate(lineas, 1):
+        partes = linea.split()
+        n = len(partes)
+        if n == 3 and partes[1] == '=':
+            agregar(COPIA, operando(partes[0]), operando(partes[2]))
+        elif n == 5 and partes[1] == '=' and partes[3] in _BINARIAS:
+            agregar(_BINARIAS[partes[3]], operando(partes[0]), operando(partes[2]), operando(partes[4]))
+        elif n == 1 and partes[0].endswith(':'):
+            agregar(LABEL, operando(partes[0][:-1]))
+        elif n == 2 and partes[0] == 'goto':
+            agregar(GOTO, operando(partes[1]))
+        elif n == 4 and partes[0] == 'if' and partes[2] == 'goto':
+            agregar(IF, operando(partes[3]), operando(partes[1]))
+        elif n == 2 and partes[0] == 'print':
+            agregar(PRINT, operando(partes[1]))
+        elif n:
+            raise ValueError(f"Línea {numero}: instrucción de código intermedio no válida: {linea.strip()!r}")
+    return tabla
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    texto = """x = 5
+L0:
+t0 = x > 0
+if t0 goto L1
+goto L2
+L1:
+t1 = x - 1
+x = t1
+print x
+goto L0
+L2:
+"""
+    tabla = leer_texto(texto.splitlines())
+    print(f"{len(tabla)} instrucciones leídas del texto")
+    ruta = os.path.join(tempfile.mkdtemp(), 'programa' + EXTENSION)
+    guardar(tabla, ruta)
+    print(f"{ruta}: {os.path.getsize(ruta)} bytes")
+    with ArchivoCuadruplos(ruta) as archivo:
+        for linea in archivo.lineas():
+            print(linea)
+        print("instrucción 6:", archivo[6])
+        print("igual al texto:", '\n'.join(archivo.lineas()) + '\n' == texto)
+    os.remove(ruta)
@@ -0,0 +1,269 @@
+"""
+AST en columnas.
+
+En lugar de tuplas anidadas, cada nodo es un índice en arreglos paralelos
+(estructura de arreglos): tipo de nodo como entero pequeño, valor (id de
+nombre o índice de constante), fin de su rango de hijos e inicio y fin en el
+código fuente. Los hijos de todos los nodos se guardan en un solo arreglo, así
+que el árbol completo ocupa unos pocos bloques de memoria contigua.
+
+Los nodos se agregan con los hijos antes que el padre y la raíz es el último,
+así que recorrer los índices de 0 a len(arena) visita cada nodo después de
+sus hijos sin pila ni recursión. a_tupla() reconstruye la vista de tuplas
+que usan las fases existentes, idéntica a la que produce el parser.
+"""
+from array import array
+
+from flujo_tokens import VistaTokens, tokenizar
+from nombres import TablaNombres
+from parser_descendente import ParserDescendente
+from tipos import Caracter
+
+TIPOS_NODO = (
+    'programa', 'bloque',
+    'declaracion', 'asignacion', 'imprimir',
+    'si', 'si_sino', 'mientras', 'para',
+    'condicion', 'operacion',
+    'identificador', 'entero', 'decimal', 'caracter', 'booleano',
+)
+ID_NODO = {tipo: i for i, tipo in enumerate(TIPOS_NODO)}
+
+PROGRAMA = ID_NODO['programa']
+BLOQUE = ID_NODO['bloque']
+IDENTIFICADOR = ID_NODO['identificador']
+CARACTER = ID_NODO['caracter']
+# Nodos cuyo valor (tipo declarado u operador) va en la tupla antes que los hijos
+CON_VALOR = frozenset((ID_NODO['declaracion'], ID_NODO['condicion'], ID_NODO['operacion']))
+HOJAS = frozenset(range(IDENTIFICADOR, len(TIPOS_NODO)))
+
+# Tipo de hoja según el token que la produjo
+HOJA_POR_TOKEN = {
+    'IDENTIFICADOR': IDENTIFICADOR,
+    'NUMERO': ID_NODO['entero'],
+    'DECIMAL': ID_NODO['decimal'],
+    'CARACTER': ID_NODO['caracter'],
+    'TRUE': ID_NODO['booleano'],
+    'FALSE': ID_NODO['booleano'],
+}
+
+SIN_VALOR = 0xFFFFFFFF
+
+
+class ArenaAST:
+    """
+    Nodos del AST almacenados en arreglos paralelos de enteros.
+
+    Args:
+        nombres: Tabla de nombres de los identificadores
+        constantes: Lista de valores de los literales; ParserArena usa la
+            tabla de valores del flujo de tokens, así que cada literal tiene
+            el mismo índice que su token
+    """
+    def __init__(self, nombres=None, constantes=None):
+        self.tipos = array('B')
+        self.valores = array('I')
+        # Los hijos del nodo n son hijos[limites[n - 1]:limites[n]]
+        self.limites = array('I')
+        self.hijos = array('I')
+        self.inicios = array('I')
+        self.fines = array('I')
+        self.constantes = constantes if constantes is not None else []
+        self.indice_constantes = {}
+        self.nombres = nombres if nombres is not None else TablaNombres()
+        self.raiz = None
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def agregar(self, tipo, valor, hijos, inicio, fin):
+        """Agrega un nodo y devuelve su índice"""
+        self.hijos.extend(hijos)
+        self.limites.append(len(self.hijos))
+        self.valores.append(valor)
+        self.inicios.append(inicio)
+        self.fines.append(fin)
+        self.tipos.append(tipo)
+        return len(self.tipos) - 1
+
+    def constante(self, valor):
+        """
+        Índice de un valor que no proviene de un token (tipos, operadores y
+        literales implícitos). 1, 1.0 y True son entradas distintas.
+        """
+        clave = (type(valor), valor)
+        indice = self.indice_constantes.get(clave)
+        if indice is None:
+            indice = self.indice_constantes[clave] = len(self.constantes)
+            self.constantes.append(valor)
+        return indice
+
+    def truncar(self, cantidad):
+        """Elimina los nodos desde el índice 'cantidad' en adelante"""
+        if cantidad < len(self.tipos):
+            del self.hijos[self.limites[cantidad - 1] if cantidad else 0:]
+            for arreglo in (self.tipos, self.valores, self.limites, self.inicios, self.fines):
+                del arreglo[cantidad:]
+
+    def tipo(self, n):
+        return TIPOS_NODO[self.tipos[n]]
+
+    def valor(self, n):
+        """Nombre del identificador, valor del literal o tipo/operador del nodo"""
+        valor = self.valores[n]
+        if valor == SIN_VALOR:
+            return None
+        if self.tipos[n] == IDENTIFICADOR:
+            return self.nombres.nombres[valor]
+        if self.tipos[n] == CARACTER:
+            return Caracter(self.constantes[valor])
+        return self.constantes[valor]
+
+    def hijos_de(self, n):
+        return self.hijos[self.limites[n - 1] if n else 0:self.limites[n]]
+
+    def span(self, n):
+        """(inicio, fin) del nodo en el código fuente"""
+        return self.inicios[n], self.fines[n]
+
+    def preorden(self, n=None):
+        """Recorre los índices de los nodos en preorden con una pila explícita"""
+        pila = [self.raiz if n is None else n]
+        limites, hijos = self.limites, self.hijos
+        while pila:
+            n = pila.pop()
+            yield n
+            if n:
+                pila.extend(reversed(hijos[limites[n - 1]:limites[n]]))
+            else:
+                pila.extend(reversed(hijos[:limites[0]]))
+
+    def a_tupla(self, n=None):
+        """Vista de tuplas del nodo (por defecto, la lista de sentencias del programa)"""
+        if n is None:
+            n = self.raiz
+        tipos = self.tipos
+        resultados = []
+        # Pila explícita: ~n marca que los hijos de n ya están en resultados
+        pila = [n]
+        while pila:
+            n = pila.pop()
+            if n < 0:
+                n = ~n
+                tipo = tipos[n]
+                corte = len(resultados) - len(self.hijos_de(n))
+                hijos = resultados[corte:]
+                del resultados[corte:]
+                if tipo == PROGRAMA or tipo == BLOQUE:
+                    resultados.append(hijos)
+                elif tipo in CON_VALOR:
+                    resultados.append((TIPOS_NODO[tipo], self.constantes[self.valores[n]], *hijos))
+                else:
+                    resultados.append((TIPOS_NODO[tipo], *hijos))
+            elif tipos[n] in HOJAS:
+                resultados.append(self.valor(n))
+            else:
+                pila.append(~n)
+                pila.extend(reversed(self.hijos_de(n)))
+        return resultados[0]
+
+    def memoria(self):
+        """Bytes ocupados por los arreglos de la arena (sin contar las tablas de valores)"""
+        return sum(arreglo.itemsize * len(arreglo)
+                   for arreglo in (self.tipos, self.valores, self.limites, self.hijos, self.inicios, self.fines))
+
+
+class ParserArena(ParserDescendente):
+    """
+    El parser descendente construyendo una ArenaAST en lugar de tuplas.
+
+    Solo acepta código fuente o una VistaTokens, de donde toma las
+    posiciones. En la tabla de símbolos el valor de cada declaración es el
+    índice de su expresión en la arena.
+    """
+    def parse(self, input=None, lexer=None):
+        if input is not None:
+            lexer = tokenizar(input).vista()
+        elif not isinstance(lexer, VistaTokens):
+            raise TypeError("ParserArena necesita el código fuente o una VistaTokens")
+        self.arena = ArenaAST(lexer.flujo.nombres, lexer.flujo.tabla_valores)
+        try:
+            super().parse(lexer=lexer)
+            return self.arena
+        finally:
+            self.arena = None
+            self.ids = self.posiciones = self.fines_token = ()
+
+    def _cargar(self, analizador):
+        inicio, fin = analizador.actual, analizador.fin
+        super()._cargar(analizador)
+        flujo = analizador.flujo
+        largos = flujo.largos()
+        nombres = flujo.nombres.nombres
+        self.ids = flujo.valores[inicio:fin]
+        self.posiciones = flujo.posiciones[inicio:fin]
+        self.fines_token = [posicion + (len(nombres[valor]) if tipo == 'IDENTIFICADOR' else largos[valor])
+                            for posicion, tipo, valor in zip(self.posiciones, self.tipos, self.ids)]
+
+    def _nodo(self, tipo, inicio, *campos):
+        id_tipo = ID_NODO[tipo]
+        valor = SIN_VALOR
+        if id_tipo in CON_VALOR:
+            valor = self.arena.constante(campos[0])
+            campos = campos[1:]
+        return self.arena.agregar(id_tipo, valor, campos, self.posiciones[inicio], self.fines_token[self.i - 1])
+
+    def _hoja(self, i):
+        return self.arena.agregar(HOJA_POR_TOKEN[self.tipos[i]], self.ids[i], (),
+                                  self.posiciones[i], self.fines_token[i])
+
+    def _constante(self, valor, inicio):
+        return self.arena.agregar(ID_NODO['entero'], self.arena.constante(valor), (),
+                                  self.posiciones[inicio], self.fines_token[self.i - 1])
+
+    def _bloque_nodos(self, nodos, inicio):
+        return self.arena.agregar(BLOQUE, SIN_VALOR, nodos, self.posiciones[inicio], self.fines_token[self.i - 1])
+
+    def _programa(self, nodos):
+        inicio, fin = (self.posiciones[0], self.fines_token[self.i - 1]) if self.i else (0, 0)
+        self.arena.raiz = self.arena.agregar(PROGRAMA, SIN_VALOR, nodos, inicio, fin)
+        return self.arena.raiz
+
+    def _marca(self):
+        return len(self.arena)
+
+    def _descartar(self, marca):
+        self.arena.truncar(marca)
+
+
+def construir_arena(codigo, tabla=None):
+    """Analiza el código fuente y devuelve su ArenaAST"""
+    return ParserArena(tabla).parse(codigo)
+
+
+if __name__ == "__main__":
+    from benchmarks import generar_programa
+    from parser import tabla_simbolos
+    from parser_descendente import parser_descendente
+
+    codigo_prueba = """entero x = 5;
+mientras (x > 0) {
+    x = x - 1;
+    print(x);
+}
+para (entero i = 0; i < 3; i++) { print(i * 2); }
+"""
+    arena = construir_arena(codigo_prueba)
+    for n in arena.preorden():
+        inicio, fin = arena.span(n)
+        print(f"{n:>3} {arena.tipo(n):<14} {str(arena.valor(n)):<8} {codigo_prueba[inicio:fin]!r}")
+    print(f"\n{len(arena)} nodos, {arena.memoria()} bytes en arreglos")
+
+    iguales = 0
+    casos = [codigo_prueba] + [generar_programa(n) for n in (5, 50, 500, 5000)]
+    for codigo in casos:
+        tabla_simbolos.limpiar()
+        tuplas = parser_descendente.parse(codigo)
+        tabla_simbolos.limpiar()
+        iguales += construir_arena(codigo).a_tupla() == tuplas
+    tabla_simbolos.limpiar()
+    print(f"{iguales}/{len(casos)} programas con a_tupla() igual al AST de tuplas")
@@ -0,0 +1,910 @@
+"""
+Mediciones de rendimiento de las fases del compilador.
+
+Uso:
+    python benchmarks.py            # ejecuta todas las mediciones
+    python benchmarks.py lexer      # ejecuta solo las indicadas
+"""
+import contextlib
+import io
+import sys
+import time
+
+
+def generar_programa(n_sentencias):
+    """Genera un programa válido del mini lenguaje con aproximadamente n_sentencias sentencias"""
+    lineas = []
+    for i in range(n_sentencias // 4):
+        lineas.append(f"entero v{i} = {i} + 2 * {i % 7};")
+        lineas.append(f"decimal d{i} = {i}.5;")
+        lineas.append(f"si (v{i} > {i % 10}) {{ v{i} = v{i} - 1; print(v{i}); }}")
+        lineas.append(f"mientras (v{i} < 3) {{ v{i} = v{i} + 1; }}")
+    return "\n".join(lineas) + "\n"
+
+
+def generar_fuente(megabytes):
+    """Genera un programa de aproximadamente el tamaño indicado en megabytes"""
+    bloque = generar_programa(400)
+    repeticiones = max(1, int(megabytes * 1024 * 1024) // len(bloque))
+    return bloque * repeticiones
+
+
+def medir(funcion, *args, repeticiones=3):
+    """Ejecuta la función varias veces y devuelve (mejor tiempo en segundos, último resultado)"""
+    mejor = None
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(*args)
+        transcurrido = time.perf_counter() - inicio
+        if mejor is None or transcurrido < mejor:
+            mejor = transcurrido
+    return mejor, resultado
+
+
+def benchmark_lexer(megabytes=4):
+    """Compara los tokens por segundo del lexer de PLY y del motor de tabla"""
+    from lexer import crear_lexer
+
+    fuente = generar_fuente(megabytes)
+
+    def tokenizar(motor):
+        analizador = crear_lexer(motor)
+        analizador.lineno = 1
+        analizador.input(fuente)
+        total = 0
+        while analizador.token():
+            total += 1
+        return total
+
+    print(f"\n=== LEXER ({len(fuente) / 1e6:.1f} MB) ===")
+    for motor in ('ply', 'tabla'):
+        segundos, total = medir(tokenizar, motor)
+        print(f"{motor:<8} {total} tokens  {segundos:.3f} s  {total / segundos:,.0f} tokens/s")
+
+
+def benchmark_flujo_tokens(megabytes=1):
+    """Compara la memoria por token de una lista de LexToken y de FlujoTokens"""
+    import tracemalloc
+    from lexer import crear_lexer
+    from flujo_tokens import tokenizar
+
+    fuente = generar_fuente(megabytes)
+
+    def lista_lextoken():
+        analizador = crear_lexer('tabla')
+        analizador.input(fuente)
+        return list(analizador)
+
+    print(f"\n=== FLUJO DE TOKENS ({len(fuente) / 1e6:.1f} MB) ===")
+    for nombre, funcion in (('LexToken', lista_lextoken), ('FlujoTokens', lambda: tokenizar(fuente))):
+        segundos, resultado = medir(funcion)
+        total = len(resultado)
+        del resultado
+        tracemalloc.start()
+        resultado = funcion()
+        memoria = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del resultado
+        print(f"{nombre:<12} {total} tokens  {segundos:.3f} s  {memoria / total:.1f} bytes/token")
+
+
+def benchmark_relexado(megabytes=4, ediciones=2000):
+    """Compara la latencia por edición del reanálisis incremental con tokenizar todo el texto"""
+    import random
+    from flujo_tokens import tokenizar
+    from lexer_incremental import LexerIncremental
+
+    fuente = generar_fuente(megabytes)
+    incremental = LexerIncremental(fuente)
+    aleatorio = random.Random(0)
+    # Simula escritura: ediciones pequeñas alrededor de un cursor que avanza
+    cursor = len(fuente) // 2
+    # Las ediciones al azar producen caracteres ilegales; sus mensajes no interesan aquí
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        for _ in range(ediciones):
+            cursor = min(len(incremental.texto), max(0, cursor + aleatorio.randint(-40, 60)))
+            if aleatorio.random() < 0.7:
+                incremental.editar(cursor, 0, aleatorio.choice(("x", "1", " ", "+", ";\n")))
+            else:
+                incremental.editar(cursor, 1, "")
+        por_edicion = (time.perf_counter() - inicio) / ediciones
+        completo, _ = medir(tokenizar, incremental.texto, repeticiones=1)
+
+    print(f"\n=== RELEXADO INCREMENTAL ({len(fuente) / 1e6:.1f} MB) ===")
+    print(f"incremental  {por_edicion * 1e6:.1f} us/edición")
+    print(f"completo     {completo * 1e6:.1f} us/edición")
+
+
+def benchmark_reparseo(n_sentencias=40_000, ediciones=500):
+    """Compara la latencia por edición del reanálisis sintáctico incremental con analizar todo el texto"""
+    import random
+    from parser_incremental import ParserIncremental, analizar_completo
+
+    # Mitad del programa dentro del cuerpo de un solo bucle
+    cuerpo = "".join(f"    v0 = v0 + {i % 10};\n" for i in range(n_sentencias // 2))
+    fuente = generar_programa(n_sentencias // 2) + f"mientras (v0 < 3) {{\n{cuerpo}}}\n"
+    incremental = ParserIncremental(fuente)
+    anterior = incremental.ast
+    aleatorio = random.Random(0)
+    # Simula escritura: cambia el número de una sentencia cerca de un cursor que avanza por el cuerpo
+    cursor = (fuente.rindex("mientras (v0 < 3)") + len(fuente)) // 2
+    inicio = time.perf_counter()
+    for _ in range(ediciones):
+        cursor += aleatorio.randint(-200, 300)
+        posicion = incremental.texto.index(";", cursor) - 1
+        incremental.editar(posicion, 1, str(aleatorio.randrange(100)))
+    por_edicion = (time.perf_counter() - inicio) / ediciones
+    completo, ast = medir(analizar_completo, incremental.texto, repeticiones=1)
+    reutilizados = sum(nuevo is viejo for nuevo, viejo in zip(incremental.ast, anterior))
+
+    print(f"\n=== REPARSEO INCREMENTAL ({n_sentencias} sentencias, {len(fuente) / 1e6:.1f} MB) ===")
+    print(f"incremental  {por_edicion * 1e3:.2f} ms/edición")
+    print(f"completo     {completo * 1e3:.2f} ms/edición")
+    print(f"sentencias del programa reutilizadas: {reutilizados}/{len(ast)}  mismo AST: {incremental.ast == ast}")
+
+
+def benchmark_lexer_paralelo(megabytes=32):
+    """Mide el análisis léxico en paralelo con distintas cantidades de procesos"""
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+    from lexer_paralelo import tokenizar_paralelo
+
+    fuente = generar_fuente(megabytes)
+    nucleos = os.cpu_count() or 1
+    print(f"\n=== LEXER PARALELO ({len(fuente) / 1e6:.1f} MB, {nucleos} núcleos) ===")
+    base = None
+    for procesos in sorted({1, 2, 4, 8, nucleos}):
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            segundos, flujo = medir(tokenizar_paralelo, fuente, procesos, None, ejecutor, repeticiones=2)
+        base = base or segundos
+        print(f"{procesos:>2} procesos  {segundos:.3f} s  {len(flujo) / segundos:,.0f} tokens/s  x{base / segundos:.2f}")
+
+
+def benchmark_lexer_nativo(megabytes=4):
+    """Compara el escáner nativo generado con flex con el lexer de PLY y el motor de tabla"""
+    from lexer import crear_lexer
+    from flujo_tokens import tokenizar
+    from lexer_nativo import disponible, tokenizar_nativo
+
+    fuente = generar_fuente(megabytes)
+    print(f"\n=== LEXER NATIVO ({len(fuente) / 1e6:.1f} MB) ===")
+    # La primera llamada construye la biblioteca; no forma parte de la medición
+    if not disponible():
+        print("escáner nativo no disponible (se necesitan flex y un compilador de C)")
+        return
+
+    def tokenizar_ply():
+        analizador = crear_lexer('ply')
+        analizador.input(fuente)
+        return sum(1 for _ in iter(analizador.token, None))
+
+    for nombre, funcion in (('ply', tokenizar_ply),
+                            ('tabla', lambda: len(tokenizar(fuente))),
+                            ('nativo', lambda: len(tokenizar_nativo(fuente)))):
+        segundos, total = medir(funcion)
+        print(f"{nombre:<8} {total} tokens  {segundos:.3f} s  {total / segundos:,.0f} tokens/s")
+
+
+def benchmark_parser(tamanos=(1_000, 10_000, 100_000, 1_000_000)):
+    """Mide el tiempo de análisis sintáctico por sentencia para programas de tamaño creciente"""
+    from flujo_tokens import tokenizar
+    from parser import parser, parse_iter, tabla_simbolos
+
+    def analizar(flujo):
+        tabla_simbolos.limpiar()
+        return len(parser.parse(lexer=flujo.vista()))
+
+    def analizar_iter(flujo):
+        tabla_simbolos.limpiar()
+        return sum(1 for _ in parse_iter(None, flujo.vista()))
+
+    print("\n=== PARSER (tiempo por sentencia constante = crecimiento lineal) ===")
+    for n in tamanos:
+        flujo = tokenizar(generar_programa(n))
+        repeticiones = 3 if n <= 100_000 else 1
+        for nombre, funcion in (('parse', analizar), ('parse_iter', analizar_iter)):
+            segundos, total = medir(funcion, flujo, repeticiones=repeticiones)
+            print(f"{n:>9} sentencias  {nombre:<10} {total} nodos  {segundos:.3f} s  {segundos / n * 1e6:.2f} us/sentencia")
+
+
+def benchmark_parser_descendente(n_sentencias=100_000):
+    """Compara los tokens por segundo del parser LALR de PLY y del descendente recursivo"""
+    from flujo_tokens import tokenizar
+    from parser import parser, tabla_simbolos
+    from parser_descendente import parser_descendente
+
+    flujo = tokenizar(generar_programa(n_sentencias))
+
+    def analizar(motor):
+        tabla_simbolos.limpiar()
+        return motor.parse(lexer=flujo.vista())
+
+    print(f"\n=== PARSER DESCENDENTE ({n_sentencias} sentencias, {len(flujo)} tokens) ===")
+    resultados = []
+    for nombre, motor in (('lalr', parser), ('descendente', parser_descendente)):
+        segundos, ast = medir(analizar, motor)
+        resultados.append(ast)
+        print(f"{nombre:<12} {segundos:.3f} s  {len(flujo) / segundos:,.0f} tokens/s")
+    print("mismo AST:", resultados[0] == resultados[1])
+
+
+def benchmark_arena_ast(n_sentencias=100_000):
+    """Compara memoria, construcción y recorrido del AST de tuplas y de la ArenaAST"""
+    import gc
+    import tracemalloc
+    from arena_ast import ParserArena, ID_NODO
+    from flujo_tokens import tokenizar
+    from parser import TablaSimbolos
+    from parser_descendente import ParserDescendente
+
+    flujo = tokenizar(generar_programa(n_sentencias))
+    operacion = ID_NODO['operacion']
+
+    def construir(clase):
+        return clase(TablaSimbolos()).parse(lexer=flujo.vista())
+
+    def recorrer_tuplas(ast):
+        """Cuenta las operaciones con una pila explícita"""
+        operaciones = 0
+        pila = list(ast)
+        while pila:
+            nodo = pila.pop()
+            if isinstance(nodo, list):
+                pila.extend(nodo)
+            elif isinstance(nodo, tuple):
+                operaciones += nodo[0] == 'operacion'
+                pila.extend(nodo[1:])
+        return operaciones
+
+    def recorrer_preorden(arena):
+        tipos = arena.tipos
+        return sum(tipos[n] == operacion for n in arena.preorden())
+
+    def recorrer_secuencial(arena):
+        """Los hijos están antes que el padre: un solo barrido sin pila"""
+        return sum(tipo == operacion for tipo in arena.tipos)
+
+    arena = construir(ParserArena)
+    nodos = len(arena)
+    print(f"\n=== ARENA AST ({n_sentencias} sentencias, {len(flujo)} tokens, {nodos} nodos) ===")
+    for nombre, clase, recorridos in (('tuplas', ParserDescendente, (('pila', recorrer_tuplas),)),
+                                      ('arena', ParserArena, (('preorden', recorrer_preorden),
+                                                              ('secuencial', recorrer_secuencial)))):
+        segundos, ast = medir(construir, clase)
+        del ast
+        tracemalloc.start()
+        ast = construir(clase)
+        # El parser forma un ciclo con sus métodos; se recolecta para no medir su tabla
+        gc.collect()
+        memoria = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{nombre:<7} construcción {segundos:.3f} s  {memoria / nodos:.1f} bytes/nodo")
+        for recorrido, funcion in recorridos:
+            segundos, operaciones = medir(funcion, ast)
+            print(f"{'':<7} recorrido {recorrido:<11} {segundos * 1000:.1f} ms ({operaciones} operaciones)")
+        del ast
+    print("a_tupla igual al AST de tuplas:", arena.a_tupla() == construir(ParserDescendente))
+
+
+def benchmark_arranque(repeticiones=20):
+    """Mide el tiempo de un intérprete nuevo que importa el compilador, con y sin arranque rápido"""
+    import os
+    import subprocess
+
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    programas = (
+        ('python vacío', 'pass'),
+        ('import compilador', 'import compilador'),
+        ('import parser', 'import parser'),
+        ('compilar', 'import compilador, contextlib, io, os\n'
+                     'with contextlib.redirect_stdout(io.StringIO()):\n'
+                     '    compilador.Compilador().compilar("entero x = 1; print(x);", os.devnull)'),
+    )
+
+    def ejecutar(codigo, entorno):
+        subprocess.run([sys.executable, '-c', codigo], cwd=directorio, env=entorno, check=True)
+
+    print(f"\n=== ARRANQUE (mejor de {repeticiones} procesos) ===")
+    for modo, valor in (('normal', '0'), ('rápido', '1')):
+        entorno = dict(os.environ, MINI_ARRANQUE_RAPIDO=valor)
+        # Se mide con el bytecode ya en __pycache__, como en una instalación normal
+        entorno.pop('PYTHONDONTWRITEBYTECODE', None)
+        for nombre, codigo in programas:
+            ejecutar(codigo, entorno)
+            segundos, _ = medir(ejecutar, codigo, entorno, repeticiones=repeticiones)
+            print(f"{modo:<7} {nombre:<18} {segundos * 1000:.1f} ms")
+
+
+
+def benchmark_sesiones(compilaciones=2_000, hilos=4):
+    """Mide el costo de preparar un parser y de muchos análisis pequeños con sesiones reutilizadas"""
+    import contextlib
+    import io
+    import ply.yacc as yacc
+    import parser as modulo_parser
+    from concurrent.futures import ThreadPoolExecutor
+    from parser import ParserSession, PoolSesiones
+
+    def construir_yacc(optimize):
+        with contextlib.redirect_stderr(io.StringIO()):
+            return yacc.yacc(module=modulo_parser, optimize=optimize, debug=False, write_tables=False)
+
+    print(f"\n=== SESIONES ({compilaciones} programas pequeños) ===")
+    for nombre, funcion in (('yacc.yacc()', lambda: construir_yacc(0)),
+                            ('yacc.yacc(-O)', lambda: construir_yacc(1)),
+                            ('ParserSession()', ParserSession)):
+        segundos, _ = medir(lambda: [funcion() for _ in range(20)])
+        print(f"{nombre:<16} {segundos / 20 * 1000:.3f} ms por parser")
+
+    # Todos los programas declaran las mismas variables: sin tabla por sesión fallarían
+    programas = [generar_programa(10 + i % 20) for i in range(compilaciones)]
+    pool = PoolSesiones(hilos)
+
+    def en_serie():
+        return sum(len(pool.parse(programa)) for programa in programas)
+
+    def en_hilos():
+        with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+            return sum(map(len, ejecutor.map(pool.parse, programas)))
+
+    for nombre, funcion in (('pool, 1 hilo', en_serie), (f'pool, {hilos} hilos', en_hilos)):
+        segundos, total = medir(funcion)
+        print(f"{nombre:<16} {total} sentencias  {segundos:.3f} s  {compilaciones / segundos:,.0f} programas/s")
+
+
+
+def generar_expresion_profunda(terminos):
+    """Programa con una suma de 'terminos' términos: un árbol de expresión de esa profundidad"""
+    partes = ['entero x = 1;\nprint(x']
+    partes.extend(f' + {i % 10}' if i % 2 else ' - x' for i in range(1, terminos))
+    partes.append(');\n')
+    return ''.join(partes)
+
+
+def benchmark_expresion_profunda(tamanos=(100_000, 1_000_000), limite_us=25.0):
+    """
+    Compila expresiones de hasta un millón de términos fase por fase. Cada
+    fase debe terminar sin RecursionError y en menos de limite_us
+    microsegundos por término.
+    """
+    from flujo_tokens import tokenizar
+    from parser import ParserSession
+    from semantic import AnalizadorSemantico
+    from intermediate_code import GeneradorCodigoIntermedio
+    from codegen import GeneradorCodigoPython
+    from recorridos import repr_ast
+
+    def semantico(ast):
+        analizador = AnalizadorSemantico()
+        for nodo in ast:
+            analizador.analizar_nodo(nodo)
+        return len(analizador.constantes)
+
+    def intermedio(ast):
+        generador = GeneradorCodigoIntermedio()
+        for nodo in ast:
+            generador.generar_codigo(nodo)
+        return len(generador.codigo)
+
+    print(f"\n=== EXPRESIÓN PROFUNDA (límite {limite_us} us/término) ===")
+    fallas = 0
+    for n in tamanos:
+        flujo = tokenizar(generar_expresion_profunda(n))
+        segundos, ast = medir(ParserSession().parse, None, flujo.vista(), repeticiones=1)
+        fases = (
+            ('parser', segundos, len(flujo)),
+            ('semántico', *medir(semantico, ast, repeticiones=1)),
+            ('intermedio', *medir(intermedio, ast, repeticiones=1)),
+            ('codegen', *medir(lambda: len(GeneradorCodigoPython().procesar_nodo(ast[1][1])), repeticiones=1)),
+            ('imprimir AST', *medir(lambda: len(repr_ast(ast)), repeticiones=1)),
+        )
+        for nombre, segundos, total in fases:
+            us = segundos / n * 1e6
+            fallas += us > limite_us
+            print(f"{n:>9} términos  {nombre:<13} {total:>9}  {segundos:.3f} s  {us:.2f} us/término"
+                  f"{'' if us <= limite_us else '  EXCEDE EL LÍMITE'}")
+        del ast
+    print("todas las fases dentro del límite" if not fallas else f"{fallas} fases exceden el límite")
+
+
+
+def generar_programa_repetitivo(n_sentencias):
+    """Programa generado con muchas subexpresiones repetidas, como (x + y) en cada sentencia"""
+    lineas = ["entero x = 1;", "entero y = 2;", "entero z = 3;"]
+    for i in range(n_sentencias // 2):
+        lineas.append(f"entero a{i} = (x + y) * (x + y) - (x + y) / {i % 5 + 1};")
+        lineas.append(f"si ((x + y) * z > {i % 10}) {{ print(x * y + z); }}")
+    return "\n".join(lineas) + "\n"
+
+
+def benchmark_expresiones_compartidas(n_sentencias=100_000):
+    """Compara nodos y memoria del AST con y sin expresiones compartidas (hash-consing)"""
+    import gc
+    from flujo_tokens import tokenizar
+    from parser import ParserSession
+    from parser_descendente import ParserDescendente
+    from expresiones_compartidas import memoria_ast
+
+    print(f"\n=== EXPRESIONES COMPARTIDAS ({n_sentencias} sentencias) ===")
+    corpus = (('generado', generar_programa(n_sentencias)),
+              ('repetitivo', generar_programa_repetitivo(n_sentencias)))
+    for nombre, codigo in corpus:
+        flujo = tokenizar(codigo)
+        resultados = {}
+        for compartir in (False, True):
+            sesion = ParserSession(compartir_expresiones=compartir)
+            segundos, ast = medir(lambda: sesion.parse(lexer=flujo.vista()))
+            descendente = ParserDescendente(sesion.tabla, compartir_expresiones=compartir)
+            segundos_rd, _ = medir(lambda: (sesion.tabla.limpiar(), descendente.parse(lexer=flujo.vista())))
+            gc.collect()
+            resultados[compartir] = ast
+            tabla = sesion.expresiones
+            nodos = f"{len(tabla)} de {tabla.pedidos} nodos" if tabla is not None else "todos los nodos"
+            extra = f" + tabla {tabla.memoria() / 1e6:.1f} MB" if tabla is not None else ""
+            print(f"{nombre:<11} {'compartido' if compartir else 'árbol':<11} {nodos:<26} "
+                  f"AST {memoria_ast(ast) / 1e6:.1f} MB{extra}  lalr {segundos:.3f} s  descendente {segundos_rd:.3f} s")
+        print(f"{'':<11} mismo AST: {resultados[False] == resultados[True]}")
+
+
+def benchmark_tabla_simbolos(variables=100_000, bloques=1_000):
+    """Compara memoria y búsquedas de la tabla de símbolos única con las tres tablas de diccionarios"""
+    import tracemalloc
+    from nombres import TablaNombres
+    from simbolos import TablaSimbolos
+
+    nombres = TablaNombres()
+    identificadores = [nombres.canonico(f"v{i}") for i in range(variables)]
+
+    def tablas_diccionarios():
+        """Como antes: parser, análisis semántico y código intermedio con su propio diccionario por nombre"""
+        tablas = ({}, {}, {})
+        for nombre in identificadores:
+            tablas[0][nombre] = {'tipo': 'entero', 'valor': 1}
+            tablas[1][nombre] = {'tipo': 'entero', 'valor': None, 'constante': False}
+            tablas[2][nombre] = {'tipo': 'entero'}
+        return tablas
+
+    def tabla_unica():
+        tabla = TablaSimbolos(nombres)
+        for nombre in identificadores:
+            tabla.declarar(nombre, 'entero', 1)
+        return tabla
+
+    print(f"\n=== TABLA DE SÍMBOLOS ({variables} variables) ===")
+    construidas = {}
+    for nombre, construir, buscar in (
+            ('diccionarios', tablas_diccionarios, lambda tablas: sum(n in tablas[1] for n in identificadores)),
+            ('única', tabla_unica, lambda tabla: sum(tabla.buscar(n) is not None for n in identificadores))):
+        tracemalloc.start()
+        construidas[nombre] = construir()
+        memoria = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        segundos, encontradas = medir(buscar, construidas[nombre])
+        print(f"{nombre:<13} {memoria / 1e6:6.1f} MB  búsqueda {segundos / variables * 1e9:6.0f} ns/variable "
+              f"({encontradas} encontradas)")
+
+    # Bloques anidados de un nivel: al cerrar cada uno sus variables dejan de ser visibles en O(1)
+    tabla = TablaSimbolos(nombres)
+    por_bloque = variables // bloques
+
+    def ambitos():
+        tabla.limpiar()
+        for b in range(bloques):
+            tabla.abrir_ambito()
+            for nombre in identificadores[b * por_bloque:(b + 1) * por_bloque]:
+                tabla.declarar(nombre, 'entero')
+            tabla.cerrar_ambito()
+        return sum(tabla.buscar(n) is not None for n in identificadores)
+
+    segundos, visibles = medir(ambitos)
+    print(f"{bloques} bloques de {por_bloque} variables: {segundos:.3f} s, {visibles} visibles al final")
+
+
+def generar_programa_constante(n_sentencias):
+    """Programa generado cuyas expresiones son casi todas constantes"""
+    lineas = ["entero x = 1;"]
+    for i in range(n_sentencias):
+        lineas.append(f"decimal c{i} = {i} + 3 * 2 - {i % 9 + 1} / 4 + 1.5 * {i % 5} - x * 2;")
+    return "\n".join(lineas) + "\n"
+
+
+def benchmark_plegado(n_sentencias=20_000):
+    """Compara el plegado de constantes por tabla de despacho con el anterior basado en eval()"""
+    from flujo_tokens import tokenizar
+    from parser import ParserSession
+    from recorridos import reducir_expresion
+    from semantic import AnalizadorSemantico
+
+    def texto_literal(valor):
+        return str(valor) if isinstance(valor, (int, float)) else None
+
+    def plegar_eval(nodo):
+        """El plegado anterior: solo operaciones entre dos literales, con eval() del texto"""
+        plegadas = 0
+
+        def combinar(nodo, izquierdo, derecho):
+            nonlocal plegadas
+            _, operador, op1, op2 = nodo
+            val1, val2 = texto_literal(op1), texto_literal(op2)
+            if val1 and val2:
+                try:
+                    plegadas += 1
+                    return str(eval(f"{val1} {operador} {val2}"))
+                except ZeroDivisionError:
+                    pass
+            return None
+
+        reducir_expresion(nodo, texto_literal, combinar)
+        return plegadas
+
+    ast = ParserSession().parse(lexer=tokenizar(generar_programa_constante(n_sentencias)).vista())
+    expresiones = [nodo[3] for nodo in ast if isinstance(nodo[3], tuple)]
+    operaciones = sum(repr(e).count("'operacion'") for e in expresiones)
+
+    def despacho():
+        analizador = AnalizadorSemantico()
+        for nodo in ast:
+            analizador.analizar_nodo(nodo)
+        return len(analizador.constantes)
+
+    print(f"\n=== PLEGADO DE CONSTANTES ({n_sentencias} sentencias, {operaciones} operaciones) ===")
+    for nombre, plegar in (('eval', lambda: sum(map(plegar_eval, expresiones))), ('despacho', despacho)):
+        segundos, plegadas = medir(plegar)
+        print(f"{nombre:<9} {segundos:.3f} s  {segundos / n_sentencias * 1e6:6.1f} us/sentencia  "
+              f"{plegadas} operaciones plegadas")
+
+
+def benchmark_tipos(n_sentencias=100_000):
+    """Mide la verificación de tipos y compara leer el tipo anotado con volver a inferirlo"""
+    from flujo_tokens import tokenizar
+    from inferencia_tipos import VerificadorTipos
+    from parser import ParserSession
+
+    ast = ParserSession().parse(lexer=tokenizar(generar_programa(n_sentencias)).vista())
+
+    def verificar():
+        verificador = VerificadorTipos()
+        verificador.verificar(ast)
+        return verificador
+
+    segundos, verificador = medir(verificar)
+    expresiones = [nodo[3] for nodo in ast if nodo[0] == 'declaracion' and isinstance(nodo[3], tuple)]
+    print(f"\n=== TIPOS ({n_sentencias} sentencias) ===")
+    print(f"verificación  {segundos:.3f} s  {len(verificador.tipos)} expresiones anotadas, "
+          f"{len(verificador.errores)} errores")
+    leer, _ = medir(lambda: [verificador.tipo(e) for e in expresiones])
+    # Sin la tabla de tipos cada consulta vuelve a recorrer la expresión
+    derivar, _ = medir(lambda: [verificador.tipos.clear() or verificador.tipo_expresion(e) for e in expresiones])
+    print(f"tipo de {len(expresiones)} expresiones: anotado {leer / len(expresiones) * 1e9:.0f} ns, "
+          f"inferido de nuevo {derivar / len(expresiones) * 1e9:.0f} ns")
+
+
+def benchmark_fases(n_sentencias=100_000):
+    """Tiempo de cada fase posterior al parser sobre el mismo AST, como en Compilador"""
+    from flujo_tokens import tokenizar
+    from parser import ParserSession
+    from simbolos import TablaSimbolos
+    from semantic import AnalizadorSemantico
+    from inferencia_tipos import VerificadorTipos
+    from intermediate_code import GeneradorCodigoIntermedio
+
+    ast = ParserSession().parse(lexer=tokenizar(generar_programa(n_sentencias)).vista())
+
+    def compilar():
+        tabla = TablaSimbolos()
+        semantico = AnalizadorSemantico(tabla_simbolos=tabla)
+        tipos = VerificadorTipos(tabla_simbolos=tabla)
+        generador = GeneradorCodigoIntermedio(tabla_simbolos=tabla, tipos=tipos, semantico=semantico)
+        tiempos = []
+        for fase in (lambda: [semantico.analizar_nodo(nodo) for nodo in ast],
+                     lambda: tipos.verificar(ast),
+                     lambda: [generador.generar_codigo(nodo) for nodo in ast]):
+            tabla.limpiar()
+            inicio = time.perf_counter()
+            fase()
+            tiempos.append(time.perf_counter() - inicio)
+        return tiempos, len(generador.codigo)
+
+    mejores = None
+    for _ in range(3):
+        tiempos, instrucciones = compilar()
+        mejores = tiempos if mejores is None else list(map(min, mejores, tiempos))
+    print(f"\n=== FASES ({n_sentencias} sentencias, {instrucciones} instrucciones) ===")
+    for nombre, segundos in zip(('semántico', 'tipos', 'intermedio'), mejores):
+        print(f"{nombre:<11} {segundos:.3f} s")
+    print(f"{'total':<11} {sum(mejores):.3f} s")
+
+
+def benchmark_despacho(n_sentencias=100_000):
+    """Costo por sentencia de elegir el método de cada nodo, y las fases separadas contra un solo recorrido"""
+    from flujo_tokens import tokenizar
+    from parser import ParserSession
+    from pasadas import Pasada, Recorrido
+    from simbolos import TablaSimbolos
+    from semantic import AnalizadorSemantico
+    from inferencia_tipos import VerificadorTipos
+    from intermediate_code import GeneradorCodigoIntermedio
+
+    ast = ParserSession().parse(lexer=tokenizar(generar_programa(n_sentencias)).vista())
+    tabla = TablaSimbolos()
+
+    # Todas las variantes hacen el mismo trabajo además del despacho: ámbitos
+    # de los bloques y declarar o buscar el símbolo de cada sentencia
+    def nada(nodo):
+        pass
+
+    def declarar(nodo):
+        tabla.declarar(nodo[2], nodo[1])
+
+    def buscar(nodo):
+        tabla.buscar(nodo[1])
+
+    def bloques(nodo, visitar):
+        for parte in nodo[1:]:
+            if parte.__class__ is list:
+                tabla.abrir_ambito()
+                for hijo in parte:
+                    visitar(hijo)
+                tabla.cerrar_ambito()
+
+    def diccionario_por_nodo(nodo):
+        # Como el generar_codigo anterior: arma la tabla, lambdas incluidas, en cada visita
+        if not isinstance(nodo, tuple):
+            return
+        handlers = {
+            'declaracion': declarar,
+            'asignacion': buscar,
+            'si': lambda n: bloques(n, diccionario_por_nodo),
+            'si_sino': lambda n: bloques(n, diccionario_por_nodo),
+            'si_sino_eoc': lambda n: bloques(n, diccionario_por_nodo),
+            'si_eoc': lambda n: bloques(n, diccionario_por_nodo),
+            'mientras': lambda n: bloques(n, diccionario_por_nodo),
+            'para': lambda n: bloques(n, diccionario_por_nodo),
+            'incremento': lambda n: nada(n),
+            'incremento_simple': lambda n: nada(n),
+        }
+        tipo_nodo = nodo[0]
+        if tipo_nodo in handlers:
+            handlers[tipo_nodo](nodo)
+        elif tipo_nodo == 'imprimir':
+            nada(nodo)
+
+    def cadena_de_if(nodo):
+        # Como el analizar_nodo anterior
+        if not isinstance(nodo, tuple):
+            return
+        tipo_nodo = nodo[0]
+        if tipo_nodo == 'declaracion':
+            declarar(nodo)
+        elif tipo_nodo == 'operacion':
+            nada(nodo)
+        elif tipo_nodo == 'asignacion':
+            buscar(nodo)
+        elif tipo_nodo in ('si', 'si_sino', 'si_sino_eoc', 'si_eoc'):
+            bloques(nodo, cadena_de_if)
+        elif tipo_nodo == 'mientras':
+            bloques(nodo, cadena_de_if)
+        elif tipo_nodo == 'para':
+            bloques(nodo, cadena_de_if)
+        elif tipo_nodo == 'imprimir':
+            nada(nodo)
+
+    class Vacia(Pasada):
+        def __init__(self):
+            self.tabla_simbolos = tabla
+
+        def visitar_declaracion(self, nodo, simbolo):
+            pass
+
+        visitar_asignacion = visitar_imprimir = visitar_declaracion
+
+        def entrar_si(self, nodo):
+            pass
+
+        entrar_mientras = entrar_si
+
+    def contar(nodo):
+        if nodo.__class__ is not tuple:
+            return 0
+        return 1 + sum(contar(hijo) for parte in nodo[1:] if parte.__class__ is list for hijo in parte)
+
+    sentencias = sum(map(contar, ast))
+
+    def recorrer(visitar):
+        tabla.limpiar()
+        for nodo in ast:
+            visitar(nodo)
+
+    print(f"\n=== DESPACHO ({sentencias} sentencias) ===")
+    for nombre, visitar in (('diccionario por nodo', diccionario_por_nodo),
+                            ('cadena de if', cadena_de_if),
+                            ('Recorrido', Recorrido([Vacia()], tabla).sentencia)):
+        segundos, _ = medir(recorrer, visitar)
+        print(f"{nombre:<21} {segundos:.3f} s  {segundos / sentencias * 1e9:5.0f} ns/sentencia")
+
+    def fases(fusionar):
+        tabla = TablaSimbolos()
+        semantico = AnalizadorSemantico(tabla_simbolos=tabla)
+        tipos = VerificadorTipos(tabla_simbolos=tabla)
+        generador = GeneradorCodigoIntermedio(tabla_simbolos=tabla, tipos=tipos, semantico=semantico)
+        if fusionar:
+            Recorrido([semantico, tipos, generador], tabla).recorrer(ast)
+        else:
+            for pasada in (semantico, tipos, generador):
+                tabla.limpiar()
+                pasada.recorrido.recorrer(ast)
+        return list(generador.codigo.lineas())
+
+    separadas, codigo = medir(fases, False)
+    fusionadas, codigo_fusionado = medir(fases, True)
+    print(f"{'fases separadas':<21} {separadas:.3f} s")
+    print(f"{'un solo recorrido':<21} {fusionadas:.3f} s  (mismo código: {codigo == codigo_fusionado})")
+
+
+def benchmark_semantico_incremental(n_sentencias=100_000, ediciones=200):
+    """Compara el análisis semántico de todo el programa con el incremental tras editar una sentencia"""
+    import random
+    from flujo_tokens import tokenizar
+    from parser import ParserSession
+    from semantic import AnalizadorSemantico
+    from semantico_incremental import AnalizadorIncremental
+
+    parser = ParserSession()
+    ast = parser.parse(lexer=tokenizar(generar_programa(n_sentencias)).vista())
+
+    def completo():
+        analizador = AnalizadorSemantico(maximo_errores=None)
+        analizador.analizar(ast)
+        return analizador
+
+    segundos, _ = medir(completo)
+    incremental = AnalizadorIncremental()
+    inicial, _ = medir(incremental.actualizar, ast, repeticiones=1)
+    print(f"\n=== SEMÁNTICO INCREMENTAL ({len(ast)} sentencias) ===")
+    print(f"{'análisis completo':<26} {segundos * 1e3:.1f} ms")
+    print(f"{'incremental, inicial':<26} {inicial * 1e3:.1f} ms")
+
+    # Cada edición reemplaza una sentencia, cerca de un cursor que avanza, por otra recién analizada
+    aleatorio = random.Random(0)
+    cursor = n_sentencias // 8
+    casos = (
+        ('cambiar un valor', lambda i: f"entero v{i} = {aleatorio.randrange(100)};"),
+        ('renombrar una variable', lambda i: f"entero w{i} = {i};"),
+        ('agregar una sentencia', lambda i: f"entero v{i} = {i};\nprint(v{i});"),
+    )
+    for nombre, texto in casos:
+        total = analizadas = 0
+        for _ in range(ediciones):
+            cursor = min(max(cursor + aleatorio.randint(-20, 30), 0), n_sentencias // 4 - 1)
+            i = cursor
+            ast = ast[:4 * i] + parser.parse(texto(i)) + ast[4 * i + 1:]
+            inicio = time.perf_counter()
+            incremental.actualizar(ast)
+            total += time.perf_counter() - inicio
+            analizadas += incremental.analizadas
+        print(f"{nombre:<26} {total / ediciones * 1e3:.2f} ms/edición  "
+              f"{analizadas / ediciones:.1f} sentencias analizadas")
+    errores = incremental.errores
+    print(f"mismos errores que el análisis completo: {errores == list(completo().errores)} ({len(errores)})")
+
+def benchmark_cuadruplos(n_sentencias=220_000):
+    """Memoria y tiempo del código intermedio en columnas comparado con un objeto Instruccion por instrucción"""
+    import gc
+    import tracemalloc
+    from flujo_tokens import tokenizar
+    from intermediate_code import GeneradorCodigoIntermedio
+    from parser import ParserSession
+
+    ast = ParserSession().parse(lexer=tokenizar(generar_programa(n_sentencias)).vista())
+
+    def generar():
+        generador = GeneradorCodigoIntermedio()
+        generador.recorrido.recorrer(ast)
+        return generador.codigo
+
+    segundos, codigo = medir(generar)
+
+    def memoria(construir):
+        gc.collect()
+        tracemalloc.start()
+        objeto = construir()
+        tamano = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return tamano, objeto
+
+    # La tabla de nombres ya existe cuando se genera el código: no se cuenta en ninguno de los dos
+    en_tabla, _ = memoria(generar)
+    en_objetos, instrucciones = memoria(lambda: list(codigo))
+    texto_tabla, lineas = medir(lambda: list(codigo.lineas()))
+    texto_objetos, lineas_objetos = medir(lambda: [str(instruccion) for instruccion in instrucciones])
+    print(f"\n=== CUÁDRUPLOS ({len(codigo)} instrucciones) ===")
+    print(f"generación              {segundos:.3f} s")
+    print(f"memoria: tabla          {en_tabla / 1e6:.1f} MB ({en_tabla / len(codigo):.0f} B/instrucción)")
+    print(f"memoria: Instruccion    {en_objetos / 1e6:.1f} MB ({en_objetos / len(codigo):.0f} B/instrucción)")
+    print(f"texto desde la tabla    {texto_tabla:.3f} s")
+    print(f"texto desde objetos     {texto_objetos:.3f} s  (mismo texto: {lineas == lineas_objetos})")
+
+
+def benchmark_archivo_cuadruplos(n_sentencias=220_000):
+    """Guardar y volver a leer el código intermedio en texto y en el formato binario proyectado con mmap"""
+    import os
+    import tempfile
+    from archivo_cuadruplos import ArchivoCuadruplos, cargar, guardar, leer_texto
+    from flujo_tokens import tokenizar
+    from intermediate_code import GeneradorCodigoIntermedio, guardar_codigo_intermedio
+    from parser import ParserSession
+
+    generador = GeneradorCodigoIntermedio()
+    generador.recorrido.recorrer(ParserSession().parse(lexer=tokenizar(generar_programa(n_sentencias)).vista()))
+    codigo = generador.codigo
+    directorio = tempfile.mkdtemp()
+    ruta_texto = os.path.join(directorio, 'programa.txt')
+    ruta_binaria = os.path.join(directorio, 'programa.cuad')
+
+    def leer_archivo_texto():
+        with open(ruta_texto, encoding='utf-8') as archivo:
+            return leer_texto(archivo)
+
+    def primera_instruccion():
+        with ArchivoCuadruplos(ruta_binaria) as archivo:
+            return archivo.linea(0)
+
+    def recorrer_proyectado():
+        with ArchivoCuadruplos(ruta_binaria) as archivo:
+            return sum(1 for operacion in archivo.operaciones if operacion == 0)
+
+    guardar_texto, _ = medir(lambda: guardar_codigo_intermedio(codigo, ruta_texto))
+    guardar_binario, _ = medir(lambda: guardar(codigo, ruta_binaria))
+    leer_de_texto, desde_texto = medir(leer_archivo_texto)
+    cargar_binario, desde_binario = medir(lambda: cargar(ruta_binaria))
+    abrir, _ = medir(primera_instruccion)
+    recorrer, etiquetas = medir(recorrer_proyectado)
+    lineas = list(codigo.lineas())
+    print(f"\n=== ARCHIVO DE CUÁDRUPLOS ({len(codigo)} instrucciones) ===")
+    print(f"texto:   guardar {guardar_texto:.3f} s, leer {leer_de_texto:.3f} s, "
+          f"{os.path.getsize(ruta_texto) / 1e6:.1f} MB")
+    print(f"binario: guardar {guardar_binario:.3f} s, cargar {cargar_binario:.3f} s, "
+          f"{os.path.getsize(ruta_binaria) / 1e6:.1f} MB")
+    print(f"mmap:    abrir y leer una instrucción {abrir * 1e3:.2f} ms, "
+          f"recorrer las operaciones {recorrer:.3f} s ({etiquetas} etiquetas)")
+    print(f"mismo código: texto {list(desde_texto.lineas()) == lineas}, "
+          f"binario {list(desde_binario) == list(codigo)}")
+    os.remove(ruta_texto)
+    os.remove(ruta_binaria)
+    os.rmdir(directorio)
+
+
+BENCHMARKS = {
+    'lexer': benchmark_lexer,
+    'flujo_tokens': benchmark_flujo_tokens,
+    'relexado': benchmark_relexado,
+    'reparseo': benchmark_reparseo,
+    'lexer_paralelo': benchmark_lexer_paralelo,
+    'lexer_nativo': benchmark_lexer_nativo,
+    'parser': benchmark_parser,
+    'parser_descendente': benchmark_parser_descendente,
+    'arena_ast': benchmark_arena_ast,
+    'arranque': benchmark_arranque,
+    'sesiones': benchmark_sesiones,
+    'expresion_profunda': benchmark_expresion_profunda,
+    'expresiones_compartidas': benchmark_expresiones_compartidas,
+    'tabla_simbolos': benchmark_tabla_simbolos,
+    'plegado': benchmark_plegado,
+    'tipos': benchmark_tipos,
+    'fases': benchmark_fases,
+    'despacho': benchmark_despacho,
+    'semantico_incremental': benchmark_semantico_incremental,
+    'cuadruplos': benchmark_cuadruplos,
+    'archivo_cuadruplos': benchmark_archivo_cuadruplos,
+}
+
+
+if __name__ == "__main__":
+    nombres = sys.argv[1:] or list(BENCHMARKS)
+    for nombre in nombres:
+        if nombre not in BENCHMARKS:
+            print(f"Benchmark desconocido: {nombre} (disponibles: {', '.join(BENCHMARKS)})")
+            sys.exit(1)
+        BENCHMARKS[nombre]()
@@ -1,3 +1,6 @@
+from recorridos import en_orden
+from tipos import BOOLEANO, BOOLEANOS, CARACTER, tipo_literal
+
 class GeneradorCodigoPython:
   def __init__(self):
       self.codigo_python = []  # Lista para almacenar las líneas de código generadas
@@ -5,14 +8,24 @@ class GeneradorCodigoPython:
       self.codigo_intermedio = []  # Código intermedio para ayudar en la generación de código
       self.variables_declaradas = set()  # Conjunto de variables declaradas en el programa
       self.variables_temporales = set()  # Conjunto de variables temporales detectadas
+      self.terminacion = None  # Análisis de terminación: qué bucles llevan presupuesto de iteraciones
+      self.contadores = 0  # Contadores de iteraciones ya usados
 
   def agregar_linea(self, linea):
       """Agrega una línea de código con la indentación correcta"""
       self.codigo_python.append("    " * self.indentacion + linea)
 
-  def generar_codigo(self, ast, codigo_intermedio, nombre_archivo="output.py"):
-      """Genera código Python a partir del AST y código intermedio"""
+  def generar_codigo(self, ast, codigo_intermedio, nombre_archivo="output.py", terminacion=None):
+      """
+      Genera código Python a partir del AST y código intermedio.
+      
+      Con terminacion (un AnalizadorTerminacion que ya recorrió el AST), los
+      bucles que no se pudo demostrar que terminan abortan el programa al
+      superar su presupuesto de iteraciones.
+      """
       self.codigo_intermedio = codigo_intermedio
+      self.terminacion = terminacion
+      self.contadores = 0
       self.codigo_python = []
       self.variables_declaradas = set()
       self.variables_temporales = set()
@@ -55,28 +68,21 @@ class GeneradorCodigoPython:
   def procesar_nodo(self, nodo):
       """Procesa un nodo del AST"""
       if not isinstance(nodo, tuple):
-          return str(nodo)
+          return self.procesar_hoja(nodo)
       
-      tipo_nodo = nodo[0]
-      
-      if tipo_nodo == 'declaracion':
-          return self.procesar_declaracion(nodo)
-      elif tipo_nodo == 'asignacion':
-          return self.procesar_asignacion(nodo)
-      elif tipo_nodo == 'si_sino':
-        return self.procesar_si_sino(nodo)
-      elif tipo_nodo == 'si_sino_eoc':
-        return self.procesar_si_sino_eoc(nodo)
-      elif tipo_nodo == 'si_eoc':  # Agregamos el caso si_eoc
-        return self.procesar_si_eoc(nodo)
-      elif tipo_nodo == 'mientras':
-          return self.procesar_mientras(nodo)
-      elif tipo_nodo == 'para':
-          return self.procesar_para(nodo)
-      elif tipo_nodo == 'imprimir':
-          return self.procesar_imprimir(nodo)
-      elif tipo_nodo == 'operacion':
-          return self.procesar_operacion(nodo)
+      # Tabla de despacho de la clase (_PROCESAR), armada una sola vez
+      procesar = self._PROCESAR.get(nodo[0])
+      if procesar is not None:
+          return procesar(self, nodo)
+
+  def procesar_hoja(self, nodo):
+      """Texto Python de un literal o identificador"""
+      tipo = tipo_literal(nodo)
+      if tipo == CARACTER:
+          return repr(str(nodo))
+      if tipo == BOOLEANO:
+          return str(BOOLEANOS[nodo])
+      return str(nodo)
 
   def procesar_declaracion(self, nodo):
       """Procesa una declaración de variable"""
@@ -104,9 +110,8 @@ class GeneradorCodigoPython:
       self.agregar_linea(f"{identificador} = {valor_procesado}")
 
   def procesar_operacion(self, nodo):
-      """Procesa una operación"""
-      _, operador, op1, op2 = nodo
-      return f"{self.procesar_nodo(op1)} {operador} {self.procesar_nodo(op2)}"
+      """Procesa una operación (operandos y operadores en orden, con una pila explícita)"""
+      return " ".join(map(str, en_orden(nodo, self.procesar_nodo)))
 
   def procesar_condicion(self, nodo):
       """Procesa una condición"""
@@ -119,14 +124,35 @@ class GeneradorCodigoPython:
       
       # Generar la condición del while
       cond = self.procesar_condicion(condicion)
+      contador = self.iniciar_contador(nodo)
       self.agregar_linea(f"while {cond}:")
       
       # Procesar el bloque del while
       self.indentacion += 1
+      self.contar_iteracion(contador, f"mientras ({cond})")
       for instruccion in bloque:
           self.procesar_nodo(instruccion)
       self.indentacion -= 1
 
+  def iniciar_contador(self, nodo):
+      """Declara el contador de iteraciones si el bucle lleva presupuesto (ver terminacion.py); devuelve su nombre o None"""
+      if self.terminacion is None or not self.terminacion.con_presupuesto(nodo):
+          return None
+      contador = f"_iteraciones{self.contadores}"
+      self.contadores += 1
+      self.agregar_linea(f"{contador} = 0")
+      return contador
+
+  def contar_iteracion(self, contador, bucle):
+      """Al inicio del cuerpo: cuenta la iteración y aborta al superar el presupuesto"""
+      if contador is None:
+          return
+      presupuesto = self.terminacion.presupuesto
+      mensaje = f"Se superó el presupuesto de {presupuesto} iteraciones del bucle {bucle}"
+      self.agregar_linea(f"{contador} += 1")
+      self.agregar_linea(f"if {contador} > {presupuesto}:")
+      self.agregar_linea(f"    raise RuntimeError({mensaje!r})")
+
   def procesar_si(self, nodo):
       """Procesa una estructura if simple"""
       _, condicion, bloque = nodo
@@ -204,23 +230,20 @@ class GeneradorCodigoPython:
     self.indentacion -= 1
 
   def procesar_para(self, nodo):
-      """Procesa una estructura for"""
+      """Procesa una estructura for como inicialización y un while con el incremento al final"""
       _, inicializacion, condicion, incremento, bloque = nodo
       
-      # Procesar inicialización
-      var_control = inicializacion[2] if isinstance(inicializacion, tuple) else inicializacion
-      valor_inicial = self.procesar_nodo(inicializacion[3]) if isinstance(inicializacion, tuple) else "0"
-      
-      # Extraer límite de la condición
-      _, op, _, limite = condicion
-      limite_valor = self.procesar_nodo(limite)
-      
-      # Generar for en Python
-      self.agregar_linea(f"for {var_control} in range({valor_inicial}, {limite_valor}):")
+      # Igual que el código intermedio: cualquier comparación y cualquier paso
+      self.procesar_nodo(inicializacion)
+      cond = self.procesar_condicion(condicion)
+      contador = self.iniciar_contador(nodo)
+      self.agregar_linea(f"while {cond}:")
       self.indentacion += 1
+      self.contar_iteracion(contador, f"para ({cond})")
       
       for instruccion in bloque:
           self.procesar_nodo(instruccion)
+      self.procesar_nodo(incremento)
       
       self.indentacion -= 1
 
@@ -230,6 +253,20 @@ class GeneradorCodigoPython:
       valor = self.procesar_nodo(expresion)
       self.agregar_linea(f"print({valor})")
 
+  # tipo de nodo -> método que lo procesa
+  _PROCESAR = {
+      'declaracion': procesar_declaracion,
+      'asignacion': procesar_asignacion,
+      'si': procesar_si,
+      'si_sino': procesar_si_sino,
+      'si_sino_eoc': procesar_si_sino_eoc,
+      'si_eoc': procesar_si_eoc,
+      'mientras': procesar_mientras,
+      'para': procesar_para,
+      'imprimir': procesar_imprimir,
+      'operacion': procesar_operacion,
+  }
+
 if __name__ == "__main__":
   # Ejemplo de AST y código intermedio
   ast_ejemplo = [
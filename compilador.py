@@ -1,24 +1,62 @@
-from semantic import AnalizadorSemantico
-from lexer import lexer
-from parser import parser, TablaSimbolos
-from intermediate_code import GeneradorCodigoIntermedio
-from codegen import GeneradorCodigoPython
+# Las fases se importan al usarlas: importar este módulo no construye el lexer
+# ni el parser, y cada ejecución carga solo los motores que necesita.
 class Compilador:
   """
   Clase principal que implementa un compilador para un mini lenguaje de programación.
   Realiza las fases de análisis léxico, sintáctico, semántico y generación de código.
   """
-  def __init__(self):
+  def __init__(self, motor_lexico='tabla', motor_sintactico='lalr', maximo_errores=None, fusionar_fases=False,
+               presupuesto_bucles=None):
       """
       Inicializa el compilador con sus componentes principales:
+      - Tabla de nombres compartida por todas las fases
       - Analizador semántico
       - Generador de código intermedio
       - Generador de código Python
       - Lista de errores
+      
+      Args:
+          motor_lexico (str): 'tabla' (Python) o 'nativo' (escáner generado
+              con flex; si no está disponible se usa el de Python)
+          motor_sintactico (str): 'lalr' (PLY) o 'descendente' (descendente
+              recursivo, ver parser_descendente.py)
+          maximo_errores (int): Cantidad de errores sintácticos o semánticos
+              tras la cual se abandona el análisis (por defecto
+              diagnosticos.MAXIMO_ERRORES)
+          fusionar_fases (bool): Hacer el análisis semántico, la verificación
+              de tipos, el análisis de terminación y la generación de código
+              intermedio en un solo recorrido del AST (ver fases_fusionadas)
+          presupuesto_bucles (int): Iteraciones que puede hacer un bucle del
+              que no se demostró que termina (por defecto
+              terminacion.PRESUPUESTO_ITERACIONES)
       """
-      self.analizador_semantico = AnalizadorSemantico()
-      self.generador_intermedio = GeneradorCodigoIntermedio()
+      from semantic import AnalizadorSemantico
+      from diagnosticos import MAXIMO_ERRORES
+      from intermediate_code import GeneradorCodigoIntermedio
+      from inferencia_tipos import VerificadorTipos
+      from terminacion import AnalizadorTerminacion, PRESUPUESTO_ITERACIONES
+      from codegen import GeneradorCodigoPython
+      from nombres import TablaNombres
+      from simbolos import TablaSimbolos
+      
+      self.motor_lexico = motor_lexico
+      self.motor_sintactico = motor_sintactico
+      self.fusionar_fases = fusionar_fases
+      self.nombres = TablaNombres()
+      self.maximo_errores = maximo_errores if maximo_errores is not None else MAXIMO_ERRORES
+      # Una sola tabla de símbolos para todas las fases; cada fase la vacía al
+      # empezar porque vuelve a recorrer las declaraciones con sus ámbitos
+      self.tabla_simbolos = TablaSimbolos(self.nombres)
+      self.analizador_semantico = AnalizadorSemantico(self.nombres, self.maximo_errores, self.tabla_simbolos)
+      self.verificador_tipos = VerificadorTipos(self.nombres, self.maximo_errores, self.tabla_simbolos)
+      self.analizador_terminacion = AnalizadorTerminacion(
+          self.nombres, self.maximo_errores, self.tabla_simbolos,
+          presupuesto_bucles if presupuesto_bucles is not None else PRESUPUESTO_ITERACIONES)
+      # El generador baja el AST ya anotado por el análisis semántico y la verificación de tipos
+      self.generador_intermedio = GeneradorCodigoIntermedio(self.nombres, self.tabla_simbolos,
+                                                            self.verificador_tipos, self.analizador_semantico)
       self.generador = GeneradorCodigoPython()
+      self.flujo_tokens = None
       self.errores = []
     
   def analisis_lexico(self, codigo_fuente):
@@ -33,21 +71,17 @@ class Compilador:
       
       Proceso:
       1. Tokeniza el código fuente
-      2. Almacena los tokens encontrados
+      2. Almacena los tokens encontrados en un flujo compacto (self.flujo_tokens)
       3. Detecta errores léxicos
       """
       print("\n=== ANÁLISIS LÉXICO ===")
-      lexer.input(codigo_fuente)
-      tokens = []
+      if self.motor_lexico == 'nativo':
+          from lexer_nativo import tokenizar_nativo as tokenizador
+      else:
+          from flujo_tokens import tokenizar as tokenizador
+      self.flujo_tokens = tokenizador(codigo_fuente, nombres=self.nombres)
       errores_lexicos = []
       
-      # Obtiene todos los tokens del código fuente
-      while True:
-          tok = lexer.token()
-          if not tok:
-              break
-          tokens.append(f"Token: {tok.type}, Valor: {tok.value}, Línea: {tok.lineno}")
-      
       # Manejo de errores y resultados
       if errores_lexicos:
           print("Errores léxicos encontrados:")
@@ -56,37 +90,52 @@ class Compilador:
           return False
       else:
           print("Tokens encontrados:")
-          for token in tokens:
-              print(token)
+          for tipo, valor, linea, _ in self.flujo_tokens:
+              print(f"Token: {tipo}, Valor: {valor}, Línea: {linea}")
           return True
 
-  def analisis_sintactico(self, codigo_fuente):
+  def analisis_sintactico(self, codigo_fuente, analizador_lexico=None):
       """
       Realiza el análisis sintáctico y genera el AST.
       
       Args:
-          codigo_fuente (str): Código fuente a analizar
+          codigo_fuente (str): Código fuente a analizar, o None si el
+              analizador léxico ya tiene su entrada asignada
+          analizador_lexico: Analizador léxico que alimenta al parser
+              (por defecto, un LexerTabla con la tabla de nombres del compilador)
           
       Returns:
           ast: Árbol de sintaxis abstracta o None si hay errores
           
       Proceso:
-      1. Parsea el código fuente
-      2. Genera el AST
-      3. Imprime el AST generado
+      1. Parsea el código fuente, recuperándose de los errores en el fin de
+         cada sentencia o bloque
+      2. Reporta todos los errores de sintaxis y de declaración encontrados
+         (se guardan en self.errores)
+      3. Imprime el AST generado si no hubo errores
       """
       print("\n=== ANÁLISIS SINTÁCTICO ===")
-      try:
-          ast = parser.parse(codigo_fuente, lexer=lexer)
-          if not ast:
-              print("Error: No se pudo generar el AST")
-              return None
-          print("AST generado exitosamente:")
-          self.imprimir_ast(ast)
-          return ast
-      except Exception as e:
-          print(f"Error sintáctico: {str(e)}")
+      from lexer import LexerTabla
+      from parser import ParserSession, parse_con_diagnosticos
+      if analizador_lexico is None:
+          analizador_lexico = LexerTabla(self.nombres)
+      if self.motor_sintactico == 'descendente':
+          from parser_descendente import ParserDescendente
+          self.tabla_simbolos.limpiar()
+          analizador = ParserDescendente(self.tabla_simbolos)
+          ast, self.errores = parse_con_diagnosticos(codigo_fuente, analizador_lexico, self.maximo_errores, analizador)
+      else:
+          sesion = ParserSession(self.nombres, tabla_simbolos=self.tabla_simbolos)
+          ast, self.errores = sesion.parse_con_diagnosticos(codigo_fuente, analizador_lexico, self.maximo_errores)
+      if self.errores:
+          self.imprimir_errores("Errores encontrados durante el análisis sintáctico:", self.errores)
           return None
+      if not ast:
+          print("Error: No se pudo generar el AST")
+          return None
+      print("AST generado exitosamente:")
+      self.imprimir_ast(ast)
+      return ast
 
   def analisis_semantico(self, ast):
       """
@@ -104,18 +153,14 @@ class Compilador:
       3. Construye la tabla de símbolos
       """
       print("\n=== ANÁLISIS SEMÁNTICO ===")
+      from diagnosticos import DemasiadosErrores
+      self.tabla_simbolos.limpiar()
       try:
-          if isinstance(ast, list):
-              for nodo in ast:
-                  self.analizador_semantico.analizar_nodo(nodo)
-          else:
-              self.analizador_semantico.analizar_nodo(ast)
+          self.analizador_semantico.analizar(ast if isinstance(ast, list) else [ast])
           
           # Verifica errores semánticos
           if self.analizador_semantico.errores:
-              print("Errores semánticos encontrados:")
-              for error in self.analizador_semantico.errores:
-                  print(f"- {error}")
+              self.imprimir_errores("Errores semánticos encontrados:", self.analizador_semantico.errores)
               return False
           
           # Muestra la tabla de símbolos
@@ -123,10 +168,77 @@ class Compilador:
           for var, info in self.analizador_semantico.tabla_simbolos.items():
               print(f"- {var}: {info}")
           return True
+      except DemasiadosErrores:
+          self.imprimir_errores("Errores semánticos encontrados:", self.analizador_semantico.errores)
+          return False
       except Exception as e:
           print(f"Error durante el análisis semántico: {str(e)}")
           return False
 
+  def verificacion_tipos(self, ast):
+      """
+      Infiere el tipo de cada expresión y verifica que los tipos sean compatibles.
+      
+      Args:
+          ast: Árbol de sintaxis abstracta
+          
+      Returns:
+          bool: True si no hubo errores de tipos
+          
+      Los tipos inferidos quedan en el verificador, que la generación de
+      código intermedio consulta para anotar cada instrucción.
+      """
+      print("\n=== VERIFICACIÓN DE TIPOS ===")
+      from diagnosticos import DemasiadosErrores
+      self.tabla_simbolos.limpiar()
+      try:
+          self.verificador_tipos.verificar(ast if isinstance(ast, list) else [ast])
+      except DemasiadosErrores:
+          pass
+      if self.verificador_tipos.errores:
+          self.imprimir_errores("Errores de tipos encontrados:", self.verificador_tipos.errores)
+          return False
+      print(f"Tipos verificados: {len(self.verificador_tipos.tipos)} expresiones anotadas")
+      return True
+
+  def analisis_terminacion(self, ast):
+      """
+      Clasifica los bucles según se pueda demostrar que terminan (ver terminacion.py).
+      
+      Args:
+          ast: Árbol de sintaxis abstracta
+          
+      Returns:
+          bool: True si ningún bucle es seguro que no termina
+          
+      Los bucles de los que no se demostró nada se ejecutan con un
+      presupuesto de iteraciones en el código final.
+      """
+      print("\n=== ANÁLISIS DE TERMINACIÓN ===")
+      from diagnosticos import DemasiadosErrores
+      self.tabla_simbolos.limpiar()
+      try:
+          self.analizador_terminacion.analizar(ast if isinstance(ast, list) else [ast])
+      except DemasiadosErrores:
+          pass
+      if self.analizador_terminacion.errores:
+          self.imprimir_errores("Errores de terminación encontrados:", self.analizador_terminacion.errores)
+          return False
+      self.imprimir_bucles()
+      return True
+
+  def imprimir_bucles(self):
+      """Imprime cuántos bucles terminan y cuáles llevan presupuesto de iteraciones"""
+      from terminacion import PRESUPUESTO, texto_condicion
+      bucles = self.analizador_terminacion.bucles.values()
+      vigilados = [bucle for bucle in bucles if bucle.veredicto == PRESUPUESTO]
+      print(f"Bucles: {len(bucles) - len(vigilados)} terminan, {len(vigilados)} con presupuesto "
+            f"de {self.analizador_terminacion.presupuesto} iteraciones")
+      for bucle in vigilados:
+          nodo = bucle.nodo
+          condicion = nodo[1] if nodo[0] == 'mientras' else nodo[2]
+          print(f"- {nodo[0]} ({texto_condicion(condicion)}): {bucle.motivo}")
+
   def generar_codigo_intermedio(self, ast):
       """
       Genera el código intermedio a partir del AST.
@@ -143,22 +255,71 @@ class Compilador:
       3. Retorna el código intermedio generado
       """
       print("\n=== GENERACIÓN DE CÓDIGO INTERMEDIO ===")
+      self.tabla_simbolos.limpiar()
       try:
-          if isinstance(ast, list):
-              for nodo in ast:
-                  self.generador_intermedio.generar_codigo(nodo)
-          else:
-              self.generador_intermedio.generar_codigo(ast)
-          
-          codigo_intermedio = [str(instr) for instr in self.generador_intermedio.codigo]
-          print("Código intermedio generado:")
-          for linea in codigo_intermedio:
-              print(f"- {linea}")
-          return codigo_intermedio
+          self.generador_intermedio.recorrido.recorrer(ast if isinstance(ast, list) else [ast])
+          return self.imprimir_codigo_intermedio()
       except Exception as e:
           print(f"Error en la generación de código intermedio: {str(e)}")
           return None
 
+  def fases_fusionadas(self, ast):
+      """
+      Análisis semántico, verificación de tipos, análisis de terminación y
+      generación de código intermedio en un solo recorrido del AST.
+      
+      Args:
+          ast: Árbol de sintaxis abstracta
+          
+      Returns:
+          list: Lista de instrucciones de código intermedio o None si hay errores
+      
+      En cada sentencia se llama a las cuatro fases en orden (ver pasadas.py),
+      así que la generación de código ya encuentra las anotaciones de las
+      anteriores. Los errores se reportan igual que con las fases separadas.
+      """
+      print("\n=== ANÁLISIS SEMÁNTICO, TIPOS, TERMINACIÓN Y CÓDIGO INTERMEDIO (UN RECORRIDO) ===")
+      from diagnosticos import DemasiadosErrores
+      from pasadas import Recorrido
+      self.tabla_simbolos.limpiar()
+      recorrido = Recorrido([self.analizador_semantico, self.verificador_tipos,
+                             self.analizador_terminacion, self.generador_intermedio], self.tabla_simbolos)
+      fallo = None
+      try:
+          recorrido.recorrer(ast if isinstance(ast, list) else [ast])
+      except DemasiadosErrores:
+          pass
+      except Exception as e:
+          # Con errores semánticos o de tipos la generación puede fallar; se reportan esos errores
+          fallo = str(e)
+      if self.analizador_semantico.errores:
+          self.imprimir_errores("Errores semánticos encontrados:", self.analizador_semantico.errores)
+          return None
+      if self.verificador_tipos.errores:
+          self.imprimir_errores("Errores de tipos encontrados:", self.verificador_tipos.errores)
+          return None
+      if self.analizador_terminacion.errores:
+          self.imprimir_errores("Errores de terminación encontrados:", self.analizador_terminacion.errores)
+          return None
+      if fallo is not None:
+          print(f"Error en la generación de código intermedio: {fallo}")
+          return None
+      print("Tabla de símbolos:")
+      for var, info in self.tabla_simbolos.items():
+          print(f"- {var}: {info}")
+      print(f"Tipos verificados: {len(self.verificador_tipos.tipos)} expresiones anotadas")
+      self.imprimir_bucles()
+      return self.imprimir_codigo_intermedio()
+
+  def imprimir_codigo_intermedio(self):
+      """Imprime el código intermedio generado y lo devuelve como lista de líneas"""
+      # El texto sale de las columnas de la tabla, sin crear un objeto por instrucción
+      codigo_intermedio = list(self.generador_intermedio.codigo.lineas())
+      print("Código intermedio generado:")
+      for linea in codigo_intermedio:
+          print(f"- {linea}")
+      return codigo_intermedio
+
   def generar_codigo_final(self, ast, codigo_intermedio, nombre_archivo):
       """
       Genera el código final en Python.
@@ -173,13 +334,21 @@ class Compilador:
       """
       print("\n=== GENERACIÓN DE CÓDIGO FINAL ===")
       try:
-          self.generador.generar_codigo(ast, codigo_intermedio, nombre_archivo)
+          self.generador.generar_codigo(ast, codigo_intermedio, nombre_archivo, self.analizador_terminacion)
           print(f"Código Python generado exitosamente en: {nombre_archivo}")
           return True
       except Exception as e:
           print(f"Error en la generación de código final: {str(e)}")
           return False
 
+  def imprimir_errores(self, titulo, errores):
+      """Imprime una lista de errores, avisando si se cortó al llegar al máximo"""
+      print(titulo)
+      for error in errores:
+          print(f"- {error}")
+      if len(errores) >= self.maximo_errores:
+          print(f"(se alcanzó el máximo de {self.maximo_errores} errores; puede haber más)")
+
   def imprimir_ast(self, ast, nivel=0):
         """
         Imprime el AST en el formato específico mostrado en la imagen
@@ -187,11 +356,14 @@ class Compilador:
         print("\nEstructura del programa:")
         print("=" * 55)
         
+        from recorridos import repr_ast
+        
         def formato_nodo(nodo):
+            # repr_ast da el mismo texto que str() sin recursión, para expresiones muy profundas
             if isinstance(nodo, tuple):
-                return str(nodo)
+                return repr_ast(nodo)
             elif isinstance(nodo, list):
-                return str(nodo)
+                return repr_ast(nodo)
             else:
                 return str(nodo)
         
@@ -218,8 +390,10 @@ class Compilador:
       1. Análisis léxico
       2. Análisis sintáctico
       3. Análisis semántico
-      4. Generación de código intermedio
-      5. Generación de código final
+      4. Verificación de tipos
+      5. Análisis de terminación
+      6. Generación de código intermedio
+      7. Generación de código final
       """
       print("\n=== INICIO DE COMPILACIÓN ===")
       print("Código fuente a compilar:")
@@ -229,14 +403,70 @@ class Compilador:
       if not self.analisis_lexico(codigo_fuente):
           return False
       
-      ast = self.analisis_sintactico(codigo_fuente)
+      # El parser consume el flujo de tokens ya construido, sin volver a tokenizar
+      ast = self.analisis_sintactico(None, self.flujo_tokens.vista())
       if not ast:
           return False
       
-      if not self.analisis_semantico(ast):
+      return self.compilar_ast(ast, nombre_archivo_salida)
+
+  def compilar_archivo(self, ruta_fuente, nombre_archivo_salida="output.py", tam_bloque=1 << 16):
+      """
+      Compila un archivo fuente sin cargarlo completo en memoria.
+      
+      Args:
+          ruta_fuente (str): Ruta del archivo fuente
+          nombre_archivo_salida (str): Nombre del archivo de salida
+          tam_bloque (int): Cantidad de bytes leídos del archivo en cada bloque
+          
+      Returns:
+          bool: True si la compilación fue exitosa, False si hubo errores
+          
+      Proceso:
+      1. Análisis léxico y sintáctico leyendo el archivo por bloques
+      2. Fases restantes sobre el AST (ver compilar_ast)
+      """
+      print("\n=== INICIO DE COMPILACIÓN ===")
+      print(f"Archivo fuente a compilar: {ruta_fuente}")
+      
+      from lexer import LexerTabla
+      
+      with open(ruta_fuente, 'rb') as archivo:
+          lexer_flujo = LexerTabla(self.nombres)
+          lexer_flujo.input_flujo(archivo, tam_bloque)
+          ast = self.analisis_sintactico(None, lexer_flujo)
+      if not ast:
           return False
       
-      codigo_intermedio = self.generar_codigo_intermedio(ast)
+      return self.compilar_ast(ast, nombre_archivo_salida)
+
+  def compilar_ast(self, ast, nombre_archivo_salida="output.py"):
+      """
+      Ejecuta las fases de compilación posteriores al análisis sintáctico.
+      
+      Args:
+          ast: Árbol de sintaxis abstracta
+          nombre_archivo_salida (str): Nombre del archivo de salida
+          
+      Returns:
+          bool: True si la compilación fue exitosa, False si hubo errores
+          
+      Proceso:
+      1. Análisis semántico
+      2. Verificación de tipos
+      3. Análisis de terminación
+      4. Generación de código intermedio
+      5. Generación de código final
+      
+      Con fusionar_fases, los pasos 1 a 4 se hacen en un solo recorrido.
+      """
+      if self.fusionar_fases:
+          codigo_intermedio = self.fases_fusionadas(ast)
+      elif not self.analisis_semantico(ast) or not self.verificacion_tipos(ast) \
+              or not self.analisis_terminacion(ast):
+          return False
+      else:
+          codigo_intermedio = self.generar_codigo_intermedio(ast)
       if not codigo_intermedio:
           return False
       
@@ -298,4 +528,4 @@ if __name__ == "__main__":
         print(x);
   }
   """
-compilar_y_ejecutar(codigo_prueba, "programa_compilado.py")
\ No newline at end of file
+  compilar_y_ejecutar(codigo_prueba, "programa_compilado.py")
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""
+Opciones globales del compilador.
+
+ARRANQUE_RAPIDO hace que lexer.py y parser.py carguen las tablas congeladas
+de PLY (lextab.py y parsetab.py) sin validar la gramática ni leer el código
+fuente de las reglas, y sin escribir parser.out. Se activa ejecutando Python
+con -O o con la variable de entorno MINI_ARRANQUE_RAPIDO=1.
+
+En este modo las tablas no se comparan con la gramática: después de modificar
+las reglas de lexer.py o parser.py hay que regenerarlas con
+`python configuracion.py`.
+"""
+import os
+
+ARRANQUE_RAPIDO = not __debug__ or os.environ.get('MINI_ARRANQUE_RAPIDO') == '1'
+
+
+def regenerar_tablas():
+    """Vuelve a generar lextab.py y parsetab.py a partir de las reglas actuales"""
+    import ply.lex as lex
+    import ply.yacc as yacc
+    import lexer
+    import parser
+
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    lex.lex(module=lexer).writetab('lextab', directorio)
+    yacc.yacc(module=parser, outputdir=directorio)
+
+
+if __name__ == "__main__":
+    regenerar_tablas()
+    print("Tablas regeneradas: lextab.py, parsetab.py")
@@ -0,0 +1,210 @@
+"""
+Código intermedio en una tabla de cuádruplos.
+
+En lugar de un objeto por instrucción, TablaCuadruplos guarda columnas
+paralelas de enteros: código de operación, resultado, dos operandos y tipo
+del resultado. Cada operando es un entero con su clase en los dos bits bajos
+y su número en el resto:
+
+- temporal k (tk) y etiqueta k (Lk): el número es k, no se guarda texto;
+- nombre de variable: el número es su id en la tabla de nombres de la
+  compilación (ver nombres.py);
+- constante: el número es su índice en el depósito de constantes, que
+  guarda una sola vez el texto de cada constante distinta.
+
+Las instrucciones como objetos (Instruccion) y como texto se crean solo
+cuando se piden, a partir de las columnas. archivo_cuadruplos.py guarda las
+columnas en disco y las vuelve a leer.
+"""
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Optional
+
+from nombres import TablaNombres
+from tipos import TIPOS
+
+OPERACIONES = ('label', 'goto', 'if', 'print', '=',
+               '+', '-', '*', '/', '==', '!=', '<', '>', '<=', '>=')
+ID_OPERACION = {operacion: i for i, operacion in enumerate(OPERACIONES)}
+LABEL, GOTO, IF, PRINT, COPIA = range(5)
+
+# Tipo del resultado de cada instrucción; 0 es sin tipo
+TIPOS_RESULTADO = (None,) + TIPOS
+ID_TIPO = {tipo: i for i, tipo in enumerate(TIPOS_RESULTADO)}
+
+# Clase de un operando (sus dos bits bajos)
+TEMPORAL, ETIQUETA, NOMBRE, CONSTANTE = range(4)
+SIN_OPERANDO = -1
+
+
+def temporal(k):
+    """Operando del temporal tk"""
+    return k << 2 | TEMPORAL
+
+
+def etiqueta(k):
+    """Operando de la etiqueta Lk"""
+    return k << 2 | ETIQUETA
+
+
+# Texto de cada instrucción según su operación: {0} resultado, {1} y {2} operandos
+_FORMATOS = ('{0}:', 'goto {0}', 'if {1} goto {0}', 'print {0}', '{0} = {1}') + tuple(
+    f'{{0}} = {{1}} {operacion} {{2}}' for operacion in OPERACIONES[COPIA + 1:])
+
+
+def formatear(operacion, resultado, operando1=None, operando2=None):
+    """Texto de una instrucción (una operación desconocida se escribe como una copia)"""
+    formato = _FORMATOS[ID_OPERACION.get(operacion, COPIA)]
+    return formato.format(resultado, operando1, operando2)
+
+
+@dataclass
+class Instruccion:
+    """Clase para representar una instrucción de código intermedio"""
+    operacion: str
+    resultado: str
+    operando1: Optional[str] = None
+    operando2: Optional[str] = None
+    # Tipo del resultado según la verificación de tipos (ver inferencia_tipos.py)
+    tipo: Optional[str] = None
+
+    def __str__(self) -> str:
+        return formatear(self.operacion, self.resultado, self.operando1, self.operando2)
+
+
+class VistaCuadruplos:
+    """
+    Lectura de instrucciones guardadas en columnas (operaciones, resultados,
+    operandos1, operandos2 y tipos); las subclases dan las columnas y texto().
+    """
+    __slots__ = ()
+
+    def __len__(self):
+        return len(self.operaciones)
+
+    def __getitem__(self, i):
+        """Vista de la instrucción i como Instruccion, creada al pedirla"""
+        texto = self.texto
+        return Instruccion(OPERACIONES[self.operaciones[i]], texto(self.resultados[i]),
+                           texto(self.operandos1[i]), texto(self.operandos2[i]),
+                           TIPOS_RESULTADO[self.tipos[i]])
+
+    def __iter__(self):
+        for i in range(len(self.operaciones)):
+            yield self[i]
+
+    def linea(self, i):
+        """Texto de la instrucción i, sin crear la Instruccion"""
+        texto = self.texto
+        return _FORMATOS[self.operaciones[i]].format(
+            texto(self.resultados[i]), texto(self.operandos1[i]), texto(self.operandos2[i]))
+
+    def lineas(self):
+        """Genera el texto de cada instrucción, en orden"""
+        texto = self.texto
+        for operacion, resultado, operando1, operando2 in zip(self.operaciones, self.resultados,
+                                                              self.operandos1, self.operandos2):
+            yield _FORMATOS[operacion].format(texto(resultado), texto(operando1), texto(operando2))
+
+
+class TablaCuadruplos(VistaCuadruplos):
+    """
+    Instrucciones de código intermedio en arreglos paralelos de enteros.
+
+    Args:
+        nombres: Tabla de nombres de la compilación
+    """
+    __slots__ = ('operaciones', 'resultados', 'operandos1', 'operandos2', 'tipos',
+                 'nombres', 'constantes', 'ids_constante')
+
+    def __init__(self, nombres=None):
+        self.operaciones = array('B')
+        self.resultados = array('i')
+        self.operandos1 = array('i')
+        self.operandos2 = array('i')
+        self.tipos = array('B')
+        self.nombres = nombres if nombres is not None else TablaNombres()
+        # Depósito de constantes: texto de cada una y texto -> índice
+        self.constantes = []
+        self.ids_constante = {}
+
+    def agregar(self, operacion, resultado, operando1=SIN_OPERANDO, operando2=SIN_OPERANDO, tipo=None):
+        """Agrega una instrucción; operacion es un id de OPERACIONES y los demás, operandos"""
+        self.operaciones.append(operacion)
+        self.resultados.append(resultado)
+        self.operandos1.append(operando1)
+        self.operandos2.append(operando2)
+        self.tipos.append(ID_TIPO[tipo])
+
+    def agregar_instruccion(self, instruccion):
+        """Agrega una Instruccion con operandos de texto"""
+        operando = self.operando
+        self.agregar(ID_OPERACION.get(instruccion.operacion, COPIA), operando(instruccion.resultado),
+                     operando(instruccion.operando1), operando(instruccion.operando2), instruccion.tipo)
+
+    def nombre(self, texto):
+        """Operando de la variable con ese nombre"""
+        return self.nombres.internar(texto) << 2 | NOMBRE
+
+    def constante(self, texto):
+        """Operando de la constante con ese texto, agregándola al depósito si es nueva"""
+        indice = self.ids_constante.get(texto)
+        if indice is None:
+            indice = self.ids_constante[texto] = len(self.constantes)
+            self.constantes.append(texto)
+        return indice << 2 | CONSTANTE
+
+    def operando(self, texto):
+        """Operando a partir de su texto en el código intermedio (None es SIN_OPERANDO)"""
+        if texto is None:
+            return SIN_OPERANDO
+        primera, resto = texto[:1], texto[1:]
+        if resto.isdigit() and resto.isascii():
+            if primera == 't':
+                return temporal(int(resto))
+            if primera == 'L':
+                return etiqueta(int(resto))
+        if texto.isidentifier() and texto not in ('true', 'false'):
+            return self.nombre(texto)
+        return self.constante(texto)
+
+    def texto(self, operando):
+        """Texto de un operando (None si es SIN_OPERANDO)"""
+        if operando < 0:
+            return None
+        clase = operando & 3
+        if clase == NOMBRE:
+            return self.nombres.nombres[operando >> 2]
+        if clase == CONSTANTE:
+            return self.constantes[operando >> 2]
+        return ('t%d' if clase == TEMPORAL else 'L%d') % (operando >> 2)
+
+    def textos_nombre(self):
+        """Texto de cada nombre, indexado por id"""
+        return self.nombres.nombres
+
+    def memoria(self):
+        """Bytes que ocupan las columnas y el depósito de constantes (sin la tabla de nombres)"""
+        columnas = (self.operaciones, self.resultados, self.operandos1, self.operandos2, self.tipos)
+        return (sum(columna.buffer_info()[1] * columna.itemsize for columna in columnas)
+                + sys.getsizeof(self.constantes) + sum(sys.getsizeof(c) for c in self.constantes))
+
+
+if __name__ == "__main__":
+    tabla = TablaCuadruplos()
+    x = tabla.nombre('x')
+    tabla.agregar(COPIA, x, tabla.constante('5'))
+    tabla.agregar(LABEL, etiqueta(0))
+    tabla.agregar(ID_OPERACION['>'], temporal(0), x, tabla.constante('0'), 'booleano')
+    tabla.agregar(IF, etiqueta(1), temporal(0))
+    tabla.agregar(GOTO, etiqueta(2))
+    tabla.agregar(LABEL, etiqueta(1))
+    tabla.agregar_instruccion(Instruccion('-', 't1', 'x', '1', 'entero'))
+    tabla.agregar(COPIA, x, temporal(1))
+    tabla.agregar(GOTO, etiqueta(0))
+    tabla.agregar(LABEL, etiqueta(2))
+    for linea in tabla.lineas():
+        print(linea)
+    print(tabla[6])
+    print(f"{len(tabla)} instrucciones en {tabla.memoria()} bytes")
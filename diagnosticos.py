@@ -0,0 +1,32 @@
+"""
+Lista de diagnósticos de una compilación.
+
+Con recuperación de errores el parser y la tabla de símbolos siguen
+analizando después de cada error y van agregando los mensajes aquí, así que
+una sola compilación reporta todos los errores del archivo. El tope evita que
+un archivo muy dañado produzca miles de errores en cascada.
+"""
+
+MAXIMO_ERRORES = 100
+
+
+class DemasiadosErrores(Exception):
+    """Se alcanzó el máximo de errores de una lista de Diagnosticos"""
+
+
+class Diagnosticos(list):
+    """
+    Mensajes de error acumulados, con un tope.
+
+    Args:
+        maximo: Cantidad de errores tras la cual append() lanza
+            DemasiadosErrores (None para no poner tope)
+    """
+    def __init__(self, maximo=MAXIMO_ERRORES):
+        super().__init__()
+        self.maximo = maximo
+
+    def append(self, mensaje):
+        super().append(mensaje)
+        if self.maximo is not None and len(self) >= self.maximo:
+            raise DemasiadosErrores(f"Se alcanzó el máximo de {self.maximo} errores; se detiene el análisis")
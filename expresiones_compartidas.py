@@ -0,0 +1,130 @@
+"""
+Expresiones compartidas (hash-consing).
+
+Con una TablaExpresiones el parser construye cada operación y condición a
+través de nodo(): si ya existe un nodo con el mismo operador y los mismos
+operandos, devuelve ese en lugar de crear una tupla nueva. Como los operandos
+se construyen antes que el padre, dos subárboles con la misma estructura
+terminan siendo el mismo objeto, y el AST pasa a ser un grafo acíclico.
+
+Las expresiones del lenguaje no tienen efectos secundarios, así que compartir
+nodos no cambia lo que significan ni lo que generan las fases siguientes (que
+comparan y recorren tuplas por valor). Cada nodo compartido tiene un id
+estable, denso y en orden de creación, para detectar reutilización en O(1).
+
+Las fases anotan los nodos por identidad (el tipo inferido, la constante
+plegada), así que un nodo compartido debe significar lo mismo en todos sus
+usos. Un mismo nombre puede declararse con otro tipo en un bloque hermano
+(ver simbolos.py): con la tabla de símbolos del parser, cada identificador
+entra en la clave junto con el símbolo al que se resuelve cuando se reduce
+la expresión, y 'a + a' de dos bloques distintos son nodos distintos.
+"""
+import sys
+
+# Tipos de nodo que se comparten
+EXPRESIONES = frozenset(('operacion', 'condicion'))
+
+
+class TablaExpresiones:
+    """Nodos de expresión únicos de un análisis, con su id estable"""
+    __slots__ = ('nodos', 'ids', 'pedidos', 'tabla_simbolos')
+
+    def __init__(self, tabla_simbolos=None):
+        # Tabla de símbolos del parser, con los ámbitos abiertos mientras reduce
+        self.tabla_simbolos = tabla_simbolos
+        # Clave estructural -> nodo; los operandos que son nodos entran por identidad
+        self.nodos = {}
+        # id(nodo) -> id estable; los nodos siguen vivos porque están en self.nodos
+        self.ids = {}
+        # Nodos que se habrían creado sin compartir
+        self.pedidos = 0
+
+    def nodo(self, tipo, operador, izquierdo, derecho):
+        """Devuelve el nodo (tipo, operador, izquierdo, derecho), creándolo solo si es nuevo"""
+        self.pedidos += 1
+        # 1, 1.0 y True son iguales como claves de diccionario: el tipo los distingue
+        clave = (tipo, operador,
+                 izquierdo.__class__, self._operando(izquierdo),
+                 derecho.__class__, self._operando(derecho))
+        nodo = self.nodos.get(clave)
+        if nodo is None:
+            nodo = self.nodos[clave] = (tipo, operador, izquierdo, derecho)
+            self.ids[id(nodo)] = len(self.ids)
+        return nodo
+
+    def _operando(self, operando):
+        """Parte de la clave de un operando: identidad, valor o identificador y su símbolo"""
+        if operando.__class__ is tuple:
+            return id(operando)
+        if operando.__class__ is str and self.tabla_simbolos is not None:
+            return operando, self.tabla_simbolos.buscar(operando)
+        return operando
+
+    def id_de(self, nodo):
+        """Id estable del nodo, o None si no lo creó esta tabla"""
+        return self.ids.get(id(nodo))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def compartidos(self):
+        """Cantidad de veces que se reutilizó un nodo existente"""
+        return self.pedidos - len(self.ids)
+
+    def memoria(self):
+        """Bytes de las estructuras de la tabla (sin contar los nodos)"""
+        return sys.getsizeof(self.nodos) + sys.getsizeof(self.ids) + sum(map(sys.getsizeof, self.nodos))
+
+
+def memoria_ast(ast):
+    """Bytes de las tuplas y listas del AST, contando una sola vez cada objeto compartido"""
+    vistos = set()
+    total = 0
+    pila = [ast]
+    while pila:
+        nodo = pila.pop()
+        if nodo.__class__ is not tuple and nodo.__class__ is not list:
+            continue
+        if id(nodo) in vistos:
+            continue
+        vistos.add(id(nodo))
+        total += sys.getsizeof(nodo)
+        pila.extend(nodo)
+    return total
+
+
+if __name__ == "__main__":
+    from parser import ParserSession
+
+    codigo = """entero x = 1;
+entero y = 2;
+entero a = (x + y) * (x + y) - (x + y) / 2;
+entero b = (x + y) * 2;
+si ((x + y) > 3) { print((x + y) * (x + y)); }
+"""
+    arbol = ParserSession().parse(codigo)
+    sesion = ParserSession(compartir_expresiones=True)
+    grafo = sesion.parse(codigo)
+    tabla = sesion.expresiones
+    print("mismo AST que sin compartir:", grafo == arbol)
+    print(f"{tabla.pedidos} nodos de expresión, {len(tabla)} únicos, {tabla.compartidos()} reutilizados")
+    print(f"AST: {memoria_ast(arbol)} bytes sin compartir, {memoria_ast(grafo)} bytes compartiendo")
+    x_mas_y = grafo[3][3][2]
+    print(f"{x_mas_y} tiene id {tabla.id_de(x_mas_y)}; es el mismo objeto en la condición del si:",
+          grafo[4][1][2] is x_mas_y)
+
+    # Un nombre redeclarado con otro tipo en un bloque hermano no comparte nodos
+    from inferencia_tipos import VerificadorTipos
+    codigo = """entero x = 1;
+si (x > 0) { entero a = 1; entero b = a + a; }
+si (x > 0) { caracter a = 'q'; entero b = a + a; }
+"""
+    errores = []
+    for compartir in (False, True):
+        sesion = ParserSession(compartir_expresiones=compartir)
+        grafo = sesion.parse(codigo)
+        verificador = VerificadorTipos(tabla_simbolos=sesion.tabla)
+        verificador.verificar(grafo)
+        errores.append(list(verificador.errores))
+    print("a + a en cada bloque es el mismo nodo:", grafo[1][2][1][3] is grafo[2][2][1][3])
+    print("mismos errores de tipos compartiendo:", errores[0] == errores[1], errores[1])
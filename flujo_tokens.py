@@ -0,0 +1,201 @@
+"""
+Representación compacta del flujo de tokens.
+
+En lugar de un objeto LexToken por token, el flujo guarda arreglos paralelos
+(tipo, posición, línea e índice de valor). Cada lexema distinto se convierte
+una sola vez y se guarda en una tabla de valores compartida; en los
+identificadores el índice es directamente su id en la tabla de nombres.
+"""
+from array import array
+
+import ply.lex as lex
+
+from lexer import tokens, reserved, patron_tabla
+from nombres import TablaNombres
+
+# Identificador numérico de cada tipo de token (su posición en 'tokens')
+ID_TIPO = {tipo: i for i, tipo in enumerate(tokens)}
+ID_IDENTIFICADOR = ID_TIPO['IDENTIFICADOR']
+
+
+class FlujoTokens:
+    """Tokens almacenados en arreglos paralelos de enteros"""
+    def __init__(self, nombres=None):
+        self.tipos = array('B')
+        self.posiciones = array('I')
+        self.lineas = array('I')
+        self.valores = array('I')
+        self.tabla_valores = []
+        self.indice_lexemas = {}
+        self.nombres = nombres if nombres is not None else TablaNombres()
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def __iter__(self):
+        """Recorre el flujo como tuplas (tipo, valor, línea, posición)"""
+        tabla = self.tabla_valores
+        nombres = self.nombres.nombres
+        for tipo, posicion, linea, valor in zip(self.tipos, self.posiciones, self.lineas, self.valores):
+            if tipo == ID_IDENTIFICADOR:
+                yield 'IDENTIFICADOR', nombres[valor], linea, posicion
+            else:
+                yield tokens[tipo], tabla[valor], linea, posicion
+
+    def tipo(self, i):
+        return tokens[self.tipos[i]]
+
+    def valor(self, i):
+        if self.tipos[i] == ID_IDENTIFICADOR:
+            return self.nombres.nombres[self.valores[i]]
+        return self.tabla_valores[self.valores[i]]
+
+    def id_nombre(self, i):
+        """Id en la tabla de nombres del identificador en la posición i"""
+        if self.tipos[i] != ID_IDENTIFICADOR:
+            raise ValueError(f"El token {i} no es un identificador")
+        return self.valores[i]
+
+    def token(self, i):
+        """Materializa el token i como un LexToken de PLY"""
+        tok = lex.LexToken()
+        tok.type = tokens[self.tipos[i]]
+        tok.value = self.valor(i)
+        tok.lineno = self.lineas[i]
+        tok.lexpos = self.posiciones[i]
+        return tok
+
+    def derivado(self):
+        """Flujo vacío que comparte la tabla de valores y la de nombres con este"""
+        flujo = FlujoTokens(self.nombres)
+        flujo.tabla_valores = self.tabla_valores
+        flujo.indice_lexemas = self.indice_lexemas
+        return flujo
+
+    def extender(self, data, inicio=0, fin=None, lineno=1):
+        """
+        Agrega los tokens de data[inicio:fin] (sin copiar la cadena) y devuelve
+        el número de línea alcanzado al final del tramo.
+        """
+        tipos, posiciones, lineas, valores = self.tipos, self.posiciones, self.lineas, self.valores
+        indice = self.indice_lexemas
+        registrar = self.registrar
+        for m in patron_tabla.finditer(data, inicio, len(data) if fin is None else fin):
+            tipo = m.lastgroup
+            if tipo == 'IGNORAR':
+                continue
+            if tipo == 'newline':
+                lineno += m.end() - m.start()
+                continue
+            if tipo == 'ILEGAL':
+                print(f"Error léxico en línea {lineno}: Carácter ilegal '{m.group()}'")
+                continue
+            lexema = m.group()
+            # El lexema determina por completo el tipo y el valor del token
+            entrada = indice.get(lexema)
+            if entrada is None:
+                entrada = registrar(lexema, tipo)
+            tipos.append(entrada[0])
+            valores.append(entrada[1])
+            posiciones.append(m.start())
+            lineas.append(lineno)
+        return lineno
+
+    def registrar(self, lexema, tipo):
+        """
+        Convierte un lexema nuevo reconocido por la regla 'tipo' y devuelve su
+        entrada (id de tipo, índice de valor) en el índice de lexemas.
+        """
+        if tipo == 'IDENTIFICADOR':
+            tipo = reserved.get(lexema, 'IDENTIFICADOR')
+            if tipo == 'IDENTIFICADOR':
+                entrada = self.indice_lexemas[lexema] = (ID_IDENTIFICADOR, self.nombres.internar(lexema))
+                return entrada
+        valor = lexema
+        if tipo == 'NUMERO':
+            valor = int(lexema)
+        elif tipo == 'DECIMAL':
+            valor = float(lexema)
+        elif tipo == 'CARACTER':
+            valor = lexema[1:-1]
+        entrada = self.indice_lexemas[lexema] = (ID_TIPO[tipo], len(self.tabla_valores))
+        self.tabla_valores.append(valor)
+        return entrada
+
+    def largos(self):
+        """Largo del lexema de cada entrada de la tabla de valores (los identificadores no están)"""
+        largos = [0] * len(self.tabla_valores)
+        for lexema, (tipo, valor) in self.indice_lexemas.items():
+            if tipo != ID_IDENTIFICADOR:
+                largos[valor] = len(lexema)
+        return largos
+
+    def vista(self, inicio=0, fin=None):
+        """Devuelve una vista sin copia sobre los tokens [inicio, fin)"""
+        return VistaTokens(self, inicio, len(self) if fin is None else fin)
+
+    def memoria(self):
+        """Bytes ocupados por los arreglos del flujo (sin contar la tabla de valores)"""
+        return sum(arreglo.itemsize * len(arreglo)
+                   for arreglo in (self.tipos, self.posiciones, self.lineas, self.valores))
+
+
+class VistaTokens:
+    """
+    Vista de solo lectura sobre un tramo de un FlujoTokens.
+
+    Implementa token() como el lexer de PLY, así que puede pasarse a
+    parser.parse(lexer=...). Los LexToken se crean a medida que el parser
+    los pide, nunca todos a la vez.
+    """
+    def __init__(self, flujo, inicio, fin):
+        self.flujo = flujo
+        self.inicio = inicio
+        self.fin = fin
+        self.actual = inicio
+        self.lineno = flujo.lineas[inicio] if inicio < fin else 1
+        self.lexpos = flujo.posiciones[inicio] if inicio < fin else 0
+
+    def __len__(self):
+        return self.fin - self.inicio
+
+    def __bool__(self):
+        # PLY comprueba 'if not lexer' y con una vista vacía usaría su lexer global
+        return True
+
+    def input(self, data):
+        raise TypeError("VistaTokens ya contiene sus tokens; use parser.parse(lexer=vista) sin entrada")
+
+    def token(self):
+        if self.actual >= self.fin:
+            return None
+        tok = self.flujo.token(self.actual)
+        self.actual += 1
+        self.lineno = tok.lineno
+        self.lexpos = tok.lexpos
+        return tok
+
+
+def tokenizar(data, lineno=1, nombres=None):
+    """
+    Analiza léxicamente el código fuente y devuelve un FlujoTokens.
+    Los identificadores se internan en 'nombres' (o en una tabla nueva).
+    """
+    flujo = FlujoTokens(nombres)
+    flujo.extender(data, lineno=lineno)
+    return flujo
+
+
+if __name__ == "__main__":
+    codigo_prueba = """
+    entero x = 5;
+    mientras (x > 0) {
+        x = x - 1;
+        print(x);
+    }
+    """
+    flujo = tokenizar(codigo_prueba)
+    for tipo, valor, linea, posicion in flujo:
+        print(f"{tipo:<15} {str(valor):<10} {linea:<5} {posicion}")
+    print(f"\n{len(flujo)} tokens, {flujo.memoria()} bytes en arreglos, {len(flujo.tabla_valores)} valores distintos")
+    print(f"Nombres internados: {dict(flujo.nombres.ids)}")
@@ -0,0 +1,201 @@
+"""
+Inferencia y verificación de tipos.
+
+VerificadorTipos es una Pasada (ver pasadas.py): recorre el AST una vez,
+solo o junto con las demás fases, con los mismos ámbitos, y anota cada operación y condición con el tipo de su
+resultado en una tabla aparte indexada por id(nodo). Las fases siguientes
+leen el tipo con tipo() en O(1) en lugar de volver a derivarlo.
+
+Reglas:
+- +, -, * y / siguen la tabla de plegado.OPERACIONES (solo entero y decimal).
+- Las comparaciones dan booleano. <, >, <= y >= comparan números o
+  caracteres; == y != también booleanos entre sí.
+- Una variable decimal acepta un valor entero; en los demás casos el tipo
+  del valor debe ser el declarado.
+- Las condiciones de si, mientras y para deben ser booleanas.
+
+Los errores se acumulan en self.errores y se reportan todos juntos. Una
+expresión que ya tiene un error no genera más errores en las operaciones
+que la contienen.
+"""
+from diagnosticos import Diagnosticos, MAXIMO_ERRORES
+from pasadas import Pasada
+from plegado import OPERACIONES
+from recorridos import reducir_expresion
+from simbolos import TablaSimbolos
+from tipos import DECIMAL, ENTERO, BOOLEANO, CARACTER, NUMERICOS, tipo_literal
+
+
+def _comparaciones():
+    tabla = {}
+    for operador in ('==', '!=', '<', '>', '<=', '>='):
+        for izquierdo in NUMERICOS:
+            for derecho in NUMERICOS:
+                tabla[operador, izquierdo, derecho] = BOOLEANO
+        tabla[operador, CARACTER, CARACTER] = BOOLEANO
+    for operador in ('==', '!='):
+        tabla[operador, BOOLEANO, BOOLEANO] = BOOLEANO
+    return tabla
+
+
+# (operador, tipo, tipo) -> tipo de la comparación
+COMPARACIONES = _comparaciones()
+
+# (tipo de la variable, tipo del valor) que se pueden asignar
+ASIGNABLES = frozenset([(tipo, tipo) for tipo in (ENTERO, DECIMAL, CARACTER, BOOLEANO)] + [(DECIMAL, ENTERO)])
+
+
+class VerificadorTipos(Pasada):
+    """
+    Anota el tipo de cada expresión del AST y verifica que los tipos sean compatibles.
+
+    Args:
+        nombres: Tabla de nombres de la compilación
+        maximo_errores (int): Cantidad de errores tras la cual se lanza
+            DemasiadosErrores
+        tabla_simbolos: La tabla de símbolos de la compilación (ver simbolos.py)
+    """
+    def __init__(self, nombres=None, maximo_errores=MAXIMO_ERRORES, tabla_simbolos=None):
+        self.tabla_simbolos = tabla_simbolos if tabla_simbolos is not None else TablaSimbolos(nombres)
+        self.errores = Diagnosticos(maximo_errores)
+        # id(nodo) -> tipo de cada operación y condición ya inferida
+        self.tipos = {}
+        # Mantiene vivos los nodos anotados para que su id no se reutilice
+        self._nodos = []
+        # Símbolo de la declaración cuyo valor inicial se está verificando
+        self._declarando = None
+
+    def tipo(self, nodo):
+        """Tipo ya inferido de una operación, condición o literal (None si no se conoce)"""
+        if nodo.__class__ is tuple:
+            return self.tipos.get(id(nodo))
+        return tipo_literal(nodo)
+
+    def verificar(self, ast):
+        """Verifica un programa (lista de sentencias); devuelve True si no hubo errores"""
+        self.recorrido.recorrer(ast)
+        return not self.errores
+
+    def verificar_sentencia(self, nodo):
+        self.recorrido.sentencia(nodo)
+
+    def visitar_declaracion(self, nodo, simbolo):
+        # Una redeclaración (simbolo None) ya la reporta el análisis semántico
+        _, tipo, identificador, *valor = nodo
+        if valor and valor[0] is not None:
+            self._declarando = simbolo
+            self._verificar_valor(identificador, tipo, valor[0])
+            self._declarando = None
+
+    def visitar_asignacion(self, nodo, simbolo):
+        _, identificador, valor = nodo
+        if simbolo is None:
+            self.tipo_expresion(valor)
+            self.errores.append(f"Error: Variable '{identificador}' no declarada")
+            return
+        self._verificar_valor(identificador, self.tabla_simbolos.tipos[simbolo], valor)
+
+    def _verificar_valor(self, identificador, tipo, valor):
+        tipo_valor = self.tipo_expresion(valor)
+        if tipo_valor is not None and (tipo, tipo_valor) not in ASIGNABLES:
+            self.errores.append(f"Error de tipos: no se puede asignar un valor {tipo_valor} "
+                                f"a la variable '{identificador}' de tipo {tipo}")
+
+    def entrar_si(self, nodo):
+        # Todas las condiciones antes de los bloques, en el orden en que se evalúan
+        for parte in nodo[1:]:
+            if parte.__class__ is not list:
+                self.verificar_condicion(parte)
+
+    entrar_si_sino = entrar_si_sino_eoc = entrar_si_eoc = entrar_si
+
+    def entrar_mientras(self, nodo):
+        self.verificar_condicion(nodo[1])
+
+    def parte_para(self, nodo, indice):
+        # La condición ve la variable de la inicialización
+        if indice == 1:
+            self.verificar_condicion(nodo[2])
+
+    def visitar_imprimir(self, nodo, simbolo):
+        self.tipo_expresion(nodo[1])
+
+    def verificar_condicion(self, condicion):
+        tipo = self.tipo_expresion(condicion)
+        if tipo is not None and tipo != BOOLEANO:
+            self.errores.append(f"Error de tipos: la condición es de tipo {tipo}, se esperaba booleano")
+
+    def tipo_expresion(self, nodo):
+        """Infiere el tipo de una expresión o condición, anotando cada nodo una sola vez"""
+        if nodo.__class__ is not tuple:
+            return self._tipo_hoja(nodo)
+        tipo = self.tipos.get(id(nodo), self)
+        if tipo is not self:
+            return tipo
+        if nodo[0] == 'condicion':
+            _, operador, izquierdo, derecho = nodo
+            tipo_izquierdo = self.tipo_expresion(izquierdo)
+            tipo_derecho = self.tipo_expresion(derecho)
+            tipo = None
+            if tipo_izquierdo is not None and tipo_derecho is not None:
+                tipo = COMPARACIONES.get((operador, tipo_izquierdo, tipo_derecho))
+                if tipo is None:
+                    self.errores.append(f"Error de tipos: no se puede comparar {tipo_izquierdo} "
+                                        f"{operador} {tipo_derecho}")
+            return self._anotar(nodo, tipo)
+        # Operaciones: postorden con una pila explícita (ver recorridos.py)
+        return reducir_expresion(nodo, self._tipo_operando, self._tipo_operacion)
+
+    def _tipo_operando(self, nodo):
+        if nodo.__class__ is tuple:
+            return self.tipo_expresion(nodo)
+        return self._tipo_hoja(nodo)
+
+    def _tipo_operacion(self, nodo, tipo_izquierdo, tipo_derecho):
+        tipo = self.tipos.get(id(nodo), self)
+        if tipo is not self:
+            return tipo
+        tipo = None
+        if tipo_izquierdo is not None and tipo_derecho is not None:
+            entrada = OPERACIONES.get((nodo[1], tipo_izquierdo, tipo_derecho))
+            if entrada is None:
+                self.errores.append(f"Error de tipos: el operador '{nodo[1]}' no se aplica "
+                                    f"a {tipo_izquierdo} y {tipo_derecho}")
+            else:
+                tipo = entrada[1]
+        return self._anotar(nodo, tipo)
+
+    def _anotar(self, nodo, tipo):
+        self.tipos[id(nodo)] = tipo
+        self._nodos.append(nodo)
+        return tipo
+
+    def _tipo_hoja(self, nodo):
+        tipo = tipo_literal(nodo)
+        if tipo is not None:
+            return tipo
+        simbolo = self.tabla_simbolos.buscar(nodo)
+        # La variable todavía no existe dentro de su propio valor inicial
+        if simbolo is None or simbolo == self._declarando:
+            self.errores.append(f"Error: Variable '{nodo}' no declarada")
+            return None
+        return self.tabla_simbolos.tipos[simbolo]
+
+
+if __name__ == "__main__":
+    from parser import ParserSession
+
+    codigo = """entero x = 1;
+decimal d = x / 2;
+entero e = d * 2;
+caracter c = 'a';
+booleano b = true;
+si (c > 'b') { print(x + c); }
+mientras (x < d) { x = x + 1; }
+"""
+    ast = ParserSession().parse(codigo)
+    verificador = VerificadorTipos()
+    print("sin errores:", verificador.verificar(ast))
+    for error in verificador.errores:
+        print("-", error)
+    print(f"{len(verificador.tipos)} expresiones anotadas; x / 2 es {verificador.tipo(ast[1][3])}")
@@ -1,311 +1,213 @@
-
 from typing import List, Tuple, Union, Optional
-from dataclasses import dataclass
-
-class TablaSimbolos:
-    def __init__(self):
-        self.simbolos = {}
-        
-    def agregar(self, identificador: str, tipo: str) -> None:
-        self.simbolos[identificador] = {'tipo': tipo}
-        
-    def obtener_tipo(self, identificador: str) -> Optional[str]:
-        return self.simbolos.get(identificador, {}).get('tipo')
-        
-    def existe(self, identificador: str) -> bool:
-        return identificador in self.simbolos
-
-@dataclass
-class Instruccion:
-    """Clase para representar una instrucción de código intermedio"""
-    operacion: str
-    resultado: str
-    operando1: Optional[str] = None
-    operando2: Optional[str] = None
-    
-    def __str__(self) -> str:
-        if self.operacion == "label":
-            return f"{self.resultado}:"
-        elif self.operacion == "goto":
-            return f"goto {self.resultado}"
-        elif self.operacion == "if":
-            return f"if {self.operando1} goto {self.resultado}"
-        elif self.operacion == "print":
-            return f"print {self.resultado}"
-        elif self.operacion in ["+", "-", "*", "/", "==", "!=", "<", ">", "<=", ">="]:
-            return f"{self.resultado} = {self.operando1} {self.operacion} {self.operando2}"
-        else:
-            return f"{self.resultado} = {self.operando1}"
-
-class GeneradorCodigoIntermedio:
-    def __init__(self):
+from cuadruplos import (Instruccion, TablaCuadruplos, ID_OPERACION, LABEL, GOTO, IF, PRINT, COPIA,
+                        temporal, etiqueta)
+from nombres import TablaNombres
+from recorridos import reducir_expresion
+from simbolos import TablaSimbolos
+from inferencia_tipos import VerificadorTipos
+from semantic import AnalizadorSemantico
+from pasadas import Pasada
+from tipos import tipo_literal
+
+class GeneradorCodigoIntermedio(Pasada):
+    def __init__(self, nombres: Optional[TablaNombres] = None,
+                 tabla_simbolos: Optional[TablaSimbolos] = None,
+                 tipos: Optional[VerificadorTipos] = None,
+                 semantico: Optional[AnalizadorSemantico] = None):
         self.temp_counter = 0
         self.label_counter = 0
-        self.codigo: List[Instruccion] = []
-        self.tabla_simbolos = TablaSimbolos()
-        
-    def nuevo_temporal(self) -> str:
-        temp = f"t{self.temp_counter}"
+        # La tabla de símbolos de la compilación (ver simbolos.py), si se recibe
+        self.tabla_simbolos = tabla_simbolos if tabla_simbolos is not None else TablaSimbolos(nombres)
+        # Las instrucciones van en columnas de enteros (ver cuadruplos.py); los
+        # operandos son ids, no texto, y las variables usan la tabla de nombres
+        self.codigo = TablaCuadruplos(self.tabla_simbolos.nombres)
+        # Con el verificador que ya recorrió el AST, cada instrucción lleva el tipo de su resultado
+        self.tipos = tipos
+        # Con el análisis semántico que ya recorrió el AST, las operaciones
+        # constantes que plegó se usan como operandos sin generar código
+        self.semantico = semantico
+        # Etiquetas de las estructuras de control abiertas, de la más externa a la actual
+        self._etiquetas: List[tuple] = []
+        
+    def nuevo_temporal(self) -> int:
+        temp = temporal(self.temp_counter)
         self.temp_counter += 1
         return temp
         
-    def nueva_etiqueta(self) -> str:
-        label = f"L{self.label_counter}"
+    def nueva_etiqueta(self) -> int:
+        label = etiqueta(self.label_counter)
         self.label_counter += 1
         return label
         
     def agregar_codigo(self, instruccion: Instruccion) -> None:
-        self.codigo.append(instruccion)
+        self.codigo.agregar_instruccion(instruccion)
+
+    def generar_expresion(self, nodo: Union[tuple, str, int, float]) -> int:
+        # Devuelve el operando (ver cuadruplos.py) con el valor de la expresión
+        # Las operaciones se recorren con una pila explícita (ver recorridos.py)
+        return reducir_expresion(nodo, self._generar_operando, self._generar_operacion,
+                                 self._operacion_plegada if self.semantico is not None else None)
+
+    def _operacion_plegada(self, nodo: tuple) -> Optional[int]:
+        constante = self.semantico.constantes.get(id(nodo))
+        return self.codigo.constante(constante.texto()) if constante is not None else None
+
+    def _generar_operacion(self, nodo: tuple, temp1: int, temp2: int) -> int:
+        temp = self.nuevo_temporal()
+        self.codigo.agregar(ID_OPERACION[nodo[1]], temp, temp1, temp2, self.tipo(nodo))
+        return temp
+
+    def tipo(self, nodo: tuple) -> Optional[str]:
+        return self.tipos.tipo(nodo) if self.tipos is not None else None
 
-    def generar_expresion(self, nodo: Union[tuple, str, int, float]) -> str:
-        if isinstance(nodo, (int, float)):
-            return str(nodo)
+    def _generar_operando(self, nodo: Union[tuple, str, int, float]) -> int:
+        if isinstance(nodo, (int, float)) or tipo_literal(nodo) is not None:
+            return self.codigo.constante(str(nodo))
             
         if isinstance(nodo, str):
-            if not self.tabla_simbolos.existe(nodo):
-                raise ValueError(f"Variable no declarada: {nodo}")
-            return nodo
+            if nodo not in self.tabla_simbolos:
+                self.error(f"Variable no declarada: {nodo}")
+            return self.codigo.nombre(nodo)
             
-        if isinstance(nodo, tuple):
-            if nodo[0] == 'operacion':
-                _, operador, op1, op2 = nodo
-                temp1 = self.generar_expresion(op1)
-                temp2 = self.generar_expresion(op2)
-                temp = self.nuevo_temporal()
-                self.agregar_codigo(Instruccion(operador, temp, temp1, temp2))
-                return temp
-                
-            elif nodo[0] == 'termino':
-                return str(nodo[1])
+        if isinstance(nodo, tuple) and nodo[0] == 'termino':
+            return self.codigo.constante(str(nodo[1]))
                 
         raise ValueError(f"Expresión no válida: {nodo}")
 
-    def generar_declaracion(self, nodo: tuple) -> None:
+    def visitar_declaracion(self, nodo: tuple, simbolo: Optional[int]) -> None:
         _, tipo, id, valor = nodo
         
-        if self.tabla_simbolos.existe(id):
-            raise ValueError(f"Variable ya declarada: {id}")
-            
-        self.tabla_simbolos.agregar(id, tipo)
+        if simbolo is None:
+            self.error(f"Variable ya declarada: {id}")
         
-        if valor:
+        # Un valor inicial 0, 0.0 o false también se asigna
+        if valor is not None:
             temp = self.generar_expresion(valor)
-            self.agregar_codigo(Instruccion("=", id, temp))
+            self.codigo.agregar(COPIA, self.codigo.nombre(id), temp)
 
-    def generar_asignacion(self, nodo: tuple) -> None:
+    def visitar_asignacion(self, nodo: tuple, simbolo: Optional[int]) -> None:
         _, id, valor = nodo
         
-        if not self.tabla_simbolos.existe(id):
-            raise ValueError(f"Variable no declarada: {id}")
+        if simbolo is None:
+            self.error(f"Variable no declarada: {id}")
             
         temp = self.generar_expresion(valor)
-        self.agregar_codigo(Instruccion("=", id, temp))
+        self.codigo.agregar(COPIA, self.codigo.nombre(id), temp)
 
-    def generar_condicion(self, nodo: tuple) -> str:
+    def generar_condicion(self, nodo: tuple) -> int:
         _, operador, op1, op2 = nodo
         temp1 = self.generar_expresion(op1)
         temp2 = self.generar_expresion(op2)
         temp = self.nuevo_temporal()
-        self.agregar_codigo(Instruccion(operador, temp, temp1, temp2))
+        self.codigo.agregar(ID_OPERACION[operador], temp, temp1, temp2, self.tipo(nodo))
         return temp
 
-    def generar_if(self, nodo: tuple) -> None:
-        tipo_if = nodo[0]
+    def entrar_si(self, nodo: tuple) -> None:
+        # Una etiqueta por bloque (si, sino, eoc) y la del final
+        condiciones = [parte for parte in nodo[1:] if not isinstance(parte, list)]
+        bloques = len(nodo) - 1 - len(condiciones)
+        etiquetas = [self.nueva_etiqueta() for _ in range(bloques + 1)]
         
-        if tipo_if == 'si':  # if simple
-            _, condicion, bloque = nodo
-            etiq_verdadera = self.nueva_etiqueta()
-            etiq_fin = self.nueva_etiqueta()
-            
-            temp_cond = self.generar_condicion(condicion)
-            self.agregar_codigo(Instruccion("if", etiq_verdadera, temp_cond))
-            self.agregar_codigo(Instruccion("goto", etiq_fin))
-            
-            self.agregar_codigo(Instruccion("label", etiq_verdadera))
-            self.generar_bloque(bloque)
-            self.agregar_codigo(Instruccion("label", etiq_fin))
-            
-        elif tipo_if == 'si_sino':  # if con else-if
-            _, condicion1, bloque1, condicion2, bloque2 = nodo
-            etiq_verdadera1 = self.nueva_etiqueta()
-            etiq_verdadera2 = self.nueva_etiqueta()
-            etiq_fin = self.nueva_etiqueta()
-            
-            # Primera condición (if)
-            temp_cond1 = self.generar_condicion(condicion1)
-            self.agregar_codigo(Instruccion("if", etiq_verdadera1, temp_cond1))
-            
-            # Segunda condición (sino)
-            temp_cond2 = self.generar_condicion(condicion2)
-            self.agregar_codigo(Instruccion("if", etiq_verdadera2, temp_cond2))
-            self.agregar_codigo(Instruccion("goto", etiq_fin))
-            
-            # Primer bloque
-            self.agregar_codigo(Instruccion("label", etiq_verdadera1))
-            self.generar_bloque(bloque1)
-            self.agregar_codigo(Instruccion("goto", etiq_fin))
-            
-            # Segundo bloque
-            self.agregar_codigo(Instruccion("label", etiq_verdadera2))
-            self.generar_bloque(bloque2)
-            
-            self.agregar_codigo(Instruccion("label", etiq_fin))
-            
-        elif tipo_if == 'si_sino_eoc':  # if con else-if y else
-            _, condicion1, bloque1, condicion2, bloque2, bloque_eoc = nodo
-            etiq_verdadera1 = self.nueva_etiqueta()
-            etiq_verdadera2 = self.nueva_etiqueta()
-            etiq_eoc = self.nueva_etiqueta()
-            etiq_fin = self.nueva_etiqueta()
-            
-            # Primera condición (if)
-            temp_cond1 = self.generar_condicion(condicion1)
-            self.agregar_codigo(Instruccion("if", etiq_verdadera1, temp_cond1))
-            
-            # Segunda condición (sino)
-            temp_cond2 = self.generar_condicion(condicion2)
-            self.agregar_codigo(Instruccion("if", etiq_verdadera2, temp_cond2))
-            self.agregar_codigo(Instruccion("goto", etiq_eoc))
-            
-            # Primer bloque
-            self.agregar_codigo(Instruccion("label", etiq_verdadera1))
-            self.generar_bloque(bloque1)
-            self.agregar_codigo(Instruccion("goto", etiq_fin))
-            
-            # Segundo bloque
-            self.agregar_codigo(Instruccion("label", etiq_verdadera2))
-            self.generar_bloque(bloque2)
-            self.agregar_codigo(Instruccion("goto", etiq_fin))
-            
-            # Bloque eoc
-            self.agregar_codigo(Instruccion("label", etiq_eoc))
-            self.generar_bloque(bloque_eoc)
-            
-            self.agregar_codigo(Instruccion("label", etiq_fin))
-            
-        elif tipo_if == 'si_eoc':  # if con else
-            _, condicion, bloque, bloque_eoc = nodo
-            etiq_verdadera = self.nueva_etiqueta()
-            etiq_eoc = self.nueva_etiqueta()
-            etiq_fin = self.nueva_etiqueta()
-            
+        # Salta al bloque de la primera condición verdadera; si ninguna lo
+        # es, al eoc o al final
+        for condicion, etiqueta_bloque in zip(condiciones, etiquetas):
             temp_cond = self.generar_condicion(condicion)
-            self.agregar_codigo(Instruccion("if", etiq_verdadera, temp_cond))
-            self.agregar_codigo(Instruccion("goto", etiq_eoc))
-            
-            self.agregar_codigo(Instruccion("label", etiq_verdadera))
-            self.generar_bloque(bloque)
-            self.agregar_codigo(Instruccion("goto", etiq_fin))
-            
-            self.agregar_codigo(Instruccion("label", etiq_eoc))
-            self.generar_bloque(bloque_eoc)
-            
-            self.agregar_codigo(Instruccion("label", etiq_fin))
+            self.codigo.agregar(IF, etiqueta_bloque, temp_cond)
+        self.codigo.agregar(GOTO, etiquetas[len(condiciones)])
+        self._etiquetas.append(etiquetas)
+
+    def parte_si(self, nodo: tuple, indice: int) -> None:
+        etiquetas = self._etiquetas[-1]
+        # El bloque anterior termina saltando al final
+        if indice:
+            self.codigo.agregar(GOTO, etiquetas[-1])
+        self.codigo.agregar(LABEL, etiquetas[indice])
+
+    def salir_si(self, nodo: tuple) -> None:
+        self.codigo.agregar(LABEL, self._etiquetas.pop()[-1])
 
-    def generar_while(self, nodo: tuple) -> None:
+    entrar_si_sino = entrar_si_sino_eoc = entrar_si_eoc = entrar_si
+    parte_si_sino = parte_si_sino_eoc = parte_si_eoc = parte_si
+    salir_si_sino = salir_si_sino_eoc = salir_si_eoc = salir_si
+
+    def entrar_mientras(self, nodo: tuple) -> None:
         _, condicion, bloque = nodo
         etiq_inicio = self.nueva_etiqueta()
         etiq_cuerpo = self.nueva_etiqueta()
         etiq_fin = self.nueva_etiqueta()
 
-        self.agregar_codigo(Instruccion("label", etiq_inicio))
+        self.codigo.agregar(LABEL, etiq_inicio)
         temp_cond = self.generar_condicion(condicion)
-        self.agregar_codigo(Instruccion("if", etiq_cuerpo, temp_cond))
-        self.agregar_codigo(Instruccion("goto", etiq_fin))
-        
-        self.agregar_codigo(Instruccion("label", etiq_cuerpo))
-        self.generar_bloque(bloque)
-        self.agregar_codigo(Instruccion("goto", etiq_inicio))
-        self.agregar_codigo(Instruccion("label", etiq_fin))
-
-    def generar_for(self, nodo: tuple) -> None:
-        """
-        Genera código intermedio para una estructura for
-        
-        Args:
-            nodo: Tupla que contiene la información del bucle for
-        """
-        # Desempaquetar el nodo
-        _, inicializacion, condicion, incremento, bloque = nodo
-        
-        # Generar código para la inicialización
-        if inicializacion[0] == 'declaracion':
-            self.generar_declaracion(inicializacion)
-        elif inicializacion[0] == 'asignacion':
-            self.generar_asignacion(inicializacion)
-        
-        # Crear etiquetas para el bucle
-        etiq_inicio = self.nueva_etiqueta()
-        etiq_cuerpo = self.nueva_etiqueta()
-        etiq_fin = self.nueva_etiqueta()
+        self.codigo.agregar(IF, etiq_cuerpo, temp_cond)
+        self.codigo.agregar(GOTO, etiq_fin)
+        
+        self.codigo.agregar(LABEL, etiq_cuerpo)
+        self._etiquetas.append((etiq_inicio, etiq_fin))
+
+    def salir_mientras(self, nodo: tuple) -> None:
+        etiq_inicio, etiq_fin = self._etiquetas.pop()
+        self.codigo.agregar(GOTO, etiq_inicio)
+        self.codigo.agregar(LABEL, etiq_fin)
+
+    def parte_para(self, nodo: tuple, indice: int) -> None:
+        # Hijos del para: inicialización (0), bloque (1) e incremento (2); el
+        # incremento es una asignación y se baja después del bloque
+        if indice == 1:
+            _, inicializacion, condicion, incremento, bloque = nodo
+            etiq_inicio = self.nueva_etiqueta()
+            etiq_cuerpo = self.nueva_etiqueta()
+            etiq_fin = self.nueva_etiqueta()
+            
+            self.codigo.agregar(LABEL, etiq_inicio)
+            
+            temp_cond = self.generar_condicion(condicion) if isinstance(condicion, tuple) and condicion[0] == 'condicion' else self.generar_expresion(condicion)
+            
+            self.codigo.agregar(IF, etiq_cuerpo, temp_cond)
+            self.codigo.agregar(GOTO, etiq_fin)
+            
+            self.codigo.agregar(LABEL, etiq_cuerpo)
+            self._etiquetas.append((etiq_inicio, etiq_fin))
 
-        # Etiqueta de inicio del bucle
-        self.agregar_codigo(Instruccion("label", etiq_inicio))
-        
-        # Generar código para la condición
-        if isinstance(condicion, tuple) and condicion[0] == 'condicion':
-            temp_cond = self.generar_condicion(condicion)
-        else:
-            temp_cond = self.generar_expresion(condicion)
-        
-        self.agregar_codigo(Instruccion("if", etiq_cuerpo, temp_cond))
-        self.agregar_codigo(Instruccion("goto", etiq_fin))
-        
-        # Etiqueta y código del cuerpo del bucle
-        self.agregar_codigo(Instruccion("label", etiq_cuerpo))
-        self.generar_bloque(bloque)
-        
-        # Generar código para el incremento
-        if isinstance(incremento, tuple):
-            if incremento[0] == 'incremento':
-                # Manejar incremento del tipo: i = i + 1
-                _, var, op1, operador, op2 = incremento
-                temp = self.nuevo_temporal()
-                self.agregar_codigo(Instruccion(operador, temp, op1, str(op2)))
-                self.agregar_codigo(Instruccion("=", var, temp))
-            elif incremento[0] == 'incremento_simple':
-                # Manejar incremento del tipo: i++
-                _, var, operador = incremento
-                temp = self.nuevo_temporal()
-                self.agregar_codigo(Instruccion("+", temp, var, "1"))
-                self.agregar_codigo(Instruccion("=", var, temp))
-        
-        # Volver al inicio del bucle
-        self.agregar_codigo(Instruccion("goto", etiq_inicio))
-        
-        # Etiqueta de fin del bucle
-        self.agregar_codigo(Instruccion("label", etiq_fin))
+    def salir_para(self, nodo: tuple) -> None:
+        etiq_inicio, etiq_fin = self._etiquetas.pop()
+        self.codigo.agregar(GOTO, etiq_inicio)
+        self.codigo.agregar(LABEL, etiq_fin)
 
-    def generar_bloque(self, bloque: List[tuple]) -> None:
-        for instruccion in bloque:
-            self.generar_codigo(instruccion)
+    def visitar_incremento(self, nodo: tuple, simbolo: None) -> None:
+        _, var, op1, operador, op2 = nodo
+        temp = self.nuevo_temporal()
+        self.codigo.agregar(ID_OPERACION[operador], temp, self.codigo.operando(str(op1)),
+                            self.codigo.operando(str(op2)))
+        self.codigo.agregar(COPIA, self.codigo.nombre(var), temp)
 
-    def generar_codigo(self, nodo: tuple) -> None:
-        if not isinstance(nodo, tuple):
+    def visitar_incremento_simple(self, nodo: tuple, simbolo: None) -> None:
+        _, var, operador = nodo
+        temp = self.nuevo_temporal()
+        if operador == '++':
+            self.codigo.agregar(ID_OPERACION["+"], temp, self.codigo.nombre(var), self.codigo.constante("1"))
+        elif operador == '--':
+            self.codigo.agregar(ID_OPERACION["-"], temp, self.codigo.nombre(var), self.codigo.constante("1"))
+        self.codigo.agregar(COPIA, self.codigo.nombre(var), temp)
+
+    def visitar_imprimir(self, nodo: tuple, simbolo: None) -> None:
+        temp = self.generar_expresion(nodo[1])
+        self.codigo.agregar(PRINT, temp)
+
+    def nodo_desconocido(self, nodo: tuple) -> None:
+        self.error(f"Tipo de nodo no soportado: {nodo[0]}")
+
+    def error(self, mensaje: str) -> None:
+        # Si el análisis semántico o la verificación de tipos ya reportaron
+        # errores (al recorrer el AST junto con ellos), el código se descarta:
+        # se sigue recorriendo para que esas fases terminen de reportar
+        if (self.semantico is not None and self.semantico.errores) or \
+                (self.tipos is not None and self.tipos.errores):
             return
-            
-        tipo_nodo = nodo[0]
-        if tipo_nodo == 'declaracion':
-            self.generar_declaracion(nodo)
-        elif tipo_nodo == 'asignacion':
-            self.generar_asignacion(nodo)
-        elif tipo_nodo == 'si':
-            self.generar_if(nodo)
-        elif tipo_nodo == 'si_sino':
-            self.generar_if(nodo)  # Aquí llamamos a la misma función para manejar si_sino
-        elif tipo_nodo == 'si_sino_eoc':
-            self.generar_if(nodo)  # Aquí también
-        elif tipo_nodo == 'si_eoc':
-            self.generar_if(nodo)  # Y aquí
-        elif tipo_nodo == 'mientras':
-            self.generar_while(nodo)
-        elif tipo_nodo == 'para':
-            self.generar_for(nodo)
-        elif tipo_nodo == 'imprimir':
-            temp = self.generar_expresion(nodo[1])
-            self.agregar_codigo(Instruccion("print", temp))
-        else:
-            raise ValueError(f"Tipo de nodo no soportado: {tipo_nodo}")
+        raise ValueError(mensaje)
+
+    def generar_codigo(self, nodo: tuple) -> None:
+        # Recorrido baja por los bloques y maneja ámbitos y símbolos (ver pasadas.py)
+        self.recorrido.sentencia(nodo)
 
 def compilar(codigo_fuente: str) -> Tuple[Optional[List[str]], List[str]]:
     """
@@ -318,39 +220,96 @@ def compilar(codigo_fuente: str) -> Tuple[Optional[List[str]], List[str]]:
         Tuple[Optional[List[str]], List[str]]: (código intermedio, errores)
     """
     try:
-        from lexer import lexer
-        from parser import parser
+        from parser import ParserSession
         
-        # Análisis sintáctico
-        arbol = parser.parse(codigo_fuente, lexer=lexer)
+        # Análisis sintáctico con una sesión propia: cada llamada empieza con
+        # la tabla de símbolos vacía y el número de línea en 1
+        nombres = TablaNombres()
+        arbol = ParserSession(nombres).parse(codigo_fuente)
         if not arbol:
             return None, ["Error en el análisis sintáctico"]
 
         # Generación de código intermedio
-        generador = GeneradorCodigoIntermedio()
+        generador = GeneradorCodigoIntermedio(nombres)
         if isinstance(arbol, list):
             for nodo in arbol:
                 generador.generar_codigo(nodo)
         else:
             generador.generar_codigo(arbol)
 
-        return [str(instr) for instr in generador.codigo], []
+        return list(generador.codigo.lineas()), []
+
+    except Exception as e:
+        return None, [f"Error durante la compilación: {str(e)}"]
+
+def compilar_archivo(ruta: str, tam_bloque: int = 1 << 16) -> Tuple[Optional[List[str]], List[str]]:
+    """
+    Compila un archivo fuente leyéndolo por bloques, sin cargarlo completo en memoria
+    
+    Args:
+        ruta: Ruta del archivo fuente
+        tam_bloque: Cantidad de bytes leídos en cada bloque
+        
+    Returns:
+        Tuple[Optional[List[str]], List[str]]: (código intermedio, errores)
+    """
+    try:
+        from parser import ParserSession
+        
+        # Análisis sintáctico alimentado por el lexer de flujo de una sesión propia
+        nombres = TablaNombres()
+        sesion = ParserSession(nombres)
+        with open(ruta, 'rb') as archivo:
+            sesion.lexer.input_flujo(archivo, tam_bloque)
+            arbol = sesion.parse()
+        if not arbol:
+            return None, ["Error en el análisis sintáctico"]
+
+        # Generación de código intermedio
+        generador = GeneradorCodigoIntermedio(nombres)
+        for nodo in arbol:
+            generador.generar_codigo(nodo)
+
+        return list(generador.codigo.lineas()), []
 
     except Exception as e:
         return None, [f"Error durante la compilación: {str(e)}"]
 
-def guardar_codigo_intermedio(codigo: List[str], nombre_archivo: str) -> None:
+def guardar_codigo_intermedio(codigo: Union[List[str], TablaCuadruplos], nombre_archivo: str) -> None:
     """
     Guarda el código intermedio generado en un archivo
     
     Args:
-        codigo: Lista de instrucciones de código intermedio
-        nombre_archivo: Nombre del archivo donde guardar el código
+        codigo: Lista de instrucciones de código intermedio, o la TablaCuadruplos del generador
+        nombre_archivo: Nombre del archivo donde guardar el código; con la
+            extensión .cuad se guarda en formato binario (ver archivo_cuadruplos.py)
     """
+    from archivo_cuadruplos import EXTENSION, guardar, leer_texto
+    if nombre_archivo.endswith(EXTENSION):
+        guardar(codigo if isinstance(codigo, TablaCuadruplos) else leer_texto(codigo), nombre_archivo)
+        return
+    if isinstance(codigo, TablaCuadruplos):
+        codigo = codigo.lineas()
     with open(nombre_archivo, 'w', encoding='utf-8') as f:
         for linea in codigo:
             f.write(linea + '\n')
 
+def cargar_codigo_intermedio(nombre_archivo: str) -> TablaCuadruplos:
+    """
+    Lee el código intermedio guardado con guardar_codigo_intermedio, en texto o binario
+    
+    Args:
+        nombre_archivo: Nombre del archivo
+        
+    Returns:
+        TablaCuadruplos: Las instrucciones; lineas() da el texto que usan el optimizador y codegen
+    """
+    from archivo_cuadruplos import es_binario, cargar, leer_texto
+    if es_binario(nombre_archivo):
+        return cargar(nombre_archivo)
+    with open(nombre_archivo, encoding='utf-8') as f:
+        return leer_texto(f)
+
 if __name__ == "__main__":
     # Ejemplo 1: Operaciones aritméticas
     codigo1 = """
@@ -386,340 +345,18 @@ if __name__ == "__main__":
         print("Código intermedio generado:")
         for linea in codigo_intermedio:
             print(linea)
-from typing import List, Tuple, Union, Optional
-from dataclasses import dataclass
 
-class TablaSimbolos:
-    def __init__(self):
-        self.simbolos = {}
-        
-    def agregar(self, identificador: str, tipo: str) -> None:
-        self.simbolos[identificador] = {'tipo': tipo}
-        
-    def obtener_tipo(self, identificador: str) -> Optional[str]:
-        return self.simbolos.get(identificador, {}).get('tipo')
-        
-    def existe(self, identificador: str) -> bool:
-        return identificador in self.simbolos
-
-@dataclass
-class Instruccion:
-    """Clase para representar una instrucción de código intermedio"""
-    operacion: str
-    resultado: str
-    operando1: Optional[str] = None
-    operando2: Optional[str] = None
-    
-    def __str__(self) -> str:
-        if self.operacion == "label":
-            return f"{self.resultado}:"
-        elif self.operacion == "goto":
-            return f"goto {self.resultado}"
-        elif self.operacion == "if":
-            return f"if {self.operando1} goto {self.resultado}"
-        elif self.operacion == "print":
-            return f"print {self.resultado}"
-        elif self.operacion in ["+", "-", "*", "/", "==", "!=", "<", ">", "<=", ">="]:
-            return f"{self.resultado} = {self.operando1} {self.operacion} {self.operando2}"
-        else:
-            return f"{self.resultado} = {self.operando1}"
-
-class GeneradorCodigoIntermedio:
-    def __init__(self):
-        self.temp_counter = 0
-        self.label_counter = 0
-        self.codigo: List[Instruccion] = []
-        self.tabla_simbolos = TablaSimbolos()
-        
-    def nuevo_temporal(self) -> str:
-        temp = f"t{self.temp_counter}"
-        self.temp_counter += 1
-        return temp
-        
-    def nueva_etiqueta(self) -> str:
-        label = f"L{self.label_counter}"
-        self.label_counter += 1
-        return label
-        
-    def agregar_codigo(self, instruccion: Instruccion) -> None:
-        self.codigo.append(instruccion)
-
-    def generar_expresion(self, nodo: Union[tuple, str, int, float]) -> str:
-        if isinstance(nodo, (int, float)):
-            return str(nodo)
-            
-        if isinstance(nodo, str):
-            if not self.tabla_simbolos.existe(nodo):
-                raise ValueError(f"Variable no declarada: {nodo}")
-            return nodo
-            
-        if isinstance(nodo, tuple):
-            if nodo[0] == 'operacion':
-                _, operador, op1, op2 = nodo
-                temp1 = self.generar_expresion(op1)
-                temp2 = self.generar_expresion(op2)
-                temp = self.nuevo_temporal()
-                self.agregar_codigo(Instruccion(operador, temp, temp1, temp2))
-                return temp
-                
-            elif nodo[0] == 'termino':
-                return str(nodo[1])
-                
-        raise ValueError(f"Expresión no válida: {nodo}")
-
-    def generar_declaracion(self, nodo: tuple) -> None:
-        _, tipo, id, valor = nodo
-        
-        if self.tabla_simbolos.existe(id):
-            raise ValueError(f"Variable ya declarada: {id}")
-            
-        self.tabla_simbolos.agregar(id, tipo)
-        
-        if valor:
-            temp = self.generar_expresion(valor)
-            self.agregar_codigo(Instruccion("=", id, temp))
-
-    def generar_asignacion(self, nodo: tuple) -> None:
-        _, id, valor = nodo
-        
-        if not self.tabla_simbolos.existe(id):
-            raise ValueError(f"Variable no declarada: {id}")
-            
-        temp = self.generar_expresion(valor)
-        self.agregar_codigo(Instruccion("=", id, temp))
-
-    def generar_condicion(self, nodo: tuple) -> str:
-        _, operador, op1, op2 = nodo
-        temp1 = self.generar_expresion(op1)
-        temp2 = self.generar_expresion(op2)
-        temp = self.nuevo_temporal()
-        self.agregar_codigo(Instruccion(operador, temp, temp1, temp2))
-        return temp
-
-    def generar_if(self, nodo: tuple) -> None:
-        tipo_if = nodo[0]
-        
-        if tipo_if == 'si':  # if simple
-            _, condicion, bloque = nodo
-            etiq_verdadera = self.nueva_etiqueta()
-            etiq_fin = self.nueva_etiqueta()
-            
-            temp_cond = self.generar_condicion(condicion)
-            self.agregar_codigo(Instruccion("if", etiq_verdadera, temp_cond))
-            self.agregar_codigo(Instruccion("goto", etiq_fin))
-            
-            self.agregar_codigo(Instruccion("label", etiq_verdadera))
-            self.generar_bloque(bloque)
-            self.agregar_codigo(Instruccion("label", etiq_fin))
-            
-        elif tipo_if == 'si_sino':  # if con else-if
-            _, condicion1, bloque1, condicion2, bloque2 = nodo
-            etiq_verdadera1 = self.nueva_etiqueta()
-            etiq_verdadera2 = self.nueva_etiqueta()
-            etiq_fin = self.nueva_etiqueta()
-            
-            # Primera condición (if)
-            temp_cond1 = self.generar_condicion(condicion1)
-            self.agregar_codigo(Instruccion("if", etiq_verdadera1, temp_cond1))
-            
-            # Segunda condición (sino)
-            temp_cond2 = self.generar_condicion(condicion2)
-            self.agregar_codigo(Instruccion("if", etiq_verdadera2, temp_cond2))
-            self.agregar_codigo(Instruccion("goto", etiq_fin))
-            
-            # Primer bloque
-            self.agregar_codigo(Instruccion("label", etiq_verdadera1))
-            self.generar_bloque(bloque1)
-            self.agregar_codigo(Instruccion("goto", etiq_fin))
-            
-            # Segundo bloque
-            self.agregar_codigo(Instruccion("label", etiq_verdadera2))
-            self.generar_bloque(bloque2)
-            
-            self.agregar_codigo(Instruccion("label", etiq_fin))
-            
-        elif tipo_if == 'si_sino_eoc':  # if con else-if y else
-            _, condicion1, bloque1, condicion2, bloque2, bloque_eoc = nodo
-            etiq_verdadera1 = self.nueva_etiqueta()
-            etiq_verdadera2 = self.nueva_etiqueta()
-            etiq_eoc = self.nueva_etiqueta()
-            etiq_fin = self.nueva_etiqueta()
-            
-            # Primera condición (if)
-            temp_cond1 = self.generar_condicion(condicion1)
-            self.agregar_codigo(Instruccion("if", etiq_verdadera1, temp_cond1))
-            
-            # Segunda condición (sino)
-            temp_cond2 = self.generar_condicion(condicion2)
-            self.agregar_codigo(Instruccion("if", etiq_verdadera2, temp_cond2))
-            self.agregar_codigo(Instruccion("goto", etiq_eoc))
-            
-            # Primer bloque
-            self.agregar_codigo(Instruccion("label", etiq_verdadera1))
-            self.generar_bloque(bloque1)
-            self.agregar_codigo(Instruccion("goto", etiq_fin))
-            
-            # Segundo bloque
-            self.agregar_codigo(Instruccion("label", etiq_verdadera2))
-            self.generar_bloque(bloque2)
-            self.agregar_codigo(Instruccion("goto", etiq_fin))
-            
-            # Bloque eoc
-            self.agregar_codigo(Instruccion("label", etiq_eoc))
-            self.generar_bloque(bloque_eoc)
-            
-            self.agregar_codigo(Instruccion("label", etiq_fin))
-            
-        elif tipo_if == 'si_eoc':  # if con else
-            _, condicion, bloque, bloque_eoc = nodo
-            etiq_verdadera = self.nueva_etiqueta()
-            etiq_eoc = self.nueva_etiqueta()
-            etiq_fin = self.nueva_etiqueta()
-            
-            temp_cond = self.generar_condicion(condicion)
-            self.agregar_codigo(Instruccion("if", etiq_verdadera, temp_cond))
-            self.agregar_codigo(Instruccion("goto", etiq_eoc))
-            
-            self.agregar_codigo(Instruccion("label", etiq_verdadera))
-            self.generar_bloque(bloque)
-            self.agregar_codigo(Instruccion("goto", etiq_fin))
-            
-            self.agregar_codigo(Instruccion("label", etiq_eoc))
-            self.generar_bloque(bloque_eoc)
-            
-            self.agregar_codigo(Instruccion("label", etiq_fin))
-
-    def generar_while(self, nodo: tuple) -> None:
-        _, condicion, bloque = nodo
-        etiq_inicio = self.nueva_etiqueta()
-        etiq_cuerpo = self.nueva_etiqueta()
-        etiq_fin = self.nueva_etiqueta()
-
-        self.agregar_codigo(Instruccion("label", etiq_inicio))
-        temp_cond = self.generar_condicion(condicion)
-        self.agregar_codigo(Instruccion("if", etiq_cuerpo, temp_cond))
-        self.agregar_codigo(Instruccion("goto", etiq_fin))
-        
-        self.agregar_codigo(Instruccion("label", etiq_cuerpo))
-        self.generar_bloque(bloque)
-        self.agregar_codigo(Instruccion("goto", etiq_inicio))
-        self.agregar_codigo(Instruccion("label", etiq_fin))
-
-    def generar_for(self, nodo: tuple) -> None:
-        _, inicializacion, condicion, incremento, bloque = nodo
-        
-        # Handle initialization
-        if inicializacion[0] == 'declaracion':
-            self.generar_declaracion(inicializacion)
-        elif inicializacion[0] == 'asignacion':
-            self.generar_asignacion(inicializacion)
-        
-        # Create and handle labels
-        etiq_inicio = self.nueva_etiqueta()
-        etiq_cuerpo = self.nueva_etiqueta()
-        etiq_fin = self.nueva_etiqueta()
-        
-        self.agregar_codigo(Instruccion("label", etiq_inicio))
-        
-        # Handle condition
-        temp_cond = self.generar_condicion(condicion) if isinstance(condicion, tuple) and condicion[0] == 'condicion' else self.generar_expresion(condicion)
-        
-        self.agregar_codigo(Instruccion("if", etiq_cuerpo, temp_cond))
-        self.agregar_codigo(Instruccion("goto", etiq_fin))
-        
-        # Handle loop body
-        self.agregar_codigo(Instruccion("label", etiq_cuerpo))
-        self.generar_bloque(bloque)
-        
-        # Handle increment
-        if isinstance(incremento, tuple):
-            if incremento[0] == 'incremento':
-                _, var, op1, operador, op2 = incremento
-                temp = self.nuevo_temporal()
-                self.agregar_codigo(Instruccion(operador, temp, op1, str(op2)))
-                self.agregar_codigo(Instruccion("=", var, temp))
-            elif incremento[0] == 'incremento_simple':
-                _, var, operador = incremento
-                temp = self.nuevo_temporal()
-                self.agregar_codigo(Instruccion("+", temp, var, "1"))
-                self.agregar_codigo(Instruccion("=", var, temp))
-        
-        self.agregar_codigo(Instruccion("goto", etiq_inicio))
-        self.agregar_codigo(Instruccion("label", etiq_fin))
-
-    def generar_incremento(self, nodo: tuple) -> None:
-        _, var, op1, operador, op2 = nodo
-        temp = self.nuevo_temporal()
-        self.agregar_codigo(Instruccion(operador, temp, op1, str(op2)))
-        self.agregar_codigo(Instruccion("=", var, temp))
-
-    def generar_incremento_simple(self, nodo: tuple) -> None:
-        _, var, operador = nodo
-        temp = self.nuevo_temporal()
-        if operador == '++':
-            self.agregar_codigo(Instruccion("+", temp, var, "1"))
-        elif operador == '--':
-            self.agregar_codigo(Instruccion("-", temp, var, "1"))
-        self.agregar_codigo(Instruccion("=", var, temp))
-
-    def generar_bloque(self, bloque: List[tuple]) -> None:
-        for instruccion in bloque:
-            self.generar_codigo(instruccion)
-
-    def generar_codigo(self, nodo: tuple) -> None:
-        if not isinstance(nodo, tuple):
-            return
-            
-        handlers = {
-            'declaracion': self.generar_declaracion,
-            'asignacion': self.generar_asignacion,
-            'si': self.generar_if,
-            'si_sino': self.generar_if,
-            'si_sino_eoc': self.generar_if,
-            'si_eoc': self.generar_if,
-            'mientras': self.generar_while,
-            'para': self.generar_for,
-            'incremento': lambda n: self.generar_incremento(n),
-            'incremento_simple': lambda n: self.generar_incremento_simple(n)
-        }
-            
-        tipo_nodo = nodo[0]
-        if tipo_nodo in handlers:
-            handlers[tipo_nodo](nodo)
-        elif tipo_nodo == 'imprimir':
-            temp = self.generar_expresion(nodo[1])
-            self.agregar_codigo(Instruccion("print", temp))
-        else:
-            raise ValueError(f"Tipo de nodo no soportado: {tipo_nodo}")
-
-def compilar(codigo_fuente: str) -> Tuple[Optional[List[str]], List[str]]:
-    """
-    Compila el código fuente y genera código intermedio
-    
-    Args:
-        codigo_fuente: Código fuente a compilar
-        
-    Returns:
-        Tuple[Optional[List[str]], List[str]]: (código intermedio, errores)
-    """
-    try:
-        from lexer import lexer
-        from parser import parser
-        
-        # Análisis sintáctico
-        arbol = parser.parse(codigo_fuente, lexer=lexer)
-        if not arbol:
-            return None, ["Error en el análisis sintáctico"]
-
-        # Generación de código intermedio
-        generador = GeneradorCodigoIntermedio()
-        if isinstance(arbol, list):
-            for nodo in arbol:
-                generador.generar_codigo(nodo)
-        else:
-            generador.generar_codigo(arbol)
-
-        return [str(instr) for instr in generador.codigo], []
-
-    except Exception as e:
-        return None, [f"Error durante la compilación: {str(e)}"]
+        # El mismo código guardado en binario y leído de vuelta
+        import os
+        import tempfile
+        ruta = os.path.join(tempfile.mkdtemp(), "prueba2.cuad")
+        guardar_codigo_intermedio(codigo_intermedio, ruta)
+        leido = cargar_codigo_intermedio(ruta)
+        print(f"\n{ruta}: {os.path.getsize(ruta)} bytes, {len(leido)} instrucciones,",
+              "iguales:", list(leido.lineas()) == codigo_intermedio)
+        os.remove(ruta)
+
+    # Cada compilación usa su propia sesión del parser y su propia tabla de nombres
+    print("\nPrueba 3: El mismo programa compilado otra vez")
+    codigo_intermedio, errores = compilar(codigo1)
+    print("Errores encontrados:" if errores else "Sin errores:", errores)
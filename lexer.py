@@ -1,99 +1,270 @@
-import ply.lex as lex
-
-# Lista de tokens
-tokens = (
-    'IDENTIFICADOR',
-    'NUMERO',
-    'DECIMAL',
-    'CARACTER',
-    'SUMA',
-    'RESTA',
-    'MULT',
-    'DIV',
-    'ASIG',
-    'IGUAL',
-    'DIFERENTE',
-    'MENOR',
-    'MAYOR',
-    'MENORIGUAL',
-    'MAYORIGUAL',
-    'PARIZQ',
-    'PARDER',
-    'LLAVEIZQ',
-    'LLAVEDER',
-    'PUNTOCOMA',
-    'AND',
-    'OR',
-    'NOT',
-)
-
-# Palabras reservadas
-reserved = {
-    'entero': 'TIPO_ENTERO',
-    'decimal': 'TIPO_DECIMAL',
-    'caracter': 'TIPO_CARACTER',
-    'booleano': 'TIPO_BOOLEANO',
-    'si': 'SI',
-    'sino': 'SINO',
-    'eoc': 'EOC',
-    'para': 'PARA',
-    'mientras': 'MIENTRAS',
-    'print': 'PRINT',
-    'true': 'TRUE',
-    'false': 'FALSE'
-    
-}
-
-tokens = tokens + tuple(reserved.values())
-
-# Reglas para tokens simples
-t_SUMA = r'\+'
-t_RESTA = r'-'
-t_MULT = r'\*'
-t_DIV = r'/'
-t_ASIG = r'='
-t_IGUAL = r'=='
-t_DIFERENTE = r'!='
-t_MENOR = r'<'
-t_MAYOR = r'>'
-t_MENORIGUAL = r'<='
-t_MAYORIGUAL = r'>='
-t_PARIZQ = r'\('
-t_PARDER = r'\)'
-t_LLAVEIZQ = r'\{'
-t_LLAVEDER = r'\}'
-t_PUNTOCOMA = r';'
-#Estas funciones definen tokens más complejos
-#Convierte el valor capturado en un número de punto flotante.
-def t_DECIMAL(t):
-    r'\d+\.\d+'
-    t.value = float(t.value)
-    return t
-#Convierte el valor capturado en un número entero.
-def t_NUMERO(t):
-    r'\d+'
-    t.value = int(t.value)
-    return t
-#Extrae el carácter encapsulado entre comillas simples.
-def t_CARACTER(t):
-    r'\'[a-zA-Z]\''
-    t.value = t.value[1:-1]
-    return t
-#Reconoce cadenas que inician con una letra o subrayado y están compuestas por letras, números o subrayados. 
-#Si coinciden con una palabra reservada, se clasifica como tal.
-def t_IDENTIFICADOR(t):
-    r'[a-zA-Z_][a-zA-Z0-9_]*'
-    t.type = reserved.get(t.value, 'IDENTIFICADOR')
-    return t
-#Actualiza el número de línea cuando se encuentra una o más nuevas líneas.
-def t_newline(t):
-    r'\n+'
-    t.lexer.lineno += len(t.value)
-#Omite espacios en blanco y tabulaciones durante el análisis léxico.
-t_ignore = ' \t'
-#Imprime un mensaje de error si encuentra un carácter no reconocido y avanza al siguiente carácter.
-def t_error(t):
-    print(f"Error léxico en línea {t.lexer.lineno}: Carácter ilegal '{t.value[0]}'")
-    t.lexer.skip(1)
-#Se crea una instancia del analizador léxico utilizando la función lex().
-lexer = lex.lex()
+import ply.lex as lex
+from ply.lex import TOKEN
+from nombres import TablaNombres
+from configuracion import ARRANQUE_RAPIDO
+
+# Lista de tokens
+tokens = (
+    'IDENTIFICADOR',
+    'NUMERO',
+    'DECIMAL',
+    'CARACTER',
+    'SUMA',
+    'RESTA',
+    'MULT',
+    'DIV',
+    'ASIG',
+    'IGUAL',
+    'DIFERENTE',
+    'MENOR',
+    'MAYOR',
+    'MENORIGUAL',
+    'MAYORIGUAL',
+    'PARIZQ',
+    'PARDER',
+    'LLAVEIZQ',
+    'LLAVEDER',
+    'PUNTOCOMA',
+    'AND',
+    'OR',
+    'NOT',
+)
+
+# Palabras reservadas
+reserved = {
+    'entero': 'TIPO_ENTERO',
+    'decimal': 'TIPO_DECIMAL',
+    'caracter': 'TIPO_CARACTER',
+    'booleano': 'TIPO_BOOLEANO',
+    'si': 'SI',
+    'sino': 'SINO',
+    'eoc': 'EOC',
+    'para': 'PARA',
+    'mientras': 'MIENTRAS',
+    'print': 'PRINT',
+    'true': 'TRUE',
+    'false': 'FALSE'
+    
+}
+
+tokens = tokens + tuple(reserved.values())
+
+# Reglas para tokens simples
+t_SUMA = r'\+'
+t_RESTA = r'-'
+t_MULT = r'\*'
+t_DIV = r'/'
+t_ASIG = r'='
+t_IGUAL = r'=='
+t_DIFERENTE = r'!='
+t_MENOR = r'<'
+t_MAYOR = r'>'
+t_MENORIGUAL = r'<='
+t_MAYORIGUAL = r'>='
+t_PARIZQ = r'\('
+t_PARDER = r'\)'
+t_LLAVEIZQ = r'\{'
+t_LLAVEDER = r'\}'
+t_PUNTOCOMA = r';'
+#Expresiones de los tokens definidos con funciones. Se asignan con @TOKEN en lugar
+#de escribirlas como docstring para que sigan disponibles con python -OO, que
+#elimina los docstrings (ver configuracion.py), y el motor de tabla las usa igual.
+_RE_DECIMAL = r'\d+\.\d+'
+_RE_NUMERO = r'\d+'
+_RE_CARACTER = r'\'[a-zA-Z]\''
+_RE_IDENTIFICADOR = r'[a-zA-Z_][a-zA-Z0-9_]*'
+_RE_NEWLINE = r'\n+'
+#Estas funciones definen tokens más complejos
+#Convierte el valor capturado en un número de punto flotante.
+@TOKEN(_RE_DECIMAL)
+def t_DECIMAL(t):
+    t.value = float(t.value)
+    return t
+#Convierte el valor capturado en un número entero.
+@TOKEN(_RE_NUMERO)
+def t_NUMERO(t):
+    t.value = int(t.value)
+    return t
+#Extrae el carácter encapsulado entre comillas simples.
+@TOKEN(_RE_CARACTER)
+def t_CARACTER(t):
+    t.value = t.value[1:-1]
+    return t
+#Reconoce cadenas que inician con una letra o subrayado y están compuestas por letras, números o subrayados. 
+#Si coinciden con una palabra reservada, se clasifica como tal; si no, se interna en la tabla de nombres.
+@TOKEN(_RE_IDENTIFICADOR)
+def t_IDENTIFICADOR(t):
+    t.type = reserved.get(t.value, 'IDENTIFICADOR')
+    if t.type == 'IDENTIFICADOR':
+        t.value = t.lexer.nombres.canonico(t.value)
+    return t
+#Actualiza el número de línea cuando se encuentra una o más nuevas líneas.
+@TOKEN(_RE_NEWLINE)
+def t_newline(t):
+    t.lexer.lineno += len(t.value)
+#Omite espacios en blanco y tabulaciones durante el análisis léxico.
+t_ignore = ' \t'
+#Imprime un mensaje de error si encuentra un carácter no reconocido y avanza al siguiente carácter.
+def t_error(t):
+    print(f"Error léxico en línea {t.lexer.lineno}: Carácter ilegal '{t.value[0]}'")
+    t.lexer.skip(1)
+#Se crea una instancia del analizador léxico utilizando la función lex().
+#En el modo de arranque rápido se carga la tabla congelada lextab.py sin validar las reglas.
+if ARRANQUE_RAPIDO:
+    lexer = lex.lex(optimize=1, lextab='lextab')
+else:
+    lexer = lex.lex()
+#Tabla de nombres donde se internan los identificadores (ver nombres.py).
+lexer.nombres = TablaNombres()
+
+
+import codecs
+import re
+
+#Motor alternativo: todas las reglas se combinan en una sola expresión regular con grupos nombrados.
+#El orden replica el que usa PLY (funciones en orden de definición y luego cadenas por longitud
+#decreciente), de modo que ambos motores producen exactamente los mismos tokens.
+_reglas_funcion = (t_DECIMAL, t_NUMERO, t_CARACTER, t_IDENTIFICADOR, t_newline)
+_reglas_cadena = sorted(
+    ((nombre[2:], regex) for nombre, regex in list(globals().items())
+     if nombre.startswith('t_') and nombre != 't_ignore' and isinstance(regex, str)),
+    key=lambda regla: len(regla[1]),
+    reverse=True,
+)
+patron_tabla = re.compile('|'.join(
+    ['(?P<IGNORAR>[%s]+)' % re.escape(t_ignore)]
+    + ['(?P<%s>%s)' % (regla.__name__[2:], regla.regex) for regla in _reglas_funcion]
+    + ['(?P<%s>%s)' % regla for regla in _reglas_cadena]
+    + ['(?P<ILEGAL>.)']
+))
+
+class LexerTabla:
+    """
+    Analizador léxico de una sola pasada sobre el patrón combinado.
+
+    Tiene la misma interfaz que el lexer de PLY (input, token, lineno, lexpos),
+    por lo que puede pasarse directamente a parser.parse(). Las palabras
+    reservadas y las conversiones de valores se resuelven dentro del ciclo de
+    búsqueda, sin invocar una función de Python por cada token.
+    """
+    def __init__(self, nombres=None):
+        self.lexdata = ''
+        self.lexpos = 0
+        self.lineno = 1
+        self.nombres = nombres if nombres is not None else TablaNombres()
+        self._tokens = iter(())
+
+    def input(self, data):
+        self.lexdata = data
+        self.lexpos = 0
+        self._tokens = self._generar(data)
+
+    def input_flujo(self, fuente, tam_bloque=1 << 16):
+        """
+        Toma la entrada de un archivo (texto o binario UTF-8) o de un mmap,
+        leyéndola en bloques de tam_bloque. La memoria usada queda acotada por
+        el tamaño del bloque y no por el del archivo.
+        """
+        self.lexdata = ''
+        self.lexpos = 0
+        self._tokens = self._generar_flujo(fuente, tam_bloque)
+
+    def token(self):
+        return next(self._tokens, None)
+
+    def clone(self):
+        return LexerTabla(self.nombres)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        tok = self.token()
+        if tok is None:
+            raise StopIteration
+        return tok
+
+    def _generar_flujo(self, fuente, tam_bloque):
+        #Ningún token contiene espacios, tabuladores ni saltos de línea, así que cortar
+        #justo después del último de ellos garantiza que ningún token quede partido.
+        decodificador = codecs.getincrementaldecoder('utf-8')()
+        pendiente = ''
+        base = 0
+        while True:
+            bloque = fuente.read(tam_bloque)
+            final = not bloque
+            if isinstance(bloque, (bytes, bytearray)):
+                bloque = decodificador.decode(bloque, final)
+            pendiente += bloque
+            if final:
+                corte = len(pendiente)
+            else:
+                corte = max(pendiente.rfind(' '), pendiente.rfind('\t'), pendiente.rfind('\n')) + 1
+                if corte == 0:
+                    continue
+            yield from self._generar(pendiente[:corte], base)
+            base += corte
+            pendiente = pendiente[corte:]
+            if final:
+                return
+
+    def _generar(self, data, base=0):
+        reservadas = reserved
+        ids, nombres = self.nombres.ids, self.nombres.nombres
+        nuevo_token = lex.LexToken
+        for m in patron_tabla.finditer(data):
+            tipo = m.lastgroup
+            if tipo == 'IGNORAR':
+                continue
+            if tipo == 'newline':
+                self.lineno += m.end() - m.start()
+                continue
+            valor = m.group()
+            if tipo == 'IDENTIFICADOR':
+                tipo = reservadas.get(valor, 'IDENTIFICADOR')
+                if tipo == 'IDENTIFICADOR':
+                    #Internado en línea para no invocar una función por token
+                    id_nombre = ids.get(valor)
+                    if id_nombre is None:
+                        ids[valor] = len(nombres)
+                        nombres.append(valor)
+                    else:
+                        valor = nombres[id_nombre]
+            elif tipo == 'NUMERO':
+                valor = int(valor)
+            elif tipo == 'DECIMAL':
+                valor = float(valor)
+            elif tipo == 'CARACTER':
+                valor = valor[1:-1]
+            elif tipo == 'ILEGAL':
+                print(f"Error léxico en línea {self.lineno}: Carácter ilegal '{valor}'")
+                continue
+            tok = nuevo_token()
+            tok.type = tipo
+            tok.value = valor
+            tok.lineno = self.lineno
+            tok.lexpos = self.lexpos = base + m.start()
+            yield tok
+        self.lexpos = base + len(data)
+
+#Instancia del motor alternativo, intercambiable con 'lexer'.
+lexer_tabla = LexerTabla()
+
+#Devuelve un analizador léxico nuevo del motor indicado ('ply', 'tabla' o 'nativo').
+#Si no se indica una tabla de nombres, el analizador usa una propia.
+#Si el motor nativo no puede construirse (ver lexer_nativo.py) se usa el de PLY.
+def crear_lexer(motor='ply', nombres=None):
+    if nombres is None:
+        nombres = TablaNombres()
+    if motor == 'ply':
+        nuevo = lexer.clone()
+        nuevo.nombres = nombres
+        return nuevo
+    if motor == 'tabla':
+        return LexerTabla(nombres)
+    if motor == 'nativo':
+        from lexer_nativo import LexerNativo, disponible
+        if disponible():
+            return LexerNativo(nombres)
+        return crear_lexer('ply', nombres)
+    raise ValueError(f"Motor léxico desconocido: {motor}")
@@ -0,0 +1,155 @@
+"""
+Reanálisis léxico incremental para ediciones de texto.
+
+Como ningún token contiene espacios, tabuladores ni saltos de línea, el
+análisis léxico que empieza después de uno de ellos no depende de lo que
+haya antes. Tras una edición basta con volver a tokenizar el tramo sin
+blancos que rodea al texto modificado: antes y después de ese tramo los
+tokens no cambian, solo se desplazan.
+
+Para que desplazarlos no cueste recorrer el resto del archivo, los tokens
+que están después del punto de corte guardan su posición y su línea
+relativas al final del texto. Una edición anterior a ellos no cambia esos
+valores, y mover el punto de corte cuesta solo la distancia recorrida,
+que en un editor suele ser pequeña. Lo único que depende del tamaño del
+archivo son las copias de memoria al reconstruir el texto y al desplazar
+los arreglos, que se hacen en C.
+"""
+import re
+from array import array
+
+from flujo_tokens import tokenizar
+
+_blanco = re.compile(r'[ \t\n]')
+_BLANCOS = ' \t\n'
+
+
+class LexerIncremental:
+    """Mantiene el flujo de tokens de un texto a través de sucesivas ediciones"""
+    def __init__(self, texto, nombres=None):
+        flujo = tokenizar(texto, nombres=nombres)
+        self.texto = texto
+        self.total_lineas = texto.count('\n') + 1
+        self.tablas = flujo.derivado()
+        self.tipos = flujo.tipos
+        self.valores = flujo.valores
+        self.posiciones = array('q', flujo.posiciones)
+        self.lineas = array('q', flujo.lineas)
+        # Los tokens [0, corte) guardan coordenadas absolutas y [corte, n) relativas al final
+        self.corte = len(flujo)
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def posicion(self, i):
+        if i < self.corte:
+            return self.posiciones[i]
+        return self.posiciones[i] + len(self.texto)
+
+    def linea(self, i):
+        if i < self.corte:
+            return self.lineas[i]
+        return self.lineas[i] + self.total_lineas
+
+    def __iter__(self):
+        """Recorre los tokens como tuplas (tipo, valor, línea, posición)"""
+        flujo = self.a_flujo()
+        return iter(flujo)
+
+    def a_flujo(self):
+        """Copia el estado actual a un FlujoTokens con coordenadas absolutas"""
+        self._mover_corte(len(self))
+        flujo = self.tablas.derivado()
+        flujo.tipos = array('B', self.tipos)
+        flujo.valores = array('I', self.valores)
+        flujo.posiciones = array('I', self.posiciones)
+        flujo.lineas = array('I', self.lineas)
+        return flujo
+
+    def editar(self, inicio, eliminados, insertado):
+        """
+        Aplica la edición texto[inicio:inicio+eliminados] = insertado.
+
+        Returns:
+            tuple: (primero, fin_anterior, fin_nuevo): los tokens
+            [primero, fin_anterior) del flujo anterior fueron reemplazados
+            por los tokens [primero, fin_nuevo) del flujo actual.
+        """
+        viejo = self.texto
+        fin_eliminado = inicio + eliminados
+        nuevo = viejo[:inicio] + insertado + viejo[fin_eliminado:]
+        delta = len(insertado) - eliminados
+
+        # Tramo dañado: desde el último blanco anterior a la edición hasta el
+        # primer blanco posterior al texto insertado
+        desde = inicio
+        while desde > 0 and viejo[desde - 1] not in _BLANCOS:
+            desde -= 1
+        m = _blanco.search(nuevo, inicio + len(insertado))
+        hasta_nuevo = m.start() if m else len(nuevo)
+        hasta_viejo = hasta_nuevo - delta
+
+        primero = self._buscar(desde)
+        fin_anterior = self._buscar(hasta_viejo)
+
+        # Los tokens anteriores al tramo quedan absolutos y los posteriores relativos al final
+        if self.corte < primero:
+            self._mover_corte(primero)
+        elif self.corte > fin_anterior:
+            self._mover_corte(fin_anterior)
+
+        if primero > 0:
+            linea = self.lineas[primero - 1] + viejo.count('\n', self.posiciones[primero - 1], desde)
+        else:
+            linea = 1 + viejo.count('\n', 0, desde)
+
+        tramo = self.tablas.derivado()
+        tramo.extender(nuevo, desde, hasta_nuevo, linea)
+
+        self.tipos[primero:fin_anterior] = tramo.tipos
+        self.valores[primero:fin_anterior] = tramo.valores
+        self.posiciones[primero:fin_anterior] = array('q', tramo.posiciones)
+        self.lineas[primero:fin_anterior] = array('q', tramo.lineas)
+
+        self.texto = nuevo
+        self.total_lineas += insertado.count('\n') - viejo.count('\n', inicio, fin_eliminado)
+        self.corte = primero + len(tramo)
+        return primero, fin_anterior, self.corte
+
+    def _buscar(self, posicion):
+        """Índice del primer token que empieza en 'posicion' o después (búsqueda binaria)"""
+        bajo, alto = 0, len(self)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if self.posicion(medio) < posicion:
+                bajo = medio + 1
+            else:
+                alto = medio
+        return bajo
+
+    def _mover_corte(self, destino):
+        """Convierte las coordenadas de los tokens entre el corte actual y 'destino'"""
+        posiciones, lineas = self.posiciones, self.lineas
+        largo, total = len(self.texto), self.total_lineas
+        if destino > self.corte:
+            for i in range(self.corte, destino):
+                posiciones[i] += largo
+                lineas[i] += total
+        else:
+            for i in range(destino, self.corte):
+                posiciones[i] -= largo
+                lineas[i] -= total
+        self.corte = destino
+
+
+if __name__ == "__main__":
+    codigo = "entero x = 5;\nmientras (x > 0) {\n    x = x - 1;\n}\nprint(x);\n"
+    incremental = LexerIncremental(codigo)
+
+    # Cambiar "x - 1" por "x - 10" y agregar una línea antes del print
+    print(incremental.editar(codigo.index("1;"), 1, "10"))
+    print(incremental.editar(incremental.texto.index("print"), 0, "x = 2.5;\n"))
+
+    for tipo, valor, linea, posicion in incremental:
+        print(f"{tipo:<15} {str(valor):<10} {linea:<5} {posicion}")
+    print("Igual a tokenizar desde cero:", list(incremental) == list(tokenizar(incremental.texto)))
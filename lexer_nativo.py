@@ -0,0 +1,257 @@
+"""
+Acelerador nativo del análisis léxico.
+
+lexer_nativo.l es una especificación de flex con las mismas reglas que
+lexer.py. La primera vez que se usa, el C generado por flex se compila como
+biblioteca compartida con el compilador de C del sistema (queda guardada en
+__pycache__) y se carga con ctypes. El escáner analiza todo el texto de una
+vez y devuelve arreglos con los tokens y la lista de lexemas distintos, de
+modo que Python solo convierte cada lexema una vez y arma el FlujoTokens
+copiando arreglos completos.
+
+Si flex o el compilador de C no están disponibles se usa el analizador de
+Python. Lo mismo ocurre con textos que no son ASCII, porque el escáner
+cuenta posiciones en bytes y no en caracteres.
+"""
+import ctypes
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+from array import array
+
+from flujo_tokens import FlujoTokens, ID_TIPO, tokenizar
+from nombres import TablaNombres
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+ESPECIFICACION = os.path.join(DIRECTORIO, 'lexer_nativo.l')
+DIRECTORIO_CACHE = os.path.join(DIRECTORIO, '__pycache__')
+
+
+class _Resultado(ctypes.Structure):
+    """Parte pública de resultado_t (ver lexer_nativo.l)"""
+    _fields_ = [
+        ('ids', ctypes.POINTER(ctypes.c_uint)),
+        ('posiciones', ctypes.POINTER(ctypes.c_uint)),
+        ('lineas', ctypes.POINTER(ctypes.c_uint)),
+        ('cantidad', ctypes.c_long),
+        ('lexema_posicion', ctypes.POINTER(ctypes.c_uint)),
+        ('lexema_largo', ctypes.POINTER(ctypes.c_uint)),
+        ('lexema_regla', ctypes.POINTER(ctypes.c_ubyte)),
+        ('lexemas', ctypes.c_long),
+        ('ilegal_posicion', ctypes.POINTER(ctypes.c_uint)),
+        ('ilegal_linea', ctypes.POINTER(ctypes.c_uint)),
+        ('ilegales', ctypes.c_long),
+        ('linea', ctypes.c_long),
+    ]
+
+
+# None: todavía no se intentó cargar; False: no disponible
+_biblioteca = None
+_reglas = None
+
+
+def compilar_biblioteca():
+    """
+    Genera y compila la biblioteca a partir de lexer_nativo.l.
+
+    Las herramientas se toman de las variables de entorno FLEX y CC (por
+    defecto 'flex' y 'cc'). El nombre del archivo incluye un resumen de la
+    especificación, así que un cambio en ella produce una biblioteca nueva.
+
+    Returns:
+        str: Ruta de la biblioteca, o None si no pudo construirse
+    """
+    flex = shutil.which(os.environ.get('FLEX', 'flex'))
+    cc = os.environ.get('CC', 'cc').split()
+    if flex is None or not cc or shutil.which(cc[0]) is None:
+        return None
+    with open(ESPECIFICACION, 'rb') as archivo:
+        especificacion = archivo.read()
+    firma = hashlib.sha1(especificacion + ' '.join([flex] + cc).encode()).hexdigest()[:12]
+    sufijo = '.dll' if os.name == 'nt' else '.so'
+    destino = os.path.join(DIRECTORIO_CACHE, f'lexer_nativo-{firma}{sufijo}')
+    if os.path.exists(destino):
+        return destino
+
+    os.makedirs(DIRECTORIO_CACHE, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=DIRECTORIO_CACHE) as temporal:
+        fuente_c = os.path.join(temporal, 'lexer_nativo.c')
+        biblioteca = os.path.join(temporal, os.path.basename(destino))
+        try:
+            subprocess.run([flex, '-o', fuente_c, ESPECIFICACION], check=True, capture_output=True)
+            subprocess.run(cc + ['-O2', '-shared', '-fPIC', '-o', biblioteca, fuente_c],
+                           check=True, capture_output=True)
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        # Otro proceso pudo construirla al mismo tiempo; el reemplazo es atómico
+        os.replace(biblioteca, destino)
+    return destino
+
+
+def cargar():
+    """Devuelve la biblioteca nativa cargada, construyéndola si hace falta, o None"""
+    global _biblioteca, _reglas
+    if _biblioteca is None:
+        _biblioteca = False
+        ruta = compilar_biblioteca()
+        if ruta is not None:
+            biblioteca = ctypes.CDLL(ruta)
+            biblioteca.mini_tokenizar.restype = ctypes.POINTER(_Resultado)
+            biblioteca.mini_tokenizar.argtypes = (ctypes.c_char_p, ctypes.c_long, ctypes.c_long)
+            biblioteca.mini_liberar.argtypes = (ctypes.POINTER(_Resultado),)
+            biblioteca.mini_reglas.restype = ctypes.c_char_p
+            # El código 0 es el fin de la entrada; las reglas empiezan en 1
+            reglas = [None] + biblioteca.mini_reglas().decode().split()
+            if all(regla in ID_TIPO for regla in reglas[1:]):
+                _biblioteca, _reglas = biblioteca, reglas
+    return _biblioteca or None
+
+
+def disponible():
+    return cargar() is not None
+
+
+def _copiar(tipo, puntero, cantidad):
+    """Copia 'cantidad' elementos de un arreglo de C a un array de Python"""
+    arreglo = array(tipo)
+    if cantidad:
+        arreglo.frombytes(ctypes.string_at(puntero, cantidad * arreglo.itemsize))
+    return arreglo
+
+
+def tokenizar_nativo(texto, lineno=1, nombres=None):
+    """
+    Analiza léxicamente el texto con el escáner nativo.
+
+    Produce el mismo FlujoTokens (y los mismos mensajes de error) que
+    flujo_tokens.tokenizar(), al que recurre si el escáner no está
+    disponible o el texto no es ASCII.
+    """
+    biblioteca = cargar()
+    if biblioteca is None or not texto.isascii():
+        return tokenizar(texto, lineno, nombres)
+
+    datos = texto.encode('ascii')
+    puntero = biblioteca.mini_tokenizar(datos, len(datos), lineno)
+    if not puntero:
+        raise MemoryError("El analizador léxico nativo no pudo reservar memoria")
+    try:
+        resultado = puntero.contents
+        flujo = FlujoTokens(nombres)
+        indice = flujo.indice_lexemas
+
+        # Cada lexema distinto se convierte una sola vez
+        tipos_locales = []
+        valores_locales = []
+        for posicion, largo, regla in zip(_copiar('I', resultado.lexema_posicion, resultado.lexemas),
+                                          _copiar('I', resultado.lexema_largo, resultado.lexemas),
+                                          _copiar('B', resultado.lexema_regla, resultado.lexemas)):
+            lexema = texto[posicion:posicion + largo]
+            tipo, valor = indice.get(lexema) or flujo.registrar(lexema, _reglas[regla])
+            tipos_locales.append(tipo)
+            valores_locales.append(valor)
+
+        for posicion, linea in zip(_copiar('I', resultado.ilegal_posicion, resultado.ilegales),
+                                   _copiar('I', resultado.ilegal_linea, resultado.ilegales)):
+            print(f"Error léxico en línea {linea}: Carácter ilegal '{texto[posicion]}'")
+
+        ids = _copiar('I', resultado.ids, resultado.cantidad)
+        flujo.tipos = array('B', map(tipos_locales.__getitem__, ids))
+        flujo.valores = array('I', map(valores_locales.__getitem__, ids))
+        flujo.posiciones = _copiar('I', resultado.posiciones, resultado.cantidad)
+        flujo.lineas = _copiar('I', resultado.lineas, resultado.cantidad)
+    finally:
+        biblioteca.mini_liberar(puntero)
+    return flujo
+
+
+class LexerNativo:
+    """
+    Interfaz del lexer de PLY (input, token) sobre tokenizar_nativo.
+
+    input() analiza todo el texto en bloque; token() entrega los tokens
+    ya analizados, así que puede pasarse a parser.parse(lexer=...).
+    """
+    def __init__(self, nombres=None):
+        self.nombres = nombres if nombres is not None else TablaNombres()
+        self.lineno = 1
+        self.lexpos = 0
+        self._vista = None
+
+    def input(self, data):
+        self._vista = tokenizar_nativo(data, self.lineno, self.nombres).vista()
+
+    def token(self):
+        if self._vista is None:
+            return None
+        tok = self._vista.token()
+        if tok is not None:
+            self.lineno = tok.lineno
+            self.lexpos = tok.lexpos
+        return tok
+
+    def clone(self):
+        return LexerNativo(self.nombres)
+
+
+def verificar_equivalencia(texto):
+    """
+    Compara token por token el escáner nativo con el lexer de PLY.
+
+    Returns:
+        list: Diferencias encontradas (vacía si ambos coinciden), incluidos
+        los mensajes de error léxico
+    """
+    import contextlib
+    import io
+    from lexer import crear_lexer
+
+    salida_ply = io.StringIO()
+    with contextlib.redirect_stdout(salida_ply):
+        analizador = crear_lexer('ply')
+        analizador.lineno = 1
+        analizador.input(texto)
+        esperados = [(tok.type, tok.value, tok.lineno, tok.lexpos) for tok in iter(analizador.token, None)]
+    salida_nativa = io.StringIO()
+    with contextlib.redirect_stdout(salida_nativa):
+        obtenidos = list(tokenizar_nativo(texto))
+
+    diferencias = [f"token {i}: PLY {esperado} / nativo {obtenido}"
+                   for i, (esperado, obtenido) in enumerate(zip(esperados, obtenidos))
+                   if esperado != obtenido or type(esperado[1]) is not type(obtenido[1])]
+    if len(esperados) != len(obtenidos):
+        diferencias.append(f"cantidad de tokens: PLY {len(esperados)} / nativo {len(obtenidos)}")
+    if salida_ply.getvalue() != salida_nativa.getvalue():
+        diferencias.append("los mensajes de error léxico no coinciden")
+    return diferencias
+
+
+if __name__ == "__main__":
+    import glob
+    import random
+    from benchmarks import generar_programa
+
+    if not disponible():
+        print("Escáner nativo no disponible (se necesitan flex y un compilador de C); se usa el de Python")
+
+    casos = {"programa generado": generar_programa(2000)}
+    for ruta in sorted(glob.glob(os.path.join(DIRECTORIO, '*.txt'))):
+        with open(ruta, encoding='utf-8', errors='replace') as archivo:
+            casos[os.path.basename(ruta)] = archivo.read()
+    # Texto aleatorio con el alfabeto del lenguaje y caracteres ilegales
+    alfabeto = "abz_XY09 \t\n\n+-*/=<>!(){};.'&|#\r" + "entero si sino 3.14 'a' "
+    aleatorio = random.Random(0)
+    for i in range(200):
+        casos[f"aleatorio {i}"] = ''.join(aleatorio.choice(alfabeto) for _ in range(aleatorio.randint(0, 400)))
+
+    fallidos = 0
+    for nombre, texto in casos.items():
+        diferencias = verificar_equivalencia(texto)
+        if diferencias:
+            fallidos += 1
+            print(f"{nombre}: {len(diferencias)} diferencias")
+            for diferencia in diferencias[:5]:
+                print(f"  {diferencia}")
+    print(f"{len(casos) - fallidos}/{len(casos)} casos idénticos al lexer de PLY")
@@ -0,0 +1,122 @@
+"""
+Análisis léxico en paralelo sobre un conjunto de procesos.
+
+El lenguaje no tiene comentarios ni cadenas de varias líneas, así que el
+texto puede dividirse en fragmentos en cualquier salto de línea. Cada
+fragmento se tokeniza en un proceso distinto con su línea y posición
+iniciales, y los resultados se unen en un único FlujoTokens idéntico al
+que produce flujo_tokens.tokenizar().
+"""
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from flujo_tokens import FlujoTokens, ID_IDENTIFICADOR, tokenizar
+
+# Por debajo de este tamaño el costo de repartir el trabajo supera la ganancia
+FRAGMENTO_MINIMO = 1 << 20
+
+
+def dividir(texto, partes):
+    """Devuelve los límites [(inicio, fin), ...] de hasta 'partes' fragmentos cortados en saltos de línea"""
+    limites = []
+    inicio = 0
+    largo = len(texto)
+    for i in range(1, partes):
+        corte = texto.find('\n', max(inicio, largo * i // partes))
+        if corte == -1:
+            break
+        limites.append((inicio, corte + 1))
+        inicio = corte + 1
+    limites.append((inicio, largo))
+    return limites
+
+
+def _tokenizar_fragmento(fragmento, posicion, linea):
+    """
+    Tokeniza un fragmento en un proceso trabajador.
+
+    Devuelve los arreglos con posiciones y líneas ya absolutas. Los valores
+    se numeran en un espacio local combinado: primero la tabla de valores
+    y a continuación la de nombres, para que el proceso principal pueda
+    traducirlos con una sola tabla de correspondencia.
+    """
+    flujo = FlujoTokens()
+    flujo.extender(fragmento, lineno=linea)
+    cantidad_valores = len(flujo.tabla_valores)
+    valores = array('I', [valor + cantidad_valores if tipo == ID_IDENTIFICADOR else valor
+                          for tipo, valor in zip(flujo.tipos, flujo.valores)])
+    posiciones = array('I', [p + posicion for p in flujo.posiciones])
+    # Lexema y tipo de cada valor local, en el orden de la tabla de valores
+    entradas = [None] * cantidad_valores
+    for lexema, (tipo, indice) in flujo.indice_lexemas.items():
+        if tipo != ID_IDENTIFICADOR:
+            entradas[indice] = (lexema, tipo)
+    return flujo.tipos, posiciones, flujo.lineas, valores, entradas, flujo.tabla_valores, flujo.nombres.nombres
+
+
+def tokenizar_paralelo(texto, procesos=None, nombres=None, ejecutor=None):
+    """
+    Tokeniza el texto repartiéndolo entre varios procesos.
+
+    Args:
+        texto (str): Código fuente
+        procesos (int): Cantidad de fragmentos y procesos (por defecto, los núcleos disponibles)
+        nombres: Tabla de nombres donde internar los identificadores
+        ejecutor: ProcessPoolExecutor ya creado, para reutilizarlo entre llamadas
+
+    Returns:
+        FlujoTokens: El mismo flujo que produciría tokenizar(texto)
+    """
+    procesos = procesos or os.cpu_count() or 1
+    partes = min(procesos, max(1, len(texto) // FRAGMENTO_MINIMO))
+    if partes == 1:
+        return tokenizar(texto, nombres=nombres)
+
+    limites = dividir(texto, partes)
+    propio = ejecutor is None
+    if propio:
+        ejecutor = ProcessPoolExecutor(max_workers=procesos)
+    try:
+        futuros = []
+        linea = 1
+        for inicio, fin in limites:
+            futuros.append(ejecutor.submit(_tokenizar_fragmento, texto[inicio:fin], inicio, linea))
+            linea += texto.count('\n', inicio, fin)
+
+        flujo = FlujoTokens(nombres)
+        indice = flujo.indice_lexemas
+        tabla = flujo.tabla_valores
+        internar = flujo.nombres.internar
+        for futuro in futuros:
+            tipos, posiciones, lineas, valores, entradas, tabla_local, nombres_locales = futuro.result()
+            # Traducción del espacio local combinado al del flujo completo
+            traduccion = []
+            for (lexema, tipo), valor in zip(entradas, tabla_local):
+                entrada = indice.get(lexema)
+                if entrada is None:
+                    entrada = indice[lexema] = (tipo, len(tabla))
+                    tabla.append(valor)
+                traduccion.append(entrada[1])
+            for nombre in nombres_locales:
+                id_nombre = internar(nombre)
+                indice.setdefault(nombre, (ID_IDENTIFICADOR, id_nombre))
+                traduccion.append(id_nombre)
+            flujo.tipos.extend(tipos)
+            flujo.posiciones.extend(posiciones)
+            flujo.lineas.extend(lineas)
+            flujo.valores.extend(array('I', map(traduccion.__getitem__, valores)))
+        return flujo
+    finally:
+        if propio:
+            ejecutor.shutdown()
+
+
+if __name__ == "__main__":
+    from benchmarks import generar_fuente
+
+    fuente = generar_fuente(3)
+    secuencial = tokenizar(fuente)
+    paralelo = tokenizar_paralelo(fuente, procesos=4)
+    print(f"{len(paralelo)} tokens; igual al análisis secuencial:",
+          list(paralelo) == list(secuencial))
@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AND', 'ASIG', 'CARACTER', 'DECIMAL', 'DIFERENTE', 'DIV', 'EOC', 'FALSE', 'IDENTIFICADOR', 'IGUAL', 'LLAVEDER', 'LLAVEIZQ', 'MAYOR', 'MAYORIGUAL', 'MENOR', 'MENORIGUAL', 'MIENTRAS', 'MULT', 'NOT', 'NUMERO', 'OR', 'PARA', 'PARDER', 'PARIZQ', 'PRINT', 'PUNTOCOMA', 'RESTA', 'SI', 'SINO', 'SUMA', 'TIPO_BOOLEANO', 'TIPO_CARACTER', 'TIPO_DECIMAL', 'TIPO_ENTERO', 'TRUE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [("(?P<t_DECIMAL>\\d+\\.\\d+)|(?P<t_NUMERO>\\d+)|(?P<t_CARACTER>\\'[a-zA-Z]\\')|(?P<t_IDENTIFICADOR>[a-zA-Z_][a-zA-Z0-9_]*)|(?P<t_newline>\\n+)|(?P<t_DIFERENTE>!=)|(?P<t_IGUAL>==)|(?P<t_LLAVEDER>\\})|(?P<t_LLAVEIZQ>\\{)|(?P<t_MAYORIGUAL>>=)|(?P<t_MENORIGUAL><=)|(?P<t_MULT>\\*)|(?P<t_PARDER>\\))|(?P<t_PARIZQ>\\()|(?P<t_SUMA>\\+)|(?P<t_ASIG>=)|(?P<t_DIV>/)|(?P<t_MAYOR>>)|(?P<t_MENOR><)|(?P<t_PUNTOCOMA>;)|(?P<t_RESTA>-)", [None, ('t_DECIMAL', 'DECIMAL'), ('t_NUMERO', 'NUMERO'), ('t_CARACTER', 'CARACTER'), ('t_IDENTIFICADOR', 'IDENTIFICADOR'), ('t_newline', 'newline'), (None, 'DIFERENTE'), (None, 'IGUAL'), (None, 'LLAVEDER'), (None, 'LLAVEIZQ'), (None, 'MAYORIGUAL'), (None, 'MENORIGUAL'), (None, 'MULT'), (None, 'PARDER'), (None, 'PARIZQ'), (None, 'SUMA'), (None, 'ASIG'), (None, 'DIV'), (None, 'MAYOR'), (None, 'MENOR'), (None, 'PUNTOCOMA'), (None, 'RESTA')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
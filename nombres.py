@@ -0,0 +1,45 @@
+"""
+Tabla de nombres por compilación.
+
+El analizador léxico interna cada identificador en una TablaNombres, que le
+asigna un id entero denso (0, 1, 2, ...) y conserva una única copia canónica
+del texto. Todas las fases comparten esa tabla, por lo que cada nombre se
+guarda una sola vez y las tablas de símbolos pueden indexarse por id.
+"""
+
+
+class TablaNombres:
+    """Asigna ids enteros densos a los identificadores de una compilación"""
+    __slots__ = ('ids', 'nombres')
+
+    def __init__(self):
+        self.ids = {}
+        self.nombres = []
+
+    def internar(self, nombre):
+        """Devuelve el id del nombre, registrándolo si es la primera vez que aparece"""
+        id_nombre = self.ids.get(nombre)
+        if id_nombre is None:
+            id_nombre = self.ids[nombre] = len(self.nombres)
+            self.nombres.append(nombre)
+        return id_nombre
+
+    def canonico(self, nombre):
+        """Devuelve la copia canónica (compartida) del nombre"""
+        return self.nombres[self.internar(nombre)]
+
+    def buscar(self, nombre):
+        """Devuelve el id del nombre o None si nunca fue internado"""
+        return self.ids.get(nombre)
+
+    def nombre(self, id_nombre):
+        return self.nombres[id_nombre]
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def __contains__(self, nombre):
+        return nombre in self.ids
+
+    def __iter__(self):
+        return iter(self.nombres)
@@ -1,23 +1,18 @@
-import ply.yacc as yacc
-from lexer import tokens
+import copy
+import threading
+from contextlib import contextmanager
 
-class TablaSimbolos:
-  def __init__(self):
-      self.simbolos = {}
-      
-  def agregar(self, nombre, tipo, valor=None):
-      if nombre in self.simbolos:
-          raise Exception(f"Error semántico: La variable '{nombre}' ya ha sido declarada")
-      self.simbolos[nombre] = {'tipo': tipo, 'valor': valor}
-      
-  def obtener(self, nombre):
-      if nombre not in self.simbolos:
-          raise Exception(f"Error semántico: La variable '{nombre}' no ha sido declarada")
-      return self.simbolos[nombre]
-  
-  def limpiar(self):
-      self.simbolos.clear()
+import ply.yacc as yacc
+from lexer import tokens, lexer, LexerTabla
+from nombres import TablaNombres
+from configuracion import ARRANQUE_RAPIDO
+from diagnosticos import Diagnosticos, DemasiadosErrores, MAXIMO_ERRORES
+from expresiones_compartidas import TablaExpresiones
+from simbolos import TablaSimbolos
+from tipos import Caracter
 
+# Tabla del parser del módulo; cada ParserSession tiene la suya. Las acciones
+# de la gramática usan la tabla del parser que las ejecuta (p.parser.tabla)
 tabla_simbolos = TablaSimbolos()
 
 # Reglas de precedencia
@@ -27,19 +22,23 @@ precedence = (
 )
 
 def p_programa(p):
-  '''programa : declaraciones'''
+  '''programa : sentencias'''
   p[0] = p[1]
 
+# sentencias es la lista del nivel superior y declaraciones la de un bloque:
+# se separan para que cada una tenga su propia recuperación de errores
 def p_declaraciones(p):
   '''declaraciones : declaraciones declaracion
-                  | declaracion'''
+                  | declaracion
+     sentencias : sentencias declaracion
+               | declaracion'''
   if len(p) == 3:
       if not isinstance(p[1], list):
           p[1] = [p[1]]
       if p[2] is not None:  # Solo agregar si no es None
-          p[0] = p[1] + [p[2]]
-      else:
-          p[0] = p[1]
+          # Se agrega sobre la misma lista: copiarla en cada reducción haría el análisis cuadrático
+          p[1].append(p[2])
+      p[0] = p[1]
   else:
       if p[1] is not None:  # Solo crear lista si no es None
           p[0] = [p[1]]
@@ -55,7 +54,7 @@ def p_declaracion(p):
 
 def p_declaracion_variable(p):
   '''declaracion_variable : tipo IDENTIFICADOR ASIG expresion PUNTOCOMA'''
-  tabla_simbolos.agregar(p[2], p[1], p[4])
+  p.parser.tabla.agregar(p[2], p[1], p[4], p.lineno(2))
   p[0] = ('declaracion', p[1], p[2], p[4])
 
 def p_tipo(p):
@@ -67,8 +66,7 @@ def p_tipo(p):
 
 def p_asignacion(p):
   '''asignacion : IDENTIFICADOR ASIG expresion PUNTOCOMA'''
-  if tabla_simbolos.obtener(p[1]) is None:
-      raise Exception(f"Error semántico: Variable '{p[1]}' no declarada")
+  p.parser.tabla.obtener(p[1], p.lineno(1))
   p[0] = ('asignacion', p[1], p[3])
 
 def p_estructura_control(p):
@@ -82,10 +80,10 @@ def p_estructura_control(p):
 # Es que copilot le sabe
 
 def p_estructura_si(p):
-  '''estructura_si : SI PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER
-                  | SI PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER SINO PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER
-                  | SI PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER SINO PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER EOC LLAVEIZQ declaraciones LLAVEDER
-                  | SI PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER EOC LLAVEIZQ declaraciones LLAVEDER'''
+  '''estructura_si : SI PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque
+                  | SI PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque SINO PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque
+                  | SI PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque SINO PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque EOC abrir_bloque bloque cerrar_bloque
+                  | SI PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque EOC abrir_bloque bloque cerrar_bloque'''
   if len(p) == 8:  # si simple
       p[0] = ('si', p[3], p[6])
   elif len(p) == 15:  # si-sino
@@ -108,18 +106,33 @@ def p_estructura_si(p):
 
 
 def p_estructura_mientras(p):
-  '''estructura_mientras : MIENTRAS PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER'''
+  '''estructura_mientras : MIENTRAS PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque'''
   p[0] = ('mientras', p[3], p[6])
 
 def p_estructura_para(p):
-  '''estructura_para : PARA PARIZQ inicializacion_para PUNTOCOMA condicion PUNTOCOMA incremento_para PARDER LLAVEIZQ declaraciones LLAVEDER'''
+  '''estructura_para : inicio_para PARIZQ inicializacion_para PUNTOCOMA condicion PUNTOCOMA incremento_para PARDER abrir_bloque bloque cerrar_bloque'''
+  p.parser.tabla.cerrar_ambito()
   p[0] = ('para', p[3], p[5], p[7], p[10])
 
+def p_inicio_para(p):
+  '''inicio_para : PARA'''
+  # La variable de la inicialización vive en un ámbito del para, que se
+  # cierra al reducir estructura_para
+  p.parser.tabla.abrir_ambito()
+
+def p_abrir_bloque(p):
+  '''abrir_bloque : LLAVEIZQ'''
+  p.parser.tabla.abrir_ambito()
+
+def p_cerrar_bloque(p):
+  '''cerrar_bloque : LLAVEDER'''
+  p.parser.tabla.cerrar_ambito()
+
 def p_inicializacion_para(p):
   '''inicializacion_para : tipo IDENTIFICADOR ASIG expresion
                        | IDENTIFICADOR ASIG expresion'''
   if len(p) == 5:
-      tabla_simbolos.agregar(p[2], p[1], p[4])
+      p.parser.tabla.agregar(p[2], p[1], p[4], p.lineno(2))
       p[0] = ('declaracion', p[1], p[2], p[4])
   else:
       p[0] = ('asignacion', p[1], p[3])
@@ -129,10 +142,15 @@ def p_incremento_para(p):
                     | IDENTIFICADOR ASIG IDENTIFICADOR RESTA NUMERO
                     | IDENTIFICADOR SUMA SUMA
                     | IDENTIFICADOR RESTA RESTA'''
+  expresiones = p.parser.expresiones
   if len(p) == 6:
-      p[0] = ('asignacion', p[1], ('operacion', p[4], p[3], p[5]))
+      operacion = (p[4], p[3], p[5])
   else:
-      p[0] = ('asignacion', p[1], ('operacion', '+', p[1], 1))
+      operacion = (p[2], p[1], 1)
+  if expresiones is None:
+      p[0] = ('asignacion', p[1], ('operacion',) + operacion)
+  else:
+      p[0] = ('asignacion', p[1], expresiones.nodo('operacion', *operacion))
 
 def p_condicion(p):
   '''condicion : expresion IGUAL expresion
@@ -141,7 +159,11 @@ def p_condicion(p):
               | expresion MAYOR expresion
               | expresion MENORIGUAL expresion
               | expresion MAYORIGUAL expresion'''
-  p[0] = ('condicion', p[2], p[1], p[3])
+  expresiones = p.parser.expresiones
+  if expresiones is None:
+      p[0] = ('condicion', p[2], p[1], p[3])
+  else:
+      p[0] = expresiones.nodo('condicion', p[2], p[1], p[3])
 
 def p_expresion(p):
   '''expresion : expresion SUMA termino
@@ -150,7 +172,12 @@ def p_expresion(p):
               | expresion DIV termino
               | termino'''
   if len(p) == 4:
-      p[0] = ('operacion', p[2], p[1], p[3])
+      # Con una TablaExpresiones las operaciones iguales comparten el mismo nodo
+      expresiones = p.parser.expresiones
+      if expresiones is None:
+          p[0] = ('operacion', p[2], p[1], p[3])
+      else:
+          p[0] = expresiones.nodo('operacion', p[2], p[1], p[3])
   else:
       p[0] = p[1]
 
@@ -158,7 +185,6 @@ def p_termino(p):
   '''termino : IDENTIFICADOR
              | NUMERO
              | DECIMAL
-             | CARACTER
              | TRUE
              | FALSE
              | PARIZQ expresion PARDER'''
@@ -167,18 +193,60 @@ def p_termino(p):
   else:
       p[0] = p[1]
 
+def p_termino_caracter(p):
+  '''termino : CARACTER'''
+  # Distingue el literal 'a' del identificador a (ver tipos.py)
+  p[0] = Caracter(p[1])
+
 def p_imprimir(p):
   '''imprimir : PRINT PARIZQ expresion PARDER PUNTOCOMA'''
   p[0] = ('imprimir', p[3])
 
-def p_error(p):
+def p_declaracion_error(p):
+  '''declaracion : error PUNTOCOMA'''
+  # Recuperación en modo pánico: tras un error de sintaxis se descartan los
+  # tokens hasta el fin de la sentencia y la sentencia se omite. errok()
+  # reporta el siguiente error aunque llegue antes de tres tokens válidos
+  p.parser.errok()
+  p[0] = None
+
+def p_sentencias_error(p):
+  '''sentencias : sentencias error LLAVEDER
+               | error LLAVEDER'''
+  # En el nivel superior una '}' termina la sentencia compuesta con el error
+  p.parser.errok()
+  p[0] = p[1] if len(p) == 4 else []
+
+def p_bloque(p):
+  '''bloque : declaraciones'''
+  p[0] = p[1]
+
+def p_bloque_error(p):
+  '''bloque : declaraciones error
+            | error'''
+  # Dentro de un bloque la '}' no se descarta: queda para cerrar_bloque, que
+  # cierra el ámbito, y el análisis sigue después del bloque
+  p.parser.errok()
+  p[0] = p[1] if len(p) == 3 else []
+
+def _error_de_sintaxis(tabla, p):
   if p:
-      raise Exception(f"Error de sintaxis en línea {p.lineno}: Token inesperado '{p.value}'")
+      tabla.reportar(f"Error de sintaxis en línea {p.lineno}: Token inesperado '{p.value}'")
   else:
-      raise Exception("Error de sintaxis: Final inesperado del archivo")
+      tabla.reportar("Error de sintaxis: Final inesperado del archivo")
+
+def p_error(p):
+  _error_de_sintaxis(tabla_simbolos, p)
 
 # Crear el parser
-parser = yacc.yacc()
+# En el modo de arranque rápido se usa parsetab.py tal cual: sin validar la
+# gramática ni escribir parser.out (ver configuracion.py)
+if ARRANQUE_RAPIDO:
+  parser = yacc.yacc(optimize=1, debug=False, write_tables=False)
+else:
+  parser = yacc.yacc()
+parser.tabla = tabla_simbolos
+parser.expresiones = None
 
 # Función para analizar código
 def analizar(codigo):
@@ -188,6 +256,191 @@ def analizar(codigo):
       print(f"Error durante el análisis: {str(e)}")
       return None
 
+def parse_con_diagnosticos(codigo=None, analizador_lexico=None, maximo=MAXIMO_ERRORES, analizador=None):
+  """
+  Analiza el programa sin detenerse en el primer error: los errores de
+  sintaxis y de declaración se acumulan y el AST omite las sentencias con
+  errores de sintaxis.
+  
+  Args:
+      codigo (str): Código fuente, o None si el analizador léxico ya tiene su entrada
+      analizador_lexico: Analizador léxico que alimenta al parser (por defecto el de PLY)
+      maximo (int): Cantidad de errores tras la cual se abandona el análisis
+      analizador: Parser a usar, con su tabla de símbolos en analizador.tabla
+          (por defecto el LALR del módulo; el descendente recolecta los errores
+          de declaración pero se detiene en su primer error de sintaxis)
+  
+  Returns:
+      tuple: (AST o None, Diagnosticos con los mensajes de error)
+  """
+  if analizador is None:
+      analizador = parser
+  if analizador_lexico is None:
+      analizador_lexico = lexer
+  if codigo is not None:
+      # Los lexers conservan el número de línea del análisis anterior
+      analizador_lexico.lineno = 1
+  tabla = analizador.tabla
+  errores = tabla.diagnosticos = Diagnosticos(maximo)
+  try:
+      try:
+          ast = analizador.parse(codigo, lexer=analizador_lexico)
+      except DemasiadosErrores:
+          raise
+      except Exception as e:
+          ast = None
+          errores.append(str(e))
+  except DemasiadosErrores:
+      ast = None
+  finally:
+      tabla.diagnosticos = None
+  return ast, errores
+
+class _TokensSentencia:
+  """Entrega al parser los tokens de una sola sentencia, como lo haría un lexer"""
+  def __init__(self, tokens_sentencia):
+      self.siguiente = iter(tokens_sentencia).__next__
+
+  def token(self):
+      try:
+          return self.siguiente()
+      except StopIteration:
+          return None
+
+def dividir_sentencias(analizador_lexico):
+  """
+  Agrupa los tokens del analizador léxico en sentencias de nivel superior.
+  Una sentencia termina en un ';' o una '}' fuera de paréntesis y llaves,
+  salvo que la '}' vaya seguida de 'sino' o 'eoc'.
+  """
+  sentencia = []
+  profundidad = 0
+  tok = analizador_lexico.token()
+  while tok is not None:
+      sentencia.append(tok)
+      siguiente = analizador_lexico.token()
+      if tok.type in ('PARIZQ', 'LLAVEIZQ'):
+          profundidad += 1
+      elif tok.type in ('PARDER', 'LLAVEDER'):
+          profundidad -= 1
+      if profundidad == 0 and (tok.type == 'PUNTOCOMA' or (
+              tok.type == 'LLAVEDER' and (siguiente is None or siguiente.type not in ('SINO', 'EOC')))):
+          yield sentencia
+          sentencia = []
+      tok = siguiente
+  if sentencia:
+      yield sentencia
+
+def parse_iter(codigo, analizador_lexico=None):
+  """
+  Analiza el programa sentencia por sentencia y entrega cada sentencia de
+  nivel superior apenas se reduce, sin esperar al resto del archivo.
+  Produce los mismos nodos, en el mismo orden, que parser.parse().
+  
+  Args:
+      codigo (str): Código fuente, o None si el analizador léxico ya tiene su entrada
+      analizador_lexico: Analizador léxico que alimenta al parser (por defecto el de PLY)
+  """
+  if analizador_lexico is None:
+      analizador_lexico = lexer
+  if codigo is not None:
+      analizador_lexico.input(codigo)
+  for sentencia in dividir_sentencias(analizador_lexico):
+      # Cada sentencia es un programa de una sola declaración
+      yield from parser.parse(lexer=_TokensSentencia(sentencia)) or ()
+
+class ParserSession:
+  """
+  Parser LALR con estado propio: tabla de símbolos, analizador léxico y pila
+  de análisis. Comparte con el parser del módulo las producciones y las
+  tablas LALR, que son de solo lectura, así que crear una sesión no vuelve a
+  ejecutar yacc.yacc(). Cada análisis empieza con la tabla de símbolos vacía.
+  
+  Una sesión analiza un programa a la vez; sesiones distintas pueden
+  analizar en paralelo desde varios hilos (ver PoolSesiones).
+  
+  Args:
+      nombres: Tabla de nombres del lexer y de la tabla de símbolos de la sesión
+      compartir_expresiones (bool): Construir las expresiones iguales (con los
+          mismos símbolos) como un solo nodo; la TablaExpresiones del último análisis queda en
+          self.expresiones (ver expresiones_compartidas.py)
+      tabla_simbolos: Tabla de símbolos a usar en lugar de una propia (la
+          tabla única de una compilación, ver simbolos.py)
+  """
+  def __init__(self, nombres=None, compartir_expresiones=False, tabla_simbolos=None):
+      self.nombres = nombres if nombres is not None else TablaNombres()
+      self.compartir_expresiones = compartir_expresiones
+      self.expresiones = None
+      self.tabla = tabla_simbolos if tabla_simbolos is not None else TablaSimbolos(self.nombres)
+      self.lexer = LexerTabla(self.nombres)
+      # Copia superficial: las tablas se comparten, pero la pila y el estado
+      # del análisis se guardan en esta instancia
+      self.parser = copy.copy(parser)
+      self.parser.tabla = self.tabla
+      self.parser.errorfunc = self._error
+      
+  def _error(self, p):
+      _error_de_sintaxis(self.tabla, p)
+      
+  def _preparar(self):
+      """Deja la sesión lista para un análisis nuevo"""
+      self.tabla.limpiar()
+      self.expresiones = TablaExpresiones(self.tabla) if self.compartir_expresiones else None
+      self.parser.expresiones = self.expresiones
+      
+  def parse(self, codigo=None, lexer=None):
+      """
+      Analiza un programa y devuelve su AST.
+      
+      Args:
+          codigo (str): Código fuente, o None si el lexer ya tiene su entrada
+          lexer: Analizador léxico (por defecto el de la sesión)
+      """
+      self._preparar()
+      if lexer is None:
+          lexer = self.lexer
+          lexer.lineno = 1
+      return self.parser.parse(codigo, lexer=lexer)
+      
+  def parse_con_diagnosticos(self, codigo=None, lexer=None, maximo=MAXIMO_ERRORES):
+      """Como parse_con_diagnosticos(), con la tabla y el lexer de la sesión"""
+      self._preparar()
+      return parse_con_diagnosticos(codigo, lexer if lexer is not None else self.lexer, maximo, self.parser)
+
+class PoolSesiones:
+  """
+  Sesiones de análisis ya creadas, para reutilizarlas entre compilaciones.
+  
+  sesion() presta una sesión libre, o crea una nueva si todas están en uso,
+  y la devuelve al pool al terminar. Puede usarse desde varios hilos.
+  
+  Args:
+      tamano (int): Cantidad de sesiones creadas de antemano
+  """
+  def __init__(self, tamano=4):
+      self._libres = [ParserSession() for _ in range(tamano)]
+      self._candado = threading.Lock()
+      
+  @contextmanager
+  def sesion(self):
+      with self._candado:
+          sesion = self._libres.pop() if self._libres else None
+      if sesion is None:
+          sesion = ParserSession()
+      try:
+          yield sesion
+      finally:
+          with self._candado:
+              self._libres.append(sesion)
+              
+  def parse(self, codigo):
+      with self.sesion() as sesion:
+          return sesion.parse(codigo)
+          
+  def parse_con_diagnosticos(self, codigo, maximo=MAXIMO_ERRORES):
+      with self.sesion() as sesion:
+          return sesion.parse_con_diagnosticos(codigo, maximo=maximo)
+
 if __name__ == "__main__":
   #aqui por ejemplo ya esta implementado el while.
   #antes no funcionaba el while, ni el if
@@ -218,4 +471,53 @@ if __name__ == "__main__":
   resultado = analizar(codigo_prueba)
   if resultado:
       print("\nAST generado:")
-      print(resultado)
\ No newline at end of file
+      print(resultado)
+
+  # Las sentencias llegan una a una; las fases siguientes pueden empezar antes del final
+  tabla_simbolos.limpiar()
+  print("\nSentencias entregadas por parse_iter:")
+  for sentencia in parse_iter(codigo_prueba):
+      print(sentencia)
+
+  # Con diagnósticos, un solo análisis reporta todos los errores del archivo
+  tabla_simbolos.limpiar()
+  ast, errores = parse_con_diagnosticos("""
+  entero x = 5;
+  entero x = 2;
+  y = x + ;
+  mientras (x > 0) { x = x - 1 print(x); }
+  z = 3;
+  print(x);
+  """)
+  print("\nErrores encontrados:")
+  for error in errores:
+      print(f"- {error}")
+  print("Sentencias válidas:", ast)
+  tabla_simbolos.limpiar()
+
+  # Cada sentencia errónea se reporta, aunque vengan una tras otra
+  sesion = ParserSession()
+  for sentencia in ("print x;\n", "entero = 1;\n"):
+      _, errores = sesion.parse_con_diagnosticos(sentencia * 10)
+      print(f"{sentencia.strip()!r} x 10: {len(errores)} errores")
+
+  # Un error antes de la '}' se recupera dentro del bloque, que se cierra igual
+  ast, errores = sesion.parse_con_diagnosticos("""
+  entero x = 2;
+  si (x > 1) { entero t = 3 }
+  x = 4;
+  print(x);
+  """)
+  print("Errores:", list(errores))
+  print("Sentencias válidas:", ast)
+  print("Ámbitos abiertos al terminar:", sesion.tabla.profundidad())
+
+  # Varias compilaciones en paralelo, cada una con la tabla de su sesión
+  from concurrent.futures import ThreadPoolExecutor
+  programas = [f"entero x = {i};\nmientras (x > 0) {{ x = x - 1; print(x); }}\n" for i in range(200)]
+  pool = PoolSesiones()
+  with ThreadPoolExecutor(max_workers=4) as hilos:
+      resultados = list(hilos.map(pool.parse, programas))
+  esperados = [ParserSession().parse(programa) for programa in programas]
+  print(f"\n{sum(r == e for r, e in zip(resultados, esperados))}/{len(programas)} "
+        f"programas con el mismo AST analizados en paralelo")
\ No newline at end of file
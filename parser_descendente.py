@@ -0,0 +1,426 @@
+"""
+Analizador sintáctico descendente recursivo.
+
+Es un segundo motor para la gramática de parser.py. Produce los mismos nodos
+del AST, los mismos errores y las mismas llamadas a la tabla de símbolos que
+el parser LALR de PLY. Cada construcción se reconoce con una función que lee
+los tokens directamente, sin recorrer la tabla de acciones ni reducir las
+reglas de paso (declaracion, estructura_control, tipo).
+
+Las expresiones se analizan al estilo Pratt con una tabla de potencias de
+enlace. La gramática de parser.py da la misma precedencia a los cuatro
+operadores (a + b * 2 se agrupa como (a + b) * 2), y la tabla lo reproduce
+para que ambos motores generen el mismo árbol.
+"""
+from flujo_tokens import VistaTokens, ID_IDENTIFICADOR
+from lexer import lexer as lexer_ply, tokens
+from parser import tabla_simbolos
+from expresiones_compartidas import TablaExpresiones
+from tipos import Caracter
+
+TIPOS = frozenset(('TIPO_ENTERO', 'TIPO_DECIMAL', 'TIPO_CARACTER', 'TIPO_BOOLEANO'))
+TERMINOS = frozenset(('IDENTIFICADOR', 'NUMERO', 'DECIMAL', 'CARACTER', 'TRUE', 'FALSE'))
+RELACIONALES = frozenset(('IGUAL', 'DIFERENTE', 'MENOR', 'MAYOR', 'MENORIGUAL', 'MAYORIGUAL'))
+# Tokens que pueden seguir a una sentencia (None es el final de la entrada)
+SIGUIENTES_SENTENCIA = TIPOS | {'IDENTIFICADOR', 'SI', 'MIENTRAS', 'PARA', 'PRINT', 'LLAVEDER', None}
+
+# Potencia de enlace de cada operador binario (todos asociativos por la izquierda)
+POTENCIA = {'SUMA': 10, 'RESTA': 10, 'MULT': 10, 'DIV': 10}
+
+
+class ParserDescendente:
+    """
+    Parser con la misma interfaz que el de PLY: parse(input, lexer).
+
+    Args:
+        tabla: Tabla de símbolos donde se registran las declaraciones
+            (por defecto, la tabla global de parser.py que usa el parser LALR)
+        compartir_expresiones: Construir las expresiones iguales (con los mismos
+            símbolos) como un solo nodo; la TablaExpresiones del último análisis queda en
+            self.expresiones (ver expresiones_compartidas.py)
+    """
+    def __init__(self, tabla=None, compartir_expresiones=False):
+        self.tabla = tabla if tabla is not None else tabla_simbolos
+        self.compartir_expresiones = compartir_expresiones
+        self.expresiones = None
+        # Función que analiza la sentencia que empieza con cada tipo de token
+        self.sentencias = {tipo: self._declaracion_variable for tipo in TIPOS}
+        self.sentencias.update(
+            IDENTIFICADOR=self._asignacion,
+            SI=self._si,
+            MIENTRAS=self._mientras,
+            PARA=self._para,
+            PRINT=self._imprimir,
+        )
+        self.tipos = self.valores = self.lineas = ()
+        self.i = 0
+
+    def parse(self, input=None, lexer=None):
+        analizador = lexer if lexer is not None else lexer_ply
+        if input is not None:
+            analizador.input(input)
+        self._cargar(analizador)
+        self.i = 0
+        self.expresiones = TablaExpresiones(self.tabla) if self.compartir_expresiones else None
+        # Operaciones y condiciones se construyen con _nodo o a través de la tabla
+        self._nodo_expresion = self._nodo if self.expresiones is None else self._expresion_compartida
+        try:
+            return self._programa(self._declaraciones(None))
+        finally:
+            self.tipos = self.valores = self.lineas = ()
+
+    def _cargar(self, analizador):
+        """Lee todos los tokens; el último tipo es None y marca el final de la entrada"""
+        if isinstance(analizador, VistaTokens):
+            # Lectura directa de los arreglos del flujo, sin crear un LexToken por token
+            flujo = analizador.flujo
+            inicio, fin = analizador.actual, analizador.fin
+            tabla, nombres = flujo.tabla_valores, flujo.nombres.nombres
+            ids_tipo = flujo.tipos[inicio:fin]
+            self.tipos = [tokens[tipo] for tipo in ids_tipo]
+            self.valores = [nombres[valor] if tipo == ID_IDENTIFICADOR else tabla[valor]
+                            for tipo, valor in zip(ids_tipo, flujo.valores[inicio:fin])]
+            self.lineas = flujo.lineas[inicio:fin]
+            analizador.actual = fin
+        else:
+            leidos = list(iter(analizador.token, None))
+            self.tipos = [tok.type for tok in leidos]
+            self.valores = [tok.value for tok in leidos]
+            self.lineas = [tok.lineno for tok in leidos]
+        self.tipos.append(None)
+
+    def _error(self):
+        """Mismo mensaje que p_error para el token actual"""
+        i = self.i
+        if self.tipos[i] is None:
+            raise Exception("Error de sintaxis: Final inesperado del archivo")
+        raise Exception(f"Error de sintaxis en línea {self.lineas[i]}: Token inesperado '{self.valores[i]}'")
+
+    def _esperar(self, tipo):
+        """Consume un token del tipo indicado y devuelve su valor"""
+        i = self.i
+        if self.tipos[i] != tipo:
+            self._error()
+        self.i = i + 1
+        return self.valores[i]
+
+    def _fin_sentencia(self):
+        """
+        Consume el ';' final. El parser LALR reduce la sentencia (y ejecuta su
+        acción sobre la tabla de símbolos) solo si el token siguiente puede
+        seguirla; si no, informa antes el error de sintaxis.
+        """
+        self._esperar('PUNTOCOMA')
+        if self.tipos[self.i] not in SIGUIENTES_SENTENCIA:
+            self._error()
+
+    def _consumir(self, tipo):
+        """Consume un token del tipo indicado y devuelve su índice"""
+        i = self.i
+        if self.tipos[i] != tipo:
+            self._error()
+        self.i = i + 1
+        return i
+
+    # Construcción de nodos. Cada nodo recibe el índice del token donde empieza
+    # y termina en el último token consumido; aquí se arman las tuplas del AST
+    # y arena_ast.ParserArena redefine estos métodos para construir la arena.
+
+    def _nodo(self, tipo, inicio, *campos):
+        return (tipo,) + campos
+
+    def _expresion_compartida(self, tipo, inicio, operador, izquierdo, derecho):
+        return self.expresiones.nodo(tipo, operador, izquierdo, derecho)
+
+    def _hoja(self, i):
+        """Valor del literal o identificador del token i"""
+        if self.tipos[i] == 'CARACTER':
+            return Caracter(self.valores[i])
+        return self.valores[i]
+
+    def _constante(self, valor, inicio):
+        """Literal que no aparece en el código (el 1 de i++ e i--)"""
+        return valor
+
+    def _bloque_nodos(self, nodos, inicio):
+        return nodos
+
+    def _programa(self, nodos):
+        return nodos
+
+    def _marca(self):
+        """Punto al que _descartar() puede volver"""
+        return None
+
+    def _descartar(self, marca):
+        """Descarta los nodos construidos desde la marca"""
+
+    def _declaraciones(self, cierre):
+        """Una o más sentencias hasta 'cierre' (LLAVEDER, o None para el final de la entrada)"""
+        tipos = self.tipos
+        sentencias = self.sentencias
+        resultado = []
+        while True:
+            analizar = sentencias.get(tipos[self.i])
+            if analizar is None:
+                self._error()
+            nodo = analizar()
+            if nodo is not None:
+                resultado.append(nodo)
+            if tipos[self.i] == cierre:
+                return resultado
+
+    def _bloque(self):
+        inicio = self._consumir('LLAVEIZQ')
+        self.tabla.abrir_ambito()
+        sentencias = self._declaraciones('LLAVEDER')
+        self.i += 1
+        self.tabla.cerrar_ambito()
+        return self._bloque_nodos(sentencias, inicio)
+
+    def _condicion_entre_parentesis(self):
+        self._esperar('PARIZQ')
+        condicion = self._condicion()
+        self._esperar('PARDER')
+        return condicion
+
+    def _declaracion_variable(self):
+        inicio = self.i
+        tipo = self.valores[inicio]
+        self.i += 1
+        i_nombre = self._consumir('IDENTIFICADOR')
+        self._esperar('ASIG')
+        valor = self._expresion()
+        self._fin_sentencia()
+        self.tabla.agregar(self.valores[i_nombre], tipo, valor, self.lineas[i_nombre])
+        return self._nodo('declaracion', inicio, tipo, self._hoja(i_nombre), valor)
+
+    def _asignacion(self):
+        inicio = self.i
+        nombre = self.valores[inicio]
+        self.i += 1
+        self._esperar('ASIG')
+        valor = self._expresion()
+        self._fin_sentencia()
+        self.tabla.obtener(nombre, self.lineas[inicio])
+        return self._nodo('asignacion', inicio, self._hoja(inicio), valor)
+
+    def _si(self):
+        inicio = self.i
+        marca = self._marca()
+        self.i += 1
+        condicion = self._condicion_entre_parentesis()
+        bloque = self._bloque()
+        tipo = self.tipos[self.i]
+        if tipo == 'SINO':
+            self.i += 1
+            condicion2 = self._condicion_entre_parentesis()
+            bloque2 = self._bloque()
+            if self.tipos[self.i] != 'EOC':
+                return self._nodo('si_sino', inicio, condicion, bloque, condicion2, bloque2)
+        elif tipo != 'EOC':
+            return self._nodo('si', inicio, condicion, bloque)
+        # p_estructura_si compara len(p) con 18 para si-sino-eoc, pero esa
+        # producción da len(p) == 19, así que ni si-sino-eoc ni si-eoc generan nodo
+        self.i += 1
+        self._bloque()
+        self._descartar(marca)
+        return None
+
+    def _mientras(self):
+        inicio = self.i
+        self.i += 1
+        condicion = self._condicion_entre_parentesis()
+        return self._nodo('mientras', inicio, condicion, self._bloque())
+
+    def _para(self):
+        inicio = self.i
+        self.i += 1
+        # Igual que inicio_para en la gramática: la inicialización vive en un ámbito del para
+        self.tabla.abrir_ambito()
+        self._esperar('PARIZQ')
+        inicializacion = self._inicializacion_para()
+        self._esperar('PUNTOCOMA')
+        condicion = self._condicion()
+        self._esperar('PUNTOCOMA')
+        incremento = self._incremento_para()
+        self._esperar('PARDER')
+        bloque = self._bloque()
+        self.tabla.cerrar_ambito()
+        return self._nodo('para', inicio, inicializacion, condicion, incremento, bloque)
+
+    def _inicializacion_para(self):
+        inicio = self.i
+        tipo = self.tipos[inicio]
+        if tipo in TIPOS:
+            tipo = self.valores[inicio]
+            self.i += 1
+            i_nombre = self._consumir('IDENTIFICADOR')
+            self._esperar('ASIG')
+            valor = self._expresion()
+            # El parser LALR reduce (y declara) solo al ver el ';' siguiente
+            if self.tipos[self.i] != 'PUNTOCOMA':
+                self._error()
+            self.tabla.agregar(self.valores[i_nombre], tipo, valor, self.lineas[i_nombre])
+            return self._nodo('declaracion', inicio, tipo, self._hoja(i_nombre), valor)
+        self._consumir('IDENTIFICADOR')
+        self._esperar('ASIG')
+        return self._nodo('asignacion', inicio, self._hoja(inicio), self._expresion())
+
+    def _incremento_para(self):
+        inicio = self._consumir('IDENTIFICADOR')
+        tipo = self.tipos[self.i]
+        if tipo == 'ASIG':
+            self.i += 1
+            i_operando = self._consumir('IDENTIFICADOR')
+            if self.tipos[self.i] not in ('SUMA', 'RESTA'):
+                self._error()
+            operador = self.valores[self.i]
+            self.i += 1
+            i_numero = self._consumir('NUMERO')
+            operacion = self._nodo_expresion('operacion', i_operando, operador, self._hoja(i_operando), self._hoja(i_numero))
+            return self._nodo('asignacion', inicio, self._hoja(inicio), operacion)
+        if tipo not in ('SUMA', 'RESTA'):
+            self._error()
+        i_operador = self.i
+        self.i += 1
+        self._esperar(tipo)
+        # Igual que p_incremento_para: i++ es i + 1 e i-- es i - 1
+        operacion = self._nodo_expresion('operacion', inicio, self.valores[i_operador], self._hoja(inicio),
+                                         self._constante(1, i_operador))
+        return self._nodo('asignacion', inicio, self._hoja(inicio), operacion)
+
+    def _imprimir(self):
+        inicio = self.i
+        self.i += 1
+        self._esperar('PARIZQ')
+        expresion = self._expresion()
+        self._esperar('PARDER')
+        self._esperar('PUNTOCOMA')
+        return self._nodo('imprimir', inicio, expresion)
+
+    def _condicion(self):
+        inicio = self.i
+        izquierdo = self._expresion()
+        if self.tipos[self.i] not in RELACIONALES:
+            self._error()
+        operador = self.valores[self.i]
+        self.i += 1
+        return self._nodo_expresion('condicion', inicio, operador, izquierdo, self._expresion())
+
+    def _expresion(self, potencia_minima=0):
+        """
+        Expresión cuyos operadores enlazan con más fuerza que potencia_minima.
+
+        No usa recursión: cada operando izquierdo que espera su derecho y cada
+        paréntesis abierto queda en una pila como (inicio, potencia mínima,
+        izquierdo, operador), con operador None para el paréntesis, así que la
+        profundidad de los paréntesis no está limitada por la pila de Python.
+        """
+        tipos = self.tipos
+        valores = self.valores
+        pila = []
+        inicio = self.i
+        while True:
+            # Término: los paréntesis abren un nivel nuevo hasta llegar a una hoja
+            i = self.i
+            while tipos[i] == 'PARIZQ':
+                pila.append((inicio, potencia_minima, None, None))
+                i += 1
+                inicio, potencia_minima = i, 0
+            if tipos[i] not in TERMINOS:
+                self.i = i
+                self._error()
+            self.i = i + 1
+            izquierdo = self._hoja(i)
+            while True:
+                potencia = POTENCIA.get(tipos[self.i])
+                if potencia is not None and potencia > potencia_minima:
+                    # El operando derecho es un nivel nuevo que empieza después del operador
+                    pila.append((inicio, potencia_minima, izquierdo, valores[self.i]))
+                    self.i += 1
+                    inicio, potencia_minima = self.i, potencia
+                    break
+                # Termina el nivel: su valor completa el de abajo
+                if not pila:
+                    return izquierdo
+                inicio, potencia_minima, anterior, operador = pila.pop()
+                if operador is None:
+                    self._esperar('PARDER')
+                else:
+                    izquierdo = self._nodo_expresion('operacion', inicio, operador, anterior, izquierdo)
+
+parser_descendente = ParserDescendente()
+
+
+def comparar_con_lalr(codigo):
+    """
+    Analiza el código con ambos motores, cada uno con la tabla de símbolos vacía.
+
+    Returns:
+        tuple: (resultado LALR, resultado descendente); cada uno es el AST o
+        el mensaje de la excepción que produjo
+    """
+    from parser import parser
+    from flujo_tokens import tokenizar
+
+    resultados = []
+    for motor in (parser, parser_descendente):
+        tabla_simbolos.limpiar()
+        try:
+            resultados.append(motor.parse(lexer=tokenizar(codigo).vista()))
+        except Exception as e:
+            resultados.append(str(e))
+    tabla_simbolos.limpiar()
+    return tuple(resultados)
+
+
+if __name__ == "__main__":
+    import random
+    from benchmarks import generar_programa
+    from flujo_tokens import tokenizar
+
+    # Corpus de paridad: programas válidos y variantes con errores sintácticos y semánticos
+    validos = [
+        generar_programa(400),
+        """
+        entero numero1 = 42;
+        decimal numero2 = 3.14;
+        caracter letra = 'A';
+        booleano flag = true;
+        si (numero1 > 40) { print(numero1); numero1 = numero1 + 1; }
+        sino (numero1 < 40) { print(numero2); } eoc { print(letra); }
+        si (numero1 > 1) { print(numero1); } eoc { print(numero2); }
+        si (numero1 == (2 + numero1) * 3 / 4 - 1) { print(flag); } sino (false != true) { print(1); }
+        mientras (numero1 < 50) { numero1 = numero1 + 1; print(numero1); }
+        para (entero i = 0; i < 5; i++) { print(i); }
+        para (numero1 = 0; numero1 <= 5; numero1 = numero1 - 2) { para (entero j = 1; j >= 0; j--) { print(j); } }
+        """,
+    ]
+    casos = list(validos)
+    aleatorio = random.Random(0)
+    for _ in range(400):
+        codigo = aleatorio.choice(validos[1:] + [generar_programa(12)])
+        palabras = codigo.split()
+        for _ in range(aleatorio.randint(1, 3)):
+            posicion = aleatorio.randrange(len(palabras))
+            operacion = aleatorio.random()
+            if operacion < 0.4:
+                del palabras[posicion]
+            elif operacion < 0.7:
+                palabras.insert(posicion, aleatorio.choice(palabras))
+            else:
+                palabras[posicion] = aleatorio.choice(("}", "{", ";", "(", ")", "x", "1", "sino", "eoc", "+", "<"))
+        casos.append(" ".join(palabras))
+
+    iguales = 0
+    for codigo in casos:
+        lalr, descendente = comparar_con_lalr(codigo)
+        if lalr == descendente:
+            iguales += 1
+        else:
+            print(f"Diferencia en:\n{codigo}\n  LALR:        {lalr}\n  descendente: {descendente}")
+    print(f"{iguales}/{len(casos)} casos con el mismo resultado en ambos motores")
+
+    flujo = tokenizar(generar_programa(12))
+    print(parser_descendente.parse(lexer=flujo.vista())[:4])
@@ -0,0 +1,418 @@
+"""
+Reanálisis sintáctico incremental para ediciones de texto.
+
+Junto al AST se guardan las posiciones de cada sentencia y de las llaves de
+cada bloque. Tras una edición se busca la sentencia (o el grupo de
+sentencias contiguas) más interna que la contiene y solo ese tramo del texto
+se vuelve a tokenizar y analizar. El resultado se inserta en el árbol
+anterior: los nodos que contienen la edición se reconstruyen y todos los
+demás subárboles se reutilizan tal cual (son los mismos objetos), así que
+las fases posteriores pueden guardar resultados asociados a cada subárbol.
+
+Un tramo se puede analizar aislado porque toda sentencia termina en ';' o
+'}' y ninguna puede empezar con 'sino' ni 'eoc': los tokens del borde no se
+combinan con el texto vecino. Si el tramo no forma una lista de sentencias
+completa (por ejemplo, se borró una llave), se reintenta con la sentencia
+que lo contiene y, en el nivel superior, con todo el programa, que informa
+el error de sintaxis igual que el parser normal.
+
+Las posiciones de las sentencias siguen el mismo esquema que
+lexer_incremental: las anteriores al punto de corte son absolutas y las
+posteriores relativas al final (del texto, o de la llave de cierre en un
+bloque). Dentro de un bloque se miden desde el inicio de la sentencia que lo
+contiene, así que no cambian cuando se edita otra parte del archivo.
+
+El parser no consulta la tabla de símbolos (una sentencia aislada no sabe
+qué variables se declararon antes): las variables no declaradas o
+duplicadas las informa el análisis semántico.
+"""
+from array import array
+
+from flujo_tokens import FlujoTokens
+from parser_descendente import ParserDescendente
+
+
+class _SinVerificacion:
+    """Tabla de símbolos que acepta cualquier declaración y cualquier uso"""
+    def agregar(self, nombre, tipo, valor=None, linea=None):
+        pass
+
+    def obtener(self, nombre, linea=None):
+        return True
+
+    def abrir_ambito(self):
+        pass
+
+    def cerrar_ambito(self):
+        pass
+
+
+class _Sentencias:
+    """
+    Lista de sentencias con la posición de cada una.
+
+    Las sentencias [0, corte) guardan posiciones absolutas (respecto del
+    origen de la lista) y las [corte, n) relativas a referencia(), el final
+    de la lista. Una edición solo mueve el final, así que las posiciones
+    de las sentencias posteriores no cambian, y mover el corte cuesta solo
+    la distancia recorrida.
+    """
+    def __len__(self):
+        return len(self.nodos)
+
+    def inicio_de(self, k):
+        if k < self.corte:
+            return self.inicios[k]
+        return self.inicios[k] + self.referencia()
+
+    def fin_de(self, k):
+        if k < self.corte:
+            return self.fines[k]
+        return self.fines[k] + self.referencia()
+
+    def reemplazar(self, a, b, tramo, delta):
+        """Sustituye las sentencias [a, b) por las del tramo (con posiciones ya relativas al origen)"""
+        # Antes del tramo todo absoluto y desde b relativo al final (no cambia con la edición)
+        if self.corte < a:
+            self._mover_corte(a)
+        elif self.corte > b:
+            self._mover_corte(b)
+        self.nodos = self.nodos[:a] + tramo.nodos + self.nodos[b:]
+        self.inicios[a:b] = tramo.inicios
+        self.fines[a:b] = tramo.fines
+        self.bloques[a:b] = tramo.bloques
+        self.corte = a + len(tramo)
+        self._mover_fin(delta)
+
+    def actualizar(self, k, nodo, delta):
+        """Cambia el nodo de la sentencia k, cuyo final se movió delta caracteres"""
+        if self.corte != k + 1:
+            self._mover_corte(k + 1)
+        self.fines[k] += delta
+        self.nodos = self.nodos[:k] + [nodo] + self.nodos[k + 1:]
+        self._mover_fin(delta)
+
+    def _mover_fin(self, delta):
+        """El final de la lista se movió delta caracteres"""
+
+    def _mover_corte(self, destino):
+        """Convierte las posiciones de las sentencias entre el corte actual y 'destino'"""
+        inicios, fines = self.inicios, self.fines
+        referencia = self.referencia()
+        if destino > self.corte:
+            for k in range(self.corte, destino):
+                inicios[k] += referencia
+                fines[k] += referencia
+        else:
+            for k in range(destino, self.corte):
+                inicios[k] -= referencia
+                fines[k] -= referencia
+        self.corte = destino
+
+
+class Lista(_Sentencias):
+    """
+    Sentencias de un bloque con sus posiciones.
+
+    El origen de las posiciones es el inicio de la sentencia que contiene el
+    bloque, y las relativas al final se miden desde la llave de cierre.
+    inicio y fin son las posiciones de las llaves. bloques[k] son las Listas
+    de los bloques de la sentencia k, en orden.
+    """
+    __slots__ = ('nodos', 'inicios', 'fines', 'bloques', 'corte', 'inicio', 'fin')
+
+    def __init__(self):
+        self.nodos = []
+        self.inicios = array('q')
+        self.fines = array('q')
+        self.bloques = []
+        self.corte = 0
+        self.inicio = self.fin = 0
+
+    def referencia(self):
+        return self.fin
+
+    def interior(self):
+        """Tramo entre las llaves"""
+        return self.inicio + 1, self.fin - 1
+
+    def agregar(self, nodo, inicio, fin, bloques):
+        for bloque in bloques:
+            bloque.desplazar(-inicio)
+        self.nodos.append(nodo)
+        self.inicios.append(inicio)
+        self.fines.append(fin)
+        self.bloques.append(bloques)
+        self.corte += 1
+
+    def desplazar(self, delta):
+        """Mueve el bloque completo (las posiciones relativas al final no cambian)"""
+        self.inicio += delta
+        self.fin += delta
+        inicios, fines = self.inicios, self.fines
+        for k in range(self.corte):
+            inicios[k] += delta
+            fines[k] += delta
+
+    def _mover_fin(self, delta):
+        self.fin += delta
+
+
+class _ParserTramos(ParserDescendente):
+    """Parser descendente que además devuelve la Lista con las posiciones de las sentencias"""
+    def __init__(self):
+        super().__init__(_SinVerificacion())
+        self.posiciones = ()
+        self._bloques = []
+        self._lista = None
+
+    def analizar(self, flujo):
+        """Analiza todos los tokens del flujo; las posiciones son las del flujo"""
+        self.posiciones = flujo.posiciones
+        self._bloques = []
+        try:
+            self.parse(lexer=flujo.vista())
+            return self._lista
+        finally:
+            self.posiciones = ()
+            self._lista = None
+
+    def _declaraciones(self, cierre):
+        tipos = self.tipos
+        sentencias = self.sentencias
+        posiciones = self.posiciones
+        lista = Lista()
+        externos = self._bloques
+        while True:
+            analizar = sentencias.get(tipos[self.i])
+            if analizar is None:
+                self._error()
+            inicio = self.i
+            # Bloques de esta sentencia, que _bloque_nodos va agregando
+            self._bloques = []
+            nodo = analizar()
+            if nodo is not None:
+                # Toda sentencia termina con ';' o '}'
+                lista.agregar(nodo, posiciones[inicio], posiciones[self.i - 1] + 1, self._bloques)
+            if tipos[self.i] == cierre:
+                break
+        self._bloques = externos
+        self._lista = lista
+        return lista.nodos
+
+    def _bloque_nodos(self, nodos, inicio):
+        lista = self._lista
+        lista.inicio, lista.fin = self.posiciones[inicio], self.posiciones[self.i - 1] + 1
+        self._bloques.append(lista)
+        return nodos
+
+
+class _Escalar(Exception):
+    """El tramo no puede analizarse aislado"""
+
+
+def _primera(n, condicion):
+    """Primer k en [0, n) que cumple la condición (monótona), o n (búsqueda binaria)"""
+    bajo, alto = 0, n
+    while bajo < alto:
+        medio = (bajo + alto) // 2
+        if condicion(medio):
+            alto = medio
+        else:
+            bajo = medio + 1
+    return bajo
+
+
+class ParserIncremental(_Sentencias):
+    """
+    Mantiene el AST de un texto a través de sucesivas ediciones.
+
+    El programa es la lista de sentencias de nivel superior: su origen es el
+    inicio del texto y las posiciones relativas se miden desde el final.
+    """
+    def __init__(self, texto, nombres=None):
+        self.tablas = FlujoTokens(nombres)
+        self.parser = _ParserTramos()
+        self.texto = texto
+        self.nodos = None
+        self.inicios = array('q')
+        self.fines = array('q')
+        self.bloques = []
+        self.corte = 0
+        # Tramo del texto actual que se analizó en la última edición
+        self.tramo = (0, len(texto))
+        self._analizar_todo()
+
+    @property
+    def ast(self):
+        """Lista de sentencias del programa (None si el texto tiene errores de sintaxis)"""
+        return self.nodos
+
+    def __len__(self):
+        return len(self.nodos) if self.nodos is not None else 0
+
+    def referencia(self):
+        return len(self.texto)
+
+    def interior(self):
+        return 0, len(self.texto)
+
+    def editar(self, inicio, eliminados, insertado):
+        """
+        Aplica la edición texto[inicio:inicio+eliminados] = insertado.
+
+        Returns:
+            list: El AST del texto nuevo. Lanza la excepción de sintaxis del
+            parser si el texto nuevo no es un programa válido; en ese caso la
+            siguiente edición vuelve a analizar todo el texto.
+        """
+        viejo = self.texto
+        fin_eliminado = inicio + eliminados
+        nuevo = viejo[:inicio] + insertado + viejo[fin_eliminado:]
+        delta = len(insertado) - eliminados
+        if self.nodos is None:
+            self.texto = nuevo
+            return self._analizar_todo()
+
+        # Bajar por los bloques que contienen toda la edición, entre sus llaves
+        nivel, origen = self, 0
+        camino = []
+        while True:
+            a, b = self._afectadas(nivel, inicio - origen, fin_eliminado - origen)
+            if b - a != 1:
+                break
+            origen_sentencia = origen + nivel.inicio_de(a)
+            bloque = next((bloque for bloque in nivel.bloques[a]
+                           if origen_sentencia + bloque.inicio < inicio
+                           and fin_eliminado < origen_sentencia + bloque.fin), None)
+            if bloque is None:
+                break
+            camino.append((nivel, a, origen, bloque, bloque.nodos))
+            nivel, origen = bloque, origen_sentencia
+
+        # Analizar el tramo más interno; si no se puede aislado, subir un nivel
+        while True:
+            try:
+                tramo, desde, hasta = self._analizar_tramo(nuevo, nivel, origen, a, b, delta)
+                break
+            except _Escalar:
+                if not camino:
+                    self.texto = nuevo
+                    return self._analizar_todo()
+                nivel, a, origen, _, _ = camino.pop()
+                b = a + 1
+
+        tramo.desplazar(-origen)
+        nivel.reemplazar(a, b, tramo, delta)
+        # Reconstruir las sentencias que contienen el bloque modificado
+        for padre, k, _, bloque, nodos_anteriores in reversed(camino):
+            nodo = tuple(bloque.nodos if campo is nodos_anteriores else campo for campo in padre.nodos[k])
+            for otro in padre.bloques[k]:
+                if otro.inicio > bloque.inicio:
+                    otro.desplazar(delta)
+            padre.actualizar(k, nodo, delta)
+        self.texto = nuevo
+        self.tramo = (desde, hasta)
+        return self.nodos
+
+    def _afectadas(self, nivel, inicio, fin):
+        """Sentencias [a, b) del nivel que tocan el tramo [inicio, fin] (posiciones del nivel)"""
+        n = len(nivel)
+        a = _primera(n, lambda k: nivel.fin_de(k) >= inicio)
+        b = _primera(n, lambda k: nivel.inicio_de(k) > fin)
+        return a, max(a, b)
+
+    def _analizar_tramo(self, nuevo, nivel, origen, a, b, delta):
+        """
+        Analiza el texto que ocupan las sentencias [a, b) del nivel junto con
+        los espacios que las rodean, y devuelve (Lista con posiciones absolutas,
+        inicio, fin) del tramo en el texto nuevo.
+        """
+        interior = nivel.interior()
+        desde = origen + (nivel.fin_de(a - 1) if a > 0 else interior[0])
+        hasta = origen + (nivel.inicio_de(b) if b < len(nivel) else interior[1]) + delta
+        flujo = self.tablas.derivado()
+        flujo.extender(nuevo, desde, hasta, nuevo.count('\n', 0, desde) + 1)
+        if len(flujo):
+            try:
+                tramo = self.parser.analizar(flujo)
+            except Exception:
+                raise _Escalar()
+        else:
+            tramo = Lista()
+        # Un bloque vacío o un programa vacío son errores de sintaxis
+        if len(nivel) - (b - a) + len(tramo) == 0:
+            raise _Escalar()
+        return tramo, desde, hasta
+
+    def _analizar_todo(self):
+        self.nodos = None
+        self.tramo = (0, len(self.texto))
+        flujo = self.tablas.derivado()
+        flujo.extender(self.texto)
+        lista = self.parser.analizar(flujo)
+        self.nodos = lista.nodos
+        self.inicios = lista.inicios
+        self.fines = lista.fines
+        self.bloques = lista.bloques
+        self.corte = len(lista)
+        return self.nodos
+
+
+def analizar_completo(texto):
+    """AST del texto analizado desde cero con las mismas reglas que ParserIncremental"""
+    flujo = FlujoTokens()
+    flujo.extender(texto)
+    return ParserDescendente(_SinVerificacion()).parse(lexer=flujo.vista())
+
+
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import random
+
+    codigo = """entero x = 5;
+mientras (x > 0) {
+    x = x - 1;
+    si (x == 2) { print(x); } sino (x == 1) { print(1); }
+    print(x);
+}
+para (entero i = 0; i < 3; i++) { print(i * 2); }
+"""
+    incremental = ParserIncremental(codigo)
+    anterior = incremental.ast
+    # Cambiar "x - 1" por "x - 10": solo se vuelve a analizar esa sentencia
+    incremental.editar(codigo.index("1;"), 1, "10")
+    print("Tramo analizado:", repr(incremental.texto[slice(*incremental.tramo)]))
+    print("Primera sentencia reutilizada:", incremental.ast[0] is anterior[0])
+    print("Bucle para reutilizado:", incremental.ast[2] is anterior[2])
+    mientras = incremental.ast[1]
+    print("Condicional del bloque reutilizado:", mientras[2][1] is anterior[1][2][1])
+    print(mientras)
+
+    # Ediciones al azar comparadas con analizar todo el texto
+    aleatorio = random.Random(0)
+    fragmentos = (" ", "x", "1", ";", "}", "{", "print(x);", "x = 2;", "si (x < 1) { x = 3; }", "eoc { x = 4; }", "\n")
+    iguales = total = 0
+    for _ in range(2000):
+        texto = incremental.texto
+        inicio = aleatorio.randrange(len(texto) + 1)
+        eliminados = min(len(texto) - inicio, aleatorio.choice((0, 0, 1, 2, 5)))
+        insertado = aleatorio.choice(fragmentos) if aleatorio.random() < 0.7 else ""
+        resultado = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for analizar in (lambda: incremental.editar(inicio, eliminados, insertado),
+                             lambda: analizar_completo(incremental.texto)):
+                try:
+                    resultado.append(analizar())
+                except Exception as e:
+                    resultado.append(str(e))
+        total += 1
+        iguales += resultado[0] == resultado[1]
+        if resultado[0] != resultado[1]:
+            print(f"Diferencia en:\n{incremental.texto}\n  incremental: {resultado[0]}\n  completo:    {resultado[1]}")
+            break
+        # Volver a un programa válido de vez en cuando para que la prueba no quede en errores
+        if isinstance(resultado[1], str) and aleatorio.random() < 0.3:
+            incremental.editar(0, len(incremental.texto), codigo)
+    print(f"{iguales}/{total} ediciones con el mismo AST que el análisis completo")
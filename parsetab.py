@@ -6,9 +6,9 @@ _tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = 'leftSUMARESTAleftMULTDIVAND ASIG CARACTER DECIMAL DIFERENTE DIV EOC FALSE IDENTIFICADOR IGUAL LLAVEDER LLAVEIZQ MAYOR MAYORIGUAL MENOR MENORIGUAL MIENTRAS MULT NOT NUMERO OR PARA PARDER PARIZQ PRINT PUNTOCOMA RESTA SI SINO SUMA TIPO_BOOLEANO TIPO_CARACTER TIPO_DECIMAL TIPO_ENTERO TRUEprograma : declaracionesdeclaraciones : declaraciones declaracion\n                  | declaraciondeclaracion : declaracion_variable\n                | asignacion\n                | estructura_control\n                | imprimirdeclaracion_variable : tipo IDENTIFICADOR ASIG expresion PUNTOCOMAtipo : TIPO_ENTERO\n          | TIPO_DECIMAL\n          | TIPO_CARACTER\n          | TIPO_BOOLEANOasignacion : IDENTIFICADOR ASIG expresion PUNTOCOMAestructura_control : estructura_si\n                      | estructura_mientras\n                      | estructura_paraestructura_si : SI PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER\n                  | SI PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER SINO PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER\n                  | SI PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER SINO PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER EOC LLAVEIZQ declaraciones LLAVEDER\n                  | SI PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER EOC LLAVEIZQ declaraciones LLAVEDERestructura_mientras : MIENTRAS PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDERestructura_para : PARA PARIZQ inicializacion_para PUNTOCOMA condicion PUNTOCOMA incremento_para PARDER LLAVEIZQ declaraciones LLAVEDERinicializacion_para : tipo IDENTIFICADOR ASIG expresion\n                       | IDENTIFICADOR ASIG expresionincremento_para : IDENTIFICADOR ASIG IDENTIFICADOR SUMA NUMERO\n                    | IDENTIFICADOR ASIG IDENTIFICADOR RESTA NUMERO\n                    | IDENTIFICADOR SUMA SUMA\n                    | IDENTIFICADOR RESTA RESTAcondicion : expresion IGUAL expresion\n              | expresion DIFERENTE expresion\n              | expresion MENOR expresion\n              | expresion MAYOR expresion\n              | expresion MENORIGUAL expresion\n              | expresion MAYORIGUAL expresionexpresion : expresion SUMA termino\n              | expresion RESTA termino\n              | expresion MULT termino\n              | expresion DIV termino\n              | terminotermino : IDENTIFICADOR\n             | NUMERO\n             | DECIMAL\n             | CARACTER\n             | TRUE\n             | FALSE\n             | PARIZQ expresion PARDERimprimir : PRINT PARIZQ expresion PARDER PUNTOCOMA'
+_lr_signature = 'leftSUMARESTAleftMULTDIVAND ASIG CARACTER DECIMAL DIFERENTE DIV EOC FALSE IDENTIFICADOR IGUAL LLAVEDER LLAVEIZQ MAYOR MAYORIGUAL MENOR MENORIGUAL MIENTRAS MULT NOT NUMERO OR PARA PARDER PARIZQ PRINT PUNTOCOMA RESTA SI SINO SUMA TIPO_BOOLEANO TIPO_CARACTER TIPO_DECIMAL TIPO_ENTERO TRUEprograma : sentenciasdeclaraciones : declaraciones declaracion\n                  | declaracion\n     sentencias : sentencias declaracion\n               | declaraciondeclaracion : declaracion_variable\n                | asignacion\n                | estructura_control\n                | imprimirdeclaracion_variable : tipo IDENTIFICADOR ASIG expresion PUNTOCOMAtipo : TIPO_ENTERO\n          | TIPO_DECIMAL\n          | TIPO_CARACTER\n          | TIPO_BOOLEANOasignacion : IDENTIFICADOR ASIG expresion PUNTOCOMAestructura_control : estructura_si\n                      | estructura_mientras\n                      | estructura_paraestructura_si : SI PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque\n                  | SI PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque SINO PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque\n                  | SI PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque SINO PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque EOC abrir_bloque bloque cerrar_bloque\n                  | SI PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque EOC abrir_bloque bloque cerrar_bloqueestructura_mientras : MIENTRAS PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloqueestructura_para : inicio_para PARIZQ inicializacion_para PUNTOCOMA condicion PUNTOCOMA incremento_para PARDER abrir_bloque bloque cerrar_bloqueinicio_para : PARAabrir_bloque : LLAVEIZQcerrar_bloque : LLAVEDERinicializacion_para : tipo IDENTIFICADOR ASIG expresion\n                       | IDENTIFICADOR ASIG expresionincremento_para : IDENTIFICADOR ASIG IDENTIFICADOR SUMA NUMERO\n                    | IDENTIFICADOR ASIG IDENTIFICADOR RESTA NUMERO\n                    | IDENTIFICADOR SUMA SUMA\n                    | IDENTIFICADOR RESTA RESTAcondicion : expresion IGUAL expresion\n              | expresion DIFERENTE expresion\n              | expresion MENOR expresion\n              | expresion MAYOR expresion\n              | expresion MENORIGUAL expresion\n              | expresion MAYORIGUAL expresionexpresion : expresion SUMA termino\n              | expresion RESTA termino\n              | expresion MULT termino\n              | expresion DIV termino\n              | terminotermino : IDENTIFICADOR\n             | NUMERO\n             | DECIMAL\n             | TRUE\n             | FALSE\n             | PARIZQ expresion PARDERtermino : CARACTERimprimir : PRINT PARIZQ expresion PARDER PUNTOCOMAdeclaracion : error PUNTOCOMAsentencias : sentencias error LLAVEDER\n               | error LLAVEDERbloque : declaracionesbloque : declaraciones error\n            | error'
     
-_lr_action_items = {'IDENTIFICADOR':([0,2,3,4,5,6,7,8,10,11,12,14,15,16,17,21,23,24,25,26,27,28,37,43,46,47,48,49,50,54,55,56,57,58,59,61,63,64,70,71,78,80,82,83,84,86,87,93,96,97,98,103,104,108,109,112,113,114,116,117,118,],[9,9,-3,-4,-5,-6,-7,22,-14,-15,-16,-9,-10,-11,-12,-2,29,29,29,29,44,29,29,62,-13,29,29,29,29,29,29,29,29,29,29,29,29,-8,-47,9,9,29,9,9,89,-17,-21,99,29,9,9,9,9,-20,-22,9,9,-18,9,9,-19,]),'PRINT':([0,2,3,4,5,6,7,10,11,12,21,46,64,70,71,78,82,83,86,87,97,98,103,104,108,109,112,113,114,116,117,118,],[13,13,-3,-4,-5,-6,-7,-14,-15,-16,-2,-13,-8,-47,13,13,13,13,-17,-21,13,13,13,13,-20,-22,13,13,-18,13,13,-19,]),'TIPO_ENTERO':([0,2,3,4,5,6,7,10,11,12,21,27,46,64,70,71,78,82,83,86,87,97,98,103,104,108,109,112,113,114,116,117,118,],[14,14,-3,-4,-5,-6,-7,-14,-15,-16,-2,14,-13,-8,-47,14,14,14,14,-17,-21,14,14,14,14,-20,-22,14,14,-18,14,14,-19,]),'TIPO_DECIMAL':([0,2,3,4,5,6,7,10,11,12,21,27,46,64,70,71,78,82,83,86,87,97,98,103,104,108,109,112,113,114,116,117,118,],[15,15,-3,-4,-5,-6,-7,-14,-15,-16,-2,15,-13,-8,-47,15,15,15,15,-17,-21,15,15,15,15,-20,-22,15,15,-18,15,15,-19,]),'TIPO_CARACTER':([0,2,3,4,5,6,7,10,11,12,21,27,46,64,70,71,78,82,83,86,87,97,98,103,104,108,109,112,113,114,116,117,118,],[16,16,-3,-4,-5,-6,-7,-14,-15,-16,-2,16,-13,-8,-47,16,16,16,16,-17,-21,16,16,16,16,-20,-22,16,16,-18,16,16,-19,]),'TIPO_BOOLEANO':([0,2,3,4,5,6,7,10,11,12,21,27,46,64,70,71,78,82,83,86,87,97,98,103,104,108,109,112,113,114,116,117,118,],[17,17,-3,-4,-5,-6,-7,-14,-15,-16,-2,17,-13,-8,-47,17,17,17,17,-17,-21,17,17,17,17,-20,-22,17,17,-18,17,17,-19,]),'SI':([0,2,3,4,5,6,7,10,11,12,21,46,64,70,71,78,82,83,86,87,97,98,103,104,108,109,112,113,114,116,117,118,],[18,18,-3,-4,-5,-6,-7,-14,-15,-16,-2,-13,-8,-47,18,18,18,18,-17,-21,18,18,18,18,-20,-22,18,18,-18,18,18,-19,]),'MIENTRAS':([0,2,3,4,5,6,7,10,11,12,21,46,64,70,71,78,82,83,86,87,97,98,103,104,108,109,112,113,114,116,117,118,],[19,19,-3,-4,-5,-6,-7,-14,-15,-16,-2,-13,-8,-47,19,19,19,19,-17,-21,19,19,19,19,-20,-22,19,19,-18,19,19,-19,]),'PARA':([0,2,3,4,5,6,7,10,11,12,21,46,64,70,71,78,82,83,86,87,97,98,103,104,108,109,112,113,114,116,117,118,],[20,20,-3,-4,-5,-6,-7,-14,-15,-16,-2,-13,-8,-47,20,20,20,20,-17,-21,20,20,20,20,-20,-22,20,20,-18,20,20,-19,]),'$end':([1,2,3,4,5,6,7,10,11,12,21,46,64,70,86,87,108,109,114,118,],[0,-1,-3,-4,-5,-6,-7,-14,-15,-16,-2,-13,-8,-47,-17,-21,-20,-22,-18,-19,]),'LLAVEDER':([3,4,5,6,7,10,11,12,21,46,64,70,82,83,86,87,103,104,108,109,113,114,117,118,],[-3,-4,-5,-6,-7,-14,-15,-16,-2,-13,-8,-47,86,87,-17,-21,108,109,-20,-22,114,-18,118,-19,]),'ASIG':([9,22,44,62,89,],[23,28,63,80,93,]),'PARIZQ':([13,18,19,20,23,24,25,26,28,37,47,48,49,50,54,55,56,57,58,59,61,63,80,90,96,],[24,25,26,27,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,96,37,]),'NUMERO':([23,24,25,26,28,37,47,48,49,50,54,55,56,57,58,59,61,63,80,96,105,106,],[32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,110,111,]),'DECIMAL':([23,24,25,26,28,37,47,48,49,50,54,55,56,57,58,59,61,63,80,96,],[33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,]),'CARACTER':([23,24,25,26,28,37,47,48,49,50,54,55,56,57,58,59,61,63,80,96,],[34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,]),'TRUE':([23,24,25,26,28,37,47,48,49,50,54,55,56,57,58,59,61,63,80,96,],[35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,]),'FALSE':([23,24,25,26,28,37,47,48,49,50,54,55,56,57,58,59,61,63,80,96,],[36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,]),'PUNTOCOMA':([29,30,31,32,33,34,35,36,42,45,52,65,66,67,68,69,72,73,74,75,76,77,79,81,85,],[-40,46,-39,-41,-42,-43,-44,-45,61,64,70,-35,-36,-37,-38,-46,-29,-30,-31,-32,-33,-34,84,-24,-23,]),'SUMA':([29,30,31,32,33,34,35,36,38,40,45,51,65,66,67,68,69,72,73,74,75,76,77,81,85,89,94,99,],[-40,47,-39,-41,-42,-43,-44,-45,47,47,47,47,-35,-36,-37,-38,-46,47,47,47,47,47,47,47,47,94,100,105,]),'RESTA':([29,30,31,32,33,34,35,36,38,40,45,51,65,66,67,68,69,72,73,74,75,76,77,81,85,89,95,99,],[-40,48,-39,-41,-42,-43,-44,-45,48,48,48,48,-35,-36,-37,-38,-46,48,48,48,48,48,48,48,48,95,101,106,]),'MULT':([29,30,31,32,33,34,35,36,38,40,45,51,65,66,67,68,69,72,73,74,75,76,77,81,85,],[-40,49,-39,-41,-42,-43,-44,-45,49,49,49,49,-35,-36,-37,-38,-46,49,49,49,49,49,49,49,49,]),'DIV':([29,30,31,32,33,34,35,36,38,40,45,51,65,66,67,68,69,72,73,74,75,76,77,81,85,],[-40,50,-39,-41,-42,-43,-44,-45,50,50,50,50,-35,-36,-37,-38,-46,50,50,50,50,50,50,50,50,]),'PARDER':([29,31,32,33,34,35,36,38,39,41,51,65,66,67,68,69,72,73,74,75,76,77,88,100,101,102,110,111,],[-40,-39,-41,-42,-43,-44,-45,52,53,60,69,-35,-36,-37,-38,-46,-29,-30,-31,-32,-33,-34,92,-27,-28,107,-25,-26,]),'IGUAL':([29,31,32,33,34,35,36,40,65,66,67,68,69,],[-40,-39,-41,-42,-43,-44,-45,54,-35,-36,-37,-38,-46,]),'DIFERENTE':([29,31,32,33,34,35,36,40,65,66,67,68,69,],[-40,-39,-41,-42,-43,-44,-45,55,-35,-36,-37,-38,-46,]),'MENOR':([29,31,32,33,34,35,36,40,65,66,67,68,69,],[-40,-39,-41,-42,-43,-44,-45,56,-35,-36,-37,-38,-46,]),'MAYOR':([29,31,32,33,34,35,36,40,65,66,67,68,69,],[-40,-39,-41,-42,-43,-44,-45,57,-35,-36,-37,-38,-46,]),'MENORIGUAL':([29,31,32,33,34,35,36,40,65,66,67,68,69,],[-40,-39,-41,-42,-43,-44,-45,58,-35,-36,-37,-38,-46,]),'MAYORIGUAL':([29,31,32,33,34,35,36,40,65,66,67,68,69,],[-40,-39,-41,-42,-43,-44,-45,59,-35,-36,-37,-38,-46,]),'LLAVEIZQ':([53,60,91,92,107,115,],[71,78,97,98,112,116,]),'SINO':([86,],[90,]),'EOC':([86,114,],[91,115,]),}
+_lr_action_items = {'error':([0,2,3,5,6,7,8,11,12,13,23,25,26,33,52,70,76,77,78,85,90,92,96,97,99,100,110,111,121,122,125,127,129,131,],[4,24,-5,-6,-7,-8,-9,-16,-17,-18,-4,-55,-53,-54,-15,-10,-52,91,-26,91,98,-3,-19,-27,-2,-23,91,91,-22,-24,91,-20,91,-21,]),'IDENTIFICADOR':([0,2,3,5,6,7,8,9,11,12,13,15,16,17,18,23,25,26,28,29,30,31,32,33,34,42,49,52,53,54,55,56,60,61,62,63,64,65,67,69,70,76,77,78,85,87,90,92,94,96,97,99,100,106,109,110,111,121,122,125,127,129,131,],[10,10,-5,-6,-7,-8,-9,27,-16,-17,-18,-11,-12,-13,-14,-4,-55,-53,35,35,35,35,50,-54,35,35,68,-15,35,35,35,35,35,35,35,35,35,35,35,35,-10,-52,10,-26,10,35,10,-3,102,-19,-27,-2,-23,112,35,10,10,-22,-24,10,-20,10,-21,]),'PRINT':([0,2,3,5,6,7,8,11,12,13,23,25,26,33,52,70,76,77,78,85,90,92,96,97,99,100,110,111,121,122,125,127,129,131,],[14,14,-5,-6,-7,-8,-9,-16,-17,-18,-4,-55,-53,-54,-15,-10,-52,14,-26,14,14,-3,-19,-27,-2,-23,14,14,-22,-24,14,-20,14,-21,]),'TIPO_ENTERO':([0,2,3,5,6,7,8,11,12,13,23,25,26,32,33,52,70,76,77,78,85,90,92,96,97,99,100,110,111,121,122,125,127,129,131,],[15,15,-5,-6,-7,-8,-9,-16,-17,-18,-4,-55,-53,15,-54,-15,-10,-52,15,-26,15,15,-3,-19,-27,-2,-23,15,15,-22,-24,15,-20,15,-21,]),'TIPO_DECIMAL':([0,2,3,5,6,7,8,11,12,13,23,25,26,32,33,52,70,76,77,78,85,90,92,96,97,99,100,110,111,121,122,125,127,129,131,],[16,16,-5,-6,-7,-8,-9,-16,-17,-18,-4,-55,-53,16,-54,-15,-10,-52,16,-26,16,16,-3,-19,-27,-2,-23,16,16,-22,-24,16,-20,16,-21,]),'TIPO_CARACTER':([0,2,3,5,6,7,8,11,12,13,23,25,26,32,33,52,70,76,77,78,85,90,92,96,97,99,100,110,111,121,122,125,127,129,131,],[17,17,-5,-6,-7,-8,-9,-16,-17,-18,-4,-55,-53,17,-54,-15,-10,-52,17,-26,17,17,-3,-19,-27,-2,-23,17,17,-22,-24,17,-20,17,-21,]),'TIPO_BOOLEANO':([0,2,3,5,6,7,8,11,12,13,23,25,26,32,33,52,70,76,77,78,85,90,92,96,97,99,100,110,111,121,122,125,127,129,131,],[18,18,-5,-6,-7,-8,-9,-16,-17,-18,-4,-55,-53,18,-54,-15,-10,-52,18,-26,18,18,-3,-19,-27,-2,-23,18,18,-22,-24,18,-20,18,-21,]),'SI':([0,2,3,5,6,7,8,11,12,13,23,25,26,33,52,70,76,77,78,85,90,92,96,97,99,100,110,111,121,122,125,127,129,131,],[19,19,-5,-6,-7,-8,-9,-16,-17,-18,-4,-55,-53,-54,-15,-10,-52,19,-26,19,19,-3,-19,-27,-2,-23,19,19,-22,-24,19,-20,19,-21,]),'MIENTRAS':([0,2,3,5,6,7,8,11,12,13,23,25,26,33,52,70,76,77,78,85,90,92,96,97,99,100,110,111,121,122,125,127,129,131,],[20,20,-5,-6,-7,-8,-9,-16,-17,-18,-4,-55,-53,-54,-15,-10,-52,20,-26,20,20,-3,-19,-27,-2,-23,20,20,-22,-24,20,-20,20,-21,]),'PARA':([0,2,3,5,6,7,8,11,12,13,23,25,26,33,52,70,76,77,78,85,90,92,96,97,99,100,110,111,121,122,125,127,129,131,],[22,22,-5,-6,-7,-8,-9,-16,-17,-18,-4,-55,-53,-54,-15,-10,-52,22,-26,22,22,-3,-19,-27,-2,-23,22,22,-22,-24,22,-20,22,-21,]),'$end':([1,2,3,5,6,7,8,11,12,13,23,25,26,33,52,70,76,96,97,100,121,122,127,131,],[0,-1,-5,-6,-7,-8,-9,-16,-17,-18,-4,-55,-53,-54,-15,-10,-52,-19,-27,-23,-22,-24,-20,-21,]),'LLAVEDER':([4,5,6,7,8,11,12,13,24,26,52,70,76,89,90,91,92,93,96,97,98,99,100,116,117,121,122,126,127,130,131,],[25,-6,-7,-8,-9,-16,-17,-18,33,-53,-15,-10,-52,97,-56,-58,-3,97,-19,-27,-57,-2,-23,97,97,-22,-24,97,-20,97,-21,]),'PUNTOCOMA':([4,24,35,36,37,38,39,40,41,43,48,51,58,71,72,73,74,75,79,80,81,82,83,84,86,88,91,95,98,],[26,26,-45,52,-44,-46,-47,-48,-49,-51,67,70,76,-40,-41,-42,-43,-50,-34,-35,-36,-37,-38,-39,94,-29,26,-28,26,]),'ASIG':([10,27,50,68,102,],[28,34,69,87,106,]),'PARIZQ':([14,19,20,21,22,28,29,30,31,34,42,53,54,55,56,60,61,62,63,64,65,67,69,87,103,109,],[29,30,31,32,-25,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,109,42,]),'NUMERO':([28,29,30,31,34,42,53,54,55,56,60,61,62,63,64,65,67,69,87,109,118,119,],[38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,123,124,]),'DECIMAL':([28,29,30,31,34,42,53,54,55,56,60,61,62,63,64,65,67,69,87,109,],[39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,]),'TRUE':([28,29,30,31,34,42,53,54,55,56,60,61,62,63,64,65,67,69,87,109,],[40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,]),'FALSE':([28,29,30,31,34,42,53,54,55,56,60,61,62,63,64,65,67,69,87,109,],[41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,]),'CARACTER':([28,29,30,31,34,42,53,54,55,56,60,61,62,63,64,65,67,69,87,109,],[43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,]),'SUMA':([35,36,37,38,39,40,41,43,44,46,51,57,71,72,73,74,75,79,80,81,82,83,84,88,95,102,107,112,],[-45,53,-44,-46,-47,-48,-49,-51,53,53,53,53,-40,-41,-42,-43,-50,53,53,53,53,53,53,53,53,107,113,118,]),'RESTA':([35,36,37,38,39,40,41,43,44,46,51,57,71,72,73,74,75,79,80,81,82,83,84,88,95,102,108,112,],[-45,54,-44,-46,-47,-48,-49,-51,54,54,54,54,-40,-41,-42,-43,-50,54,54,54,54,54,54,54,54,108,114,119,]),'MULT':([35,36,37,38,39,40,41,43,44,46,51,57,71,72,73,74,75,79,80,81,82,83,84,88,95,],[-45,55,-44,-46,-47,-48,-49,-51,55,55,55,55,-40,-41,-42,-43,-50,55,55,55,55,55,55,55,55,]),'DIV':([35,36,37,38,39,40,41,43,44,46,51,57,71,72,73,74,75,79,80,81,82,83,84,88,95,],[-45,56,-44,-46,-47,-48,-49,-51,56,56,56,56,-40,-41,-42,-43,-50,56,56,56,56,56,56,56,56,]),'PARDER':([35,37,38,39,40,41,43,44,45,47,57,71,72,73,74,75,79,80,81,82,83,84,101,113,114,115,123,124,],[-45,-44,-46,-47,-48,-49,-51,58,59,66,75,-40,-41,-42,-43,-50,-34,-35,-36,-37,-38,-39,105,-32,-33,120,-30,-31,]),'IGUAL':([35,37,38,39,40,41,43,46,71,72,73,74,75,],[-45,-44,-46,-47,-48,-49,-51,60,-40,-41,-42,-43,-50,]),'DIFERENTE':([35,37,38,39,40,41,43,46,71,72,73,74,75,],[-45,-44,-46,-47,-48,-49,-51,61,-40,-41,-42,-43,-50,]),'MENOR':([35,37,38,39,40,41,43,46,71,72,73,74,75,],[-45,-44,-46,-47,-48,-49,-51,62,-40,-41,-42,-43,-50,]),'MAYOR':([35,37,38,39,40,41,43,46,71,72,73,74,75,],[-45,-44,-46,-47,-48,-49,-51,63,-40,-41,-42,-43,-50,]),'MENORIGUAL':([35,37,38,39,40,41,43,46,71,72,73,74,75,],[-45,-44,-46,-47,-48,-49,-51,64,-40,-41,-42,-43,-50,]),'MAYORIGUAL':([35,37,38,39,40,41,43,46,71,72,73,74,75,],[-45,-44,-46,-47,-48,-49,-51,65,-40,-41,-42,-43,-50,]),'LLAVEIZQ':([59,66,104,105,120,128,],[78,78,78,78,78,78,]),'SINO':([96,97,],[103,-27,]),'EOC':([96,97,127,],[104,-27,128,]),}
 
 _lr_action = {}
 for _k, _v in _lr_action_items.items():
@@ -17,7 +17,7 @@ for _k, _v in _lr_action_items.items():
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'programa':([0,],[1,]),'declaraciones':([0,71,78,97,98,112,116,],[2,82,83,103,104,113,117,]),'declaracion':([0,2,71,78,82,83,97,98,103,104,112,113,116,117,],[3,21,3,3,21,21,3,3,21,21,3,21,3,21,]),'declaracion_variable':([0,2,71,78,82,83,97,98,103,104,112,113,116,117,],[4,4,4,4,4,4,4,4,4,4,4,4,4,4,]),'asignacion':([0,2,71,78,82,83,97,98,103,104,112,113,116,117,],[5,5,5,5,5,5,5,5,5,5,5,5,5,5,]),'estructura_control':([0,2,71,78,82,83,97,98,103,104,112,113,116,117,],[6,6,6,6,6,6,6,6,6,6,6,6,6,6,]),'imprimir':([0,2,71,78,82,83,97,98,103,104,112,113,116,117,],[7,7,7,7,7,7,7,7,7,7,7,7,7,7,]),'tipo':([0,2,27,71,78,82,83,97,98,103,104,112,113,116,117,],[8,8,43,8,8,8,8,8,8,8,8,8,8,8,8,]),'estructura_si':([0,2,71,78,82,83,97,98,103,104,112,113,116,117,],[10,10,10,10,10,10,10,10,10,10,10,10,10,10,]),'estructura_mientras':([0,2,71,78,82,83,97,98,103,104,112,113,116,117,],[11,11,11,11,11,11,11,11,11,11,11,11,11,11,]),'estructura_para':([0,2,71,78,82,83,97,98,103,104,112,113,116,117,],[12,12,12,12,12,12,12,12,12,12,12,12,12,12,]),'expresion':([23,24,25,26,28,37,54,55,56,57,58,59,61,63,80,96,],[30,38,40,40,45,51,72,73,74,75,76,77,40,81,85,40,]),'termino':([23,24,25,26,28,37,47,48,49,50,54,55,56,57,58,59,61,63,80,96,],[31,31,31,31,31,31,65,66,67,68,31,31,31,31,31,31,31,31,31,31,]),'condicion':([25,26,61,96,],[39,41,79,102,]),'inicializacion_para':([27,],[42,]),'incremento_para':([84,],[88,]),}
+_lr_goto_items = {'programa':([0,],[1,]),'sentencias':([0,],[2,]),'declaracion':([0,2,77,85,90,110,111,125,129,],[3,23,92,92,99,92,92,92,92,]),'declaracion_variable':([0,2,77,85,90,110,111,125,129,],[5,5,5,5,5,5,5,5,5,]),'asignacion':([0,2,77,85,90,110,111,125,129,],[6,6,6,6,6,6,6,6,6,]),'estructura_control':([0,2,77,85,90,110,111,125,129,],[7,7,7,7,7,7,7,7,7,]),'imprimir':([0,2,77,85,90,110,111,125,129,],[8,8,8,8,8,8,8,8,8,]),'tipo':([0,2,32,77,85,90,110,111,125,129,],[9,9,49,9,9,9,9,9,9,9,]),'estructura_si':([0,2,77,85,90,110,111,125,129,],[11,11,11,11,11,11,11,11,11,]),'estructura_mientras':([0,2,77,85,90,110,111,125,129,],[12,12,12,12,12,12,12,12,12,]),'estructura_para':([0,2,77,85,90,110,111,125,129,],[13,13,13,13,13,13,13,13,13,]),'inicio_para':([0,2,77,85,90,110,111,125,129,],[21,21,21,21,21,21,21,21,21,]),'expresion':([28,29,30,31,34,42,60,61,62,63,64,65,67,69,87,109,],[36,44,46,46,51,57,79,80,81,82,83,84,46,88,95,46,]),'termino':([28,29,30,31,34,42,53,54,55,56,60,61,62,63,64,65,67,69,87,109,],[37,37,37,37,37,37,71,72,73,74,37,37,37,37,37,37,37,37,37,37,]),'condicion':([30,31,67,109,],[45,47,86,115,]),'inicializacion_para':([32,],[48,]),'abrir_bloque':([59,66,104,105,120,128,],[77,85,110,111,125,129,]),'bloque':([77,85,110,111,125,129,],[89,93,116,117,126,130,]),'declaraciones':([77,85,110,111,125,129,],[90,90,90,90,90,90,]),'cerrar_bloque':([89,93,116,117,126,130,],[96,100,121,122,127,131,]),'incremento_para':([94,],[101,]),}
 
 _lr_goto = {}
 for _k, _v in _lr_goto_items.items():
@@ -27,51 +27,62 @@ for _k, _v in _lr_goto_items.items():
 del _lr_goto_items
 _lr_productions = [
   ("S' -> programa","S'",1,None,None,None),
-  ('programa -> declaraciones','programa',1,'p_programa','parser.py',30),
-  ('declaraciones -> declaraciones declaracion','declaraciones',2,'p_declaraciones','parser.py',34),
-  ('declaraciones -> declaracion','declaraciones',1,'p_declaraciones','parser.py',35),
-  ('declaracion -> declaracion_variable','declaracion',1,'p_declaracion','parser.py',50),
-  ('declaracion -> asignacion','declaracion',1,'p_declaracion','parser.py',51),
-  ('declaracion -> estructura_control','declaracion',1,'p_declaracion','parser.py',52),
-  ('declaracion -> imprimir','declaracion',1,'p_declaracion','parser.py',53),
-  ('declaracion_variable -> tipo IDENTIFICADOR ASIG expresion PUNTOCOMA','declaracion_variable',5,'p_declaracion_variable','parser.py',57),
-  ('tipo -> TIPO_ENTERO','tipo',1,'p_tipo','parser.py',62),
-  ('tipo -> TIPO_DECIMAL','tipo',1,'p_tipo','parser.py',63),
-  ('tipo -> TIPO_CARACTER','tipo',1,'p_tipo','parser.py',64),
-  ('tipo -> TIPO_BOOLEANO','tipo',1,'p_tipo','parser.py',65),
-  ('asignacion -> IDENTIFICADOR ASIG expresion PUNTOCOMA','asignacion',4,'p_asignacion','parser.py',69),
-  ('estructura_control -> estructura_si','estructura_control',1,'p_estructura_control','parser.py',75),
-  ('estructura_control -> estructura_mientras','estructura_control',1,'p_estructura_control','parser.py',76),
-  ('estructura_control -> estructura_para','estructura_control',1,'p_estructura_control','parser.py',77),
-  ('estructura_si -> SI PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER','estructura_si',7,'p_estructura_si','parser.py',85),
-  ('estructura_si -> SI PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER SINO PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER','estructura_si',14,'p_estructura_si','parser.py',86),
-  ('estructura_si -> SI PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER SINO PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER EOC LLAVEIZQ declaraciones LLAVEDER','estructura_si',18,'p_estructura_si','parser.py',87),
-  ('estructura_si -> SI PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER EOC LLAVEIZQ declaraciones LLAVEDER','estructura_si',11,'p_estructura_si','parser.py',88),
-  ('estructura_mientras -> MIENTRAS PARIZQ condicion PARDER LLAVEIZQ declaraciones LLAVEDER','estructura_mientras',7,'p_estructura_mientras','parser.py',111),
-  ('estructura_para -> PARA PARIZQ inicializacion_para PUNTOCOMA condicion PUNTOCOMA incremento_para PARDER LLAVEIZQ declaraciones LLAVEDER','estructura_para',11,'p_estructura_para','parser.py',115),
-  ('inicializacion_para -> tipo IDENTIFICADOR ASIG expresion','inicializacion_para',4,'p_inicializacion_para','parser.py',119),
-  ('inicializacion_para -> IDENTIFICADOR ASIG expresion','inicializacion_para',3,'p_inicializacion_para','parser.py',120),
-  ('incremento_para -> IDENTIFICADOR ASIG IDENTIFICADOR SUMA NUMERO','incremento_para',5,'p_incremento_para','parser.py',128),
-  ('incremento_para -> IDENTIFICADOR ASIG IDENTIFICADOR RESTA NUMERO','incremento_para',5,'p_incremento_para','parser.py',129),
-  ('incremento_para -> IDENTIFICADOR SUMA SUMA','incremento_para',3,'p_incremento_para','parser.py',130),
-  ('incremento_para -> IDENTIFICADOR RESTA RESTA','incremento_para',3,'p_incremento_para','parser.py',131),
-  ('condicion -> expresion IGUAL expresion','condicion',3,'p_condicion','parser.py',138),
-  ('condicion -> expresion DIFERENTE expresion','condicion',3,'p_condicion','parser.py',139),
-  ('condicion -> expresion MENOR expresion','condicion',3,'p_condicion','parser.py',140),
-  ('condicion -> expresion MAYOR expresion','condicion',3,'p_condicion','parser.py',141),
-  ('condicion -> expresion MENORIGUAL expresion','condicion',3,'p_condicion','parser.py',142),
-  ('condicion -> expresion MAYORIGUAL expresion','condicion',3,'p_condicion','parser.py',143),
-  ('expresion -> expresion SUMA termino','expresion',3,'p_expresion','parser.py',147),
-  ('expresion -> expresion RESTA termino','expresion',3,'p_expresion','parser.py',148),
-  ('expresion -> expresion MULT termino','expresion',3,'p_expresion','parser.py',149),
-  ('expresion -> expresion DIV termino','expresion',3,'p_expresion','parser.py',150),
-  ('expresion -> termino','expresion',1,'p_expresion','parser.py',151),
-  ('termino -> IDENTIFICADOR','termino',1,'p_termino','parser.py',158),
-  ('termino -> NUMERO','termino',1,'p_termino','parser.py',159),
-  ('termino -> DECIMAL','termino',1,'p_termino','parser.py',160),
-  ('termino -> CARACTER','termino',1,'p_termino','parser.py',161),
-  ('termino -> TRUE','termino',1,'p_termino','parser.py',162),
-  ('termino -> FALSE','termino',1,'p_termino','parser.py',163),
-  ('termino -> PARIZQ expresion PARDER','termino',3,'p_termino','parser.py',164),
-  ('imprimir -> PRINT PARIZQ expresion PARDER PUNTOCOMA','imprimir',5,'p_imprimir','parser.py',171),
+  ('programa -> sentencias','programa',1,'p_programa','parser.py',25),
+  ('declaraciones -> declaraciones declaracion','declaraciones',2,'p_declaraciones','parser.py',31),
+  ('declaraciones -> declaracion','declaraciones',1,'p_declaraciones','parser.py',32),
+  ('sentencias -> sentencias declaracion','sentencias',2,'p_declaraciones','parser.py',33),
+  ('sentencias -> declaracion','sentencias',1,'p_declaraciones','parser.py',34),
+  ('declaracion -> declaracion_variable','declaracion',1,'p_declaracion','parser.py',49),
+  ('declaracion -> asignacion','declaracion',1,'p_declaracion','parser.py',50),
+  ('declaracion -> estructura_control','declaracion',1,'p_declaracion','parser.py',51),
+  ('declaracion -> imprimir','declaracion',1,'p_declaracion','parser.py',52),
+  ('declaracion_variable -> tipo IDENTIFICADOR ASIG expresion PUNTOCOMA','declaracion_variable',5,'p_declaracion_variable','parser.py',56),
+  ('tipo -> TIPO_ENTERO','tipo',1,'p_tipo','parser.py',61),
+  ('tipo -> TIPO_DECIMAL','tipo',1,'p_tipo','parser.py',62),
+  ('tipo -> TIPO_CARACTER','tipo',1,'p_tipo','parser.py',63),
+  ('tipo -> TIPO_BOOLEANO','tipo',1,'p_tipo','parser.py',64),
+  ('asignacion -> IDENTIFICADOR ASIG expresion PUNTOCOMA','asignacion',4,'p_asignacion','parser.py',68),
+  ('estructura_control -> estructura_si','estructura_control',1,'p_estructura_control','parser.py',73),
+  ('estructura_control -> estructura_mientras','estructura_control',1,'p_estructura_control','parser.py',74),
+  ('estructura_control -> estructura_para','estructura_control',1,'p_estructura_control','parser.py',75),
+  ('estructura_si -> SI PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque','estructura_si',7,'p_estructura_si','parser.py',83),
+  ('estructura_si -> SI PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque SINO PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque','estructura_si',14,'p_estructura_si','parser.py',84),
+  ('estructura_si -> SI PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque SINO PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque EOC abrir_bloque bloque cerrar_bloque','estructura_si',18,'p_estructura_si','parser.py',85),
+  ('estructura_si -> SI PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque EOC abrir_bloque bloque cerrar_bloque','estructura_si',11,'p_estructura_si','parser.py',86),
+  ('estructura_mientras -> MIENTRAS PARIZQ condicion PARDER abrir_bloque bloque cerrar_bloque','estructura_mientras',7,'p_estructura_mientras','parser.py',109),
+  ('estructura_para -> inicio_para PARIZQ inicializacion_para PUNTOCOMA condicion PUNTOCOMA incremento_para PARDER abrir_bloque bloque cerrar_bloque','estructura_para',11,'p_estructura_para','parser.py',113),
+  ('inicio_para -> PARA','inicio_para',1,'p_inicio_para','parser.py',118),
+  ('abrir_bloque -> LLAVEIZQ','abrir_bloque',1,'p_abrir_bloque','parser.py',124),
+  ('cerrar_bloque -> LLAVEDER','cerrar_bloque',1,'p_cerrar_bloque','parser.py',128),
+  ('inicializacion_para -> tipo IDENTIFICADOR ASIG expresion','inicializacion_para',4,'p_inicializacion_para','parser.py',132),
+  ('inicializacion_para -> IDENTIFICADOR ASIG expresion','inicializacion_para',3,'p_inicializacion_para','parser.py',133),
+  ('incremento_para -> IDENTIFICADOR ASIG IDENTIFICADOR SUMA NUMERO','incremento_para',5,'p_incremento_para','parser.py',141),
+  ('incremento_para -> IDENTIFICADOR ASIG IDENTIFICADOR RESTA NUMERO','incremento_para',5,'p_incremento_para','parser.py',142),
+  ('incremento_para -> IDENTIFICADOR SUMA SUMA','incremento_para',3,'p_incremento_para','parser.py',143),
+  ('incremento_para -> IDENTIFICADOR RESTA RESTA','incremento_para',3,'p_incremento_para','parser.py',144),
+  ('condicion -> expresion IGUAL expresion','condicion',3,'p_condicion','parser.py',156),
+  ('condicion -> expresion DIFERENTE expresion','condicion',3,'p_condicion','parser.py',157),
+  ('condicion -> expresion MENOR expresion','condicion',3,'p_condicion','parser.py',158),
+  ('condicion -> expresion MAYOR expresion','condicion',3,'p_condicion','parser.py',159),
+  ('condicion -> expresion MENORIGUAL expresion','condicion',3,'p_condicion','parser.py',160),
+  ('condicion -> expresion MAYORIGUAL expresion','condicion',3,'p_condicion','parser.py',161),
+  ('expresion -> expresion SUMA termino','expresion',3,'p_expresion','parser.py',169),
+  ('expresion -> expresion RESTA termino','expresion',3,'p_expresion','parser.py',170),
+  ('expresion -> expresion MULT termino','expresion',3,'p_expresion','parser.py',171),
+  ('expresion -> expresion DIV termino','expresion',3,'p_expresion','parser.py',172),
+  ('expresion -> termino','expresion',1,'p_expresion','parser.py',173),
+  ('termino -> IDENTIFICADOR','termino',1,'p_termino','parser.py',185),
+  ('termino -> NUMERO','termino',1,'p_termino','parser.py',186),
+  ('termino -> DECIMAL','termino',1,'p_termino','parser.py',187),
+  ('termino -> TRUE','termino',1,'p_termino','parser.py',188),
+  ('termino -> FALSE','termino',1,'p_termino','parser.py',189),
+  ('termino -> PARIZQ expresion PARDER','termino',3,'p_termino','parser.py',190),
+  ('termino -> CARACTER','termino',1,'p_termino_caracter','parser.py',197),
+  ('imprimir -> PRINT PARIZQ expresion PARDER PUNTOCOMA','imprimir',5,'p_imprimir','parser.py',202),
+  ('declaracion -> error PUNTOCOMA','declaracion',2,'p_declaracion_error','parser.py',206),
+  ('sentencias -> sentencias error LLAVEDER','sentencias',3,'p_sentencias_error','parser.py',214),
+  ('sentencias -> error LLAVEDER','sentencias',2,'p_sentencias_error','parser.py',215),
+  ('bloque -> declaraciones','bloque',1,'p_bloque','parser.py',221),
+  ('bloque -> declaraciones error','bloque',2,'p_bloque_error','parser.py',225),
+  ('bloque -> error','bloque',1,'p_bloque_error','parser.py',226),
 ]
@@ -0,0 +1,218 @@
+"""
+Pasadas sobre las sentencias del AST.
+
+Cada fase que recorre el programa (análisis semántico, verificación de
+tipos, código intermedio) es una Pasada: solo dice qué hace en cada clase de
+sentencia. Recorrido baja por los bloques, abre y cierra los ámbitos de la
+tabla de símbolos y declara o busca el símbolo de cada declaración y
+asignación, igual para todas las fases.
+
+Los métodos de una Pasada se reconocen por su nombre:
+- visitar_<tipo>(nodo, simbolo): sentencia simple. simbolo es el símbolo
+  declarado (None si el nombre ya estaba visible) o asignado (None si no
+  está declarado); en las demás sentencias es None.
+- entrar_<tipo>(nodo), parte_<tipo>(nodo, indice) y salir_<tipo>(nodo):
+  sentencia compuesta, al empezar, antes de cada hijo de HIJOS y al
+  terminar.
+- nodo_desconocido(nodo): sentencia de un tipo para el que la pasada no
+  tiene métodos.
+
+La tabla tipo -> método de cada clase se arma una sola vez, al definir la
+clase, y cada Recorrido liga los métodos de sus pasadas la primera vez que
+ve cada tipo de sentencia: en cada nodo solo queda una búsqueda en un
+diccionario. Varias pasadas que comparten la tabla de símbolos pueden ir en
+un mismo Recorrido; en cada evento se llaman en orden, así que cada una ve
+las anotaciones que las anteriores ya dejaron sobre el mismo nodo.
+"""
+
+# Posición en la tupla de los hijos de cada sentencia compuesta, en el orden en que se recorren
+HIJOS = {
+    'si': (2,),
+    'si_sino': (2, 4),
+    'si_sino_eoc': (2, 4, 5),
+    'si_eoc': (2, 3),
+    'mientras': (2,),
+    # Inicialización, bloque e incremento
+    'para': (1, 4, 3),
+}
+
+# Sentencias con un ámbito propio además del de sus bloques
+CON_AMBITO = frozenset(('para',))
+
+# Prefijo de los métodos -> atributo de la clase con su tabla
+_EVENTOS = (('visitar_', '_visitas'), ('entrar_', '_entradas'),
+            ('parte_', '_partes'), ('salir_', '_salidas'))
+
+
+# Símbolo de cada sentencia simple: el que declara o el que asigna
+DECLARA, ASIGNA = 1, 2
+SIMBOLO = {'declaracion': DECLARA, 'asignacion': ASIGNA}
+
+# Marca de generador agotado en Recorrido.sentencia
+_FIN = object()
+
+
+class Pasada:
+    """Base de las fases que recorren las sentencias del programa"""
+    # tipo de sentencia -> función, una tabla por evento (ver __init_subclass__)
+    _visitas = _entradas = _partes = _salidas = {}
+    _recorrido = None
+    tabla_simbolos = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for prefijo, atributo in _EVENTOS:
+            setattr(cls, atributo, {nombre[len(prefijo):]: getattr(cls, nombre)
+                                    for nombre in dir(cls) if nombre.startswith(prefijo)})
+
+    @property
+    def recorrido(self):
+        """Recorrido con esta sola pasada, creado al primer uso"""
+        if self._recorrido is None:
+            self._recorrido = Recorrido([self], self.tabla_simbolos)
+        return self._recorrido
+
+    def nodo_desconocido(self, nodo):
+        """Sentencia de un tipo sin métodos en esta pasada; por defecto se ignora"""
+
+
+class Recorrido:
+    """
+    Recorre las sentencias una sola vez y llama a cada pasada en orden.
+
+    Args:
+        pasadas: Las pasadas, en el orden en que se llaman en cada evento
+        tabla_simbolos: La tabla de símbolos que comparten todas las pasadas
+    """
+    def __init__(self, pasadas, tabla_simbolos):
+        for pasada in pasadas:
+            if pasada.tabla_simbolos is not tabla_simbolos:
+                raise ValueError(f"{type(pasada).__name__} no usa la tabla de símbolos del recorrido")
+        self.pasadas = list(pasadas)
+        self.tabla_simbolos = tabla_simbolos
+        # tipo de sentencia -> métodos ya ligados de todas las pasadas (ver _preparar)
+        self._planes = {}
+
+    def _preparar(self, tipo):
+        hijos = HIJOS.get(tipo)
+        if hijos is None:
+            visitas = []
+            for pasada in self.pasadas:
+                funcion = pasada._visitas.get(tipo)
+                if funcion is not None:
+                    visitas.append(funcion.__get__(pasada))
+                else:
+                    visitas.append(lambda nodo, simbolo, desconocido=pasada.nodo_desconocido: desconocido(nodo))
+            plan = (None, SIMBOLO.get(tipo, 0), tuple(visitas), None, None)
+        else:
+            entradas, partes, salidas = (
+                tuple(getattr(pasada, atributo)[tipo].__get__(pasada)
+                      for pasada in self.pasadas if tipo in getattr(pasada, atributo))
+                for atributo in ('_entradas', '_partes', '_salidas'))
+            plan = (hijos, tipo in CON_AMBITO, entradas, partes, salidas)
+        self._planes[tipo] = plan
+        return plan
+
+    def recorrer(self, ast):
+        """Recorre un programa (lista de sentencias)"""
+        sentencia = self.sentencia
+        for nodo in ast:
+            sentencia(nodo)
+
+    def bloque(self, bloque):
+        tabla = self.tabla_simbolos
+        sentencia = self.sentencia
+        tabla.abrir_ambito()
+        for nodo in bloque:
+            sentencia(nodo)
+        tabla.cerrar_ambito()
+
+    def sentencia(self, nodo):
+        """Recorre una sentencia y todo lo que contiene, con una pila propia en vez de recursión"""
+        planes = self._planes
+        # Un generador de _compuesta por cada sentencia compuesta abierta
+        pila = []
+        while True:
+            # Las sentencias descartadas por la recuperación de errores son None
+            if nodo.__class__ is tuple:
+                plan = planes.get(nodo[0])
+                if plan is None:
+                    plan = self._preparar(nodo[0])
+                hijos, simbolo, metodos, _, _ = plan
+                if hijos is None:
+                    # Sentencia simple: metodos son las visitas
+                    if simbolo == DECLARA:
+                        simbolo = self.tabla_simbolos.declarar(nodo[2], nodo[1])
+                    elif simbolo:
+                        simbolo = self.tabla_simbolos.buscar(nodo[1])
+                    else:
+                        simbolo = None
+                    for visitar in metodos:
+                        visitar(nodo, simbolo)
+                else:
+                    pila.append(self._compuesta(nodo, plan))
+            # Siguiente sentencia pendiente; al agotarse un generador se cierra su sentencia
+            while pila:
+                nodo = next(pila[-1], _FIN)
+                if nodo is not _FIN:
+                    break
+                pila.pop()
+            else:
+                return
+
+    def _compuesta(self, nodo, plan):
+        """Eventos de una sentencia compuesta; produce las sentencias de sus hijos para que sentencia las recorra"""
+        hijos, con_ambito, entradas, partes, salidas = plan
+        tabla = self.tabla_simbolos
+        if con_ambito:
+            tabla.abrir_ambito()
+        for entrar in entradas:
+            entrar(nodo)
+        indice = 0
+        for posicion in hijos:
+            for parte in partes:
+                parte(nodo, indice)
+            indice += 1
+            hijo = nodo[posicion]
+            if hijo.__class__ is list:
+                tabla.abrir_ambito()
+                yield from hijo
+                tabla.cerrar_ambito()
+            else:
+                yield hijo
+        for salir in salidas:
+            salir(nodo)
+        if con_ambito:
+            tabla.cerrar_ambito()
+
+if __name__ == "__main__":
+    from parser import ParserSession
+    from simbolos import TablaSimbolos
+
+    class Contador(Pasada):
+        def __init__(self, tabla_simbolos):
+            self.tabla_simbolos = tabla_simbolos
+            self.declaradas = []
+
+        def visitar_declaracion(self, nodo, simbolo):
+            self.declaradas.append((nodo[2], self.tabla_simbolos.profundidad()))
+
+    class Eco(Pasada):
+        def __init__(self, tabla_simbolos):
+            self.tabla_simbolos = tabla_simbolos
+
+        def entrar_mientras(self, nodo):
+            print("entra a mientras")
+
+        def salir_mientras(self, nodo):
+            print("sale de mientras")
+
+    codigo = """entero x = 3;
+mientras (x > 0) { entero y = x; x = x - 1; }
+para (entero i = 0; i < 2; i = i + 1) { print(i); }
+"""
+    tabla = TablaSimbolos()
+    contador = Contador(tabla)
+    Recorrido([contador, Eco(tabla)], tabla).recorrer(ParserSession().parse(codigo))
+    print("declaraciones (nombre, ámbitos abiertos):", contador.declaradas)
+    print("métodos de Eco:", sorted(Eco._entradas), sorted(Eco._salidas))
@@ -0,0 +1,114 @@
+"""
+Plegado de constantes.
+
+Evalúa en tiempo de compilación las operaciones cuyos operandos son
+constantes, con una tabla de despacho por (operador, tipo izquierdo, tipo
+derecho) en lugar de armar texto y pasarlo a eval().
+
+Los resultados son los mismos que calcularía el programa generado (que
+ejecuta las operaciones en Python): entre enteros +, - y * dan entero, y la
+división y cualquier operación con un decimal dan decimal. Una operación que
+fallaría al ejecutarse (división entre cero, resultado infinito) o cuyos tipos
+no tienen aritmética (booleano, caracter) no se pliega y queda para el
+programa.
+"""
+import math
+import operator
+
+from recorridos import reducir_expresion
+from tipos import ENTERO, DECIMAL, BOOLEANO, BOOLEANOS, tipo_literal
+
+
+def _dividir(a, b):
+    return a / b if b != 0 else None
+
+
+def _operaciones():
+    tabla = {}
+    for operador, funcion in (('+', operator.add), ('-', operator.sub), ('*', operator.mul)):
+        tabla[operador, ENTERO, ENTERO] = (funcion, ENTERO)
+        tabla[operador, ENTERO, DECIMAL] = tabla[operador, DECIMAL, ENTERO] = \
+            tabla[operador, DECIMAL, DECIMAL] = (funcion, DECIMAL)
+    for izquierdo in (ENTERO, DECIMAL):
+        for derecho in (ENTERO, DECIMAL):
+            tabla['/', izquierdo, derecho] = (_dividir, DECIMAL)
+    return tabla
+
+
+# (operador, tipo, tipo) -> (función sobre los valores, tipo del resultado)
+OPERACIONES = _operaciones()
+
+
+class Constante:
+    """Valor conocido en tiempo de compilación, con su tipo del lenguaje"""
+    __slots__ = ('valor', 'tipo')
+
+    def __init__(self, valor, tipo):
+        self.valor = valor
+        self.tipo = tipo
+
+    def texto(self):
+        """El valor como operando del código intermedio"""
+        if self.tipo == BOOLEANO:
+            return 'true' if self.valor else 'false'
+        return str(self.valor)
+
+    def __eq__(self, otra):
+        return isinstance(otra, Constante) and self.tipo == otra.tipo and self.valor == otra.valor
+
+    def __hash__(self):
+        return hash((self.tipo, self.valor))
+
+    def __repr__(self):
+        return f"Constante({self.valor!r}, {self.tipo!r})"
+
+
+def constante(nodo):
+    """La Constante de un literal del AST, o None si el nodo no es un literal conocido"""
+    tipo = tipo_literal(nodo)
+    if tipo is None:
+        return None
+    return Constante(BOOLEANOS[nodo] if tipo == BOOLEANO else nodo, tipo)
+
+
+def plegar(operador, izquierdo, derecho):
+    """Constante resultado de operar dos constantes, o None si la operación no se pliega"""
+    entrada = OPERACIONES.get((operador, izquierdo.tipo, derecho.tipo))
+    if entrada is None:
+        return None
+    funcion, tipo = entrada
+    try:
+        valor = funcion(izquierdo.valor, derecho.valor)
+    except OverflowError:
+        return None
+    if valor is None or (tipo == DECIMAL and not math.isfinite(valor)):
+        return None
+    return Constante(valor, tipo)
+
+
+def _plegar_nodo(nodo, izquierdo, derecho):
+    if izquierdo is None or derecho is None:
+        return None
+    return plegar(nodo[1], izquierdo, derecho)
+
+
+def plegar_expresion(nodo):
+    """
+    Constante de una expresión completa, o None si no es constante.
+
+    Recorre el subárbol una sola vez (sin recursión, ver recorridos.py).
+    """
+    return reducir_expresion(nodo, constante, _plegar_nodo)
+
+
+if __name__ == "__main__":
+    ejemplos = (
+        ('operacion', '+', 1, ('operacion', '*', 2, 3)),
+        ('operacion', '/', 7, 2),
+        ('operacion', '*', ('operacion', '-', 10, 4), 2.5),
+        ('operacion', '/', 1, ('operacion', '-', 2, 2)),
+        ('operacion', '+', 'x', 1),
+        ('operacion', '+', 'true', 1),
+    )
+    for ejemplo in ejemplos:
+        print(ejemplo, '->', plegar_expresion(ejemplo))
@@ -0,0 +1,124 @@
+"""
+Recorridos del AST sin recursión.
+
+Las expresiones se guardan como tuplas ('operacion', operador, izq, der) y
+una suma de n términos generada por una máquina es un árbol de profundidad n.
+Recorrerlas con una llamada de Python por nivel agota la pila; estas
+funciones usan una pila explícita, así que la profundidad de una expresión
+solo está limitada por la memoria.
+"""
+
+# Marca en la pila de reducir_expresion: los operandos del nodo que está debajo ya se evaluaron
+_COMBINAR = object()
+
+
+def es_operacion(nodo):
+    return type(nodo) is tuple and nodo[0] == 'operacion'
+
+
+def reducir_expresion(nodo, hoja, operacion, resuelto=None):
+    """
+    Evalúa una expresión de abajo hacia arriba (postorden).
+
+    Args:
+        nodo: Expresión a evaluar
+        hoja: hoja(valor) da el resultado de un literal, un identificador o
+            cualquier nodo que no sea una operación
+        operacion: operacion(nodo, izquierdo, derecho) da el resultado de una
+            operación a partir de los resultados de sus operandos
+        resuelto: resuelto(nodo) da el resultado ya conocido de una operación
+            (por ejemplo, plegada por el análisis semántico) o None; los
+            operandos de una operación resuelta no se recorren
+
+    Los operandos se evalúan de izquierda a derecha, en el mismo orden que un
+    recorrido recursivo, así que los efectos de hoja y operacion (temporales,
+    código emitido) no cambian.
+    """
+    resultados = []
+    pila = [nodo]
+    while pila:
+        n = pila.pop()
+        if n is _COMBINAR:
+            n = pila.pop()
+            derecho = resultados.pop()
+            resultados[-1] = operacion(n, resultados[-1], derecho)
+        elif type(n) is tuple and n[0] == 'operacion':
+            if resuelto is not None:
+                resultado = resuelto(n)
+                if resultado is not None:
+                    resultados.append(resultado)
+                    continue
+            pila += (n, _COMBINAR, n[3], n[2])
+        else:
+            resultados.append(hoja(n))
+    return resultados[0]
+
+
+def en_orden(nodo, hoja):
+    """
+    Recorre una expresión en orden: genera hoja(operando) para cada operando
+    y el operador de cada operación entre los de sus dos lados.
+    """
+    pila = []
+    while True:
+        while type(nodo) is tuple and nodo[0] == 'operacion':
+            pila.append(nodo)
+            nodo = nodo[2]
+        yield hoja(nodo)
+        if not pila:
+            return
+        nodo = pila.pop()
+        yield nodo[1]
+        nodo = nodo[3]
+
+
+class _Texto:
+    """Texto fijo que repr_ast apila entre los nodos (separadores y cierres)"""
+    __slots__ = ('texto',)
+
+    def __init__(self, texto):
+        self.texto = texto
+
+
+_SEPARADOR = _Texto(', ')
+_CIERRES = {'(': _Texto(')'), '[': _Texto(']')}
+_CIERRE_UNITARIO = _Texto(',)')
+
+
+def repr_ast(nodo):
+    """Igual que repr(nodo) para tuplas y listas anidadas, sin límite de profundidad"""
+    partes = []
+    pila = [nodo]
+    while pila:
+        n = pila.pop()
+        tipo = type(n)
+        if tipo is _Texto:
+            partes.append(n.texto)
+            continue
+        if tipo is tuple:
+            abre = '('
+        elif tipo is list:
+            abre = '['
+        else:
+            partes.append(repr(n))
+            continue
+        partes.append(abre)
+        pila.append(_CIERRE_UNITARIO if tipo is tuple and len(n) == 1 else _CIERRES[abre])
+        for i in range(len(n) - 1, 0, -1):
+            pila.append(n[i])
+            pila.append(_SEPARADOR)
+        if n:
+            pila.append(n[0])
+    return ''.join(partes)
+
+
+if __name__ == "__main__":
+    # La prueba con un millón de términos está en Pruebas_Expresion_Profunda.py
+    expresion = 1
+    for i in range(2, 11):
+        expresion = ('operacion', '+', expresion, i)
+    print("suma:", reducir_expresion(expresion, lambda valor: valor, lambda nodo, a, b: a + b))
+    print("en orden:", ' '.join(map(str, en_orden(expresion, str))))
+
+    pequena = [('imprimir', ('operacion', '*', ('operacion', '+', 'x', 2.5), ('operacion', '-', 3, True)))]
+    print("repr_ast igual a repr:", repr_ast(pequena) == repr(pequena))
@@ -1,278 +1,161 @@
-class AnalizadorSemantico:
-    def __init__(self):
-        self.tabla_simbolos = {}
-        self.temp_counter = 0
-        self.label_counter = 0
-        self.codigo_intermedio = []
-        self.errores = []
-        self.constantes = {}
+from simbolos import TablaSimbolos
+from pasadas import Pasada
+from recorridos import reducir_expresion
+from plegado import constante, plegar
+from diagnosticos import Diagnosticos, MAXIMO_ERRORES
 
-    def nuevo_temporal(self):
-        """Genera un nuevo nombre de variable temporal"""
-        temp = f"t{self.temp_counter}"
-        self.temp_counter += 1
-        return temp
+class AnalizadorSemantico(Pasada):
+    """
+    Verifica declaraciones y asignaciones y anota el AST.
+    
+    No genera código: deja en tablas indexadas por id(nodo) el símbolo de
+    cada declaración y asignación y el valor de cada operación constante, y
+    GeneradorCodigoIntermedio las lee al bajar el AST a código intermedio.
+    Es una Pasada (ver pasadas.py): puede recorrer el AST junto con las
+    fases que leen sus anotaciones.
+    """
+    def __init__(self, nombres=None, maximo_errores=MAXIMO_ERRORES, tabla_simbolos=None):
+        # La tabla de símbolos de la compilación (ver simbolos.py), si se recibe
+        self.tabla_simbolos = tabla_simbolos if tabla_simbolos is not None else TablaSimbolos(nombres)
+        # Al llegar a maximo_errores el análisis se detiene con DemasiadosErrores
+        self.maximo_errores = maximo_errores
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Olvida los errores y las anotaciones de un análisis anterior"""
+        self.errores = Diagnosticos(self.maximo_errores)
+        # id(nodo) -> símbolo de cada declaración y asignación
+        self.simbolos = {}
+        # id(nodo) -> Constante de cada operación plegada (ver plegado.py)
+        self.constantes = {}
+        # Mantiene vivos los nodos anotados para que su id no se reutilice
+        self._nodos = []
 
-    def nueva_etiqueta(self):
-        """Genera una nueva etiqueta"""
-        label = f"L{self.label_counter}"
-        self.label_counter += 1
-        return label
+    def simbolo(self, nodo):
+        """Símbolo de la tabla al que se refiere una declaración o asignación"""
+        return self.simbolos.get(id(nodo))
 
-    def agregar_codigo(self, codigo):
-        """Agrega una línea de código intermedio"""
-        self.codigo_intermedio.append(codigo)
-
-    def optimizar_constantes(self, valor):
-        """Optimiza expresiones constantes"""
-        if isinstance(valor, (int, float)):
-            return str(valor)
-        if isinstance(valor, str) and valor.isdigit():
-            return valor
-        if str(valor) in self.constantes:
-            return self.constantes[str(valor)]
-        return None
+    def valor_constante(self, nodo):
+        """Constante de un literal o de una operación plegada, o None"""
+        if nodo.__class__ is tuple:
+            return self.constantes.get(id(nodo))
+        return constante(nodo)
 
     def analizar_nodo(self, nodo):
-        """Analiza un nodo del AST"""
+        """Analiza un nodo del AST; de una expresión devuelve su Constante, o None si no es constante"""
         if not isinstance(nodo, tuple):
             # Si es un valor literal o identificador
-            if isinstance(nodo, (int, float)):
-                return str(nodo)
-            elif isinstance(nodo, str):
-                if nodo in self.tabla_simbolos:
-                    return self.tabla_simbolos[nodo].get('valor', nodo)
-            return nodo
+            return constante(nodo)
 
         tipo_nodo = nodo[0]
-        if tipo_nodo == 'declaracion':
-            return self.procesar_declaracion(nodo)
-        elif tipo_nodo == 'operacion':
+        if tipo_nodo == 'operacion':
             return self.procesar_operacion(nodo)
-        elif tipo_nodo == 'asignacion':
-            return self.procesar_asignacion(nodo)
-        elif tipo_nodo == 'si':
-            return self.procesar_si(nodo)
-        elif tipo_nodo == 'si_sino':
-            return self.procesar_si_sino(nodo)
-        elif tipo_nodo == 'si_sino_eoc':
-            return self.procesar_si_sino_eoc(nodo)
-        elif tipo_nodo == 'si_eoc':
-            return self.procesar_si_eoc(nodo)
-        elif tipo_nodo == 'mientras':
-            return self.procesar_mientras(nodo)
-        elif tipo_nodo == 'para':
-            return self.procesar_para(nodo)
-        elif tipo_nodo == 'imprimir':
-            return self.procesar_imprimir(nodo)
         elif tipo_nodo == 'condicion':
             return self.procesar_condicion(nodo)
+        # Las sentencias las recorre Recorrido, que también maneja ámbitos y símbolos
+        self.recorrido.sentencia(nodo)
         return None
 
-    def procesar_declaracion(self, nodo):
-        """Procesa una declaración de variable"""
+    def analizar(self, ast):
+        """Analiza un programa completo (lista de sentencias)"""
+        self.recorrido.recorrer(ast)
+
+    def _anotar(self, tabla, nodo, valor):
+        tabla[id(nodo)] = valor
+        self._nodos.append(nodo)
+
+    def _registrar_valor(self, simbolo, valor):
+        """Guarda en la tabla de símbolos el valor asignado, si se conoce al compilar"""
+        resultado = self.analizar_nodo(valor)
+        self.tabla_simbolos.valores[simbolo] = resultado.texto() if resultado is not None else None
+
+    def visitar_declaracion(self, nodo, simbolo):
+        """Procesa una declaración de variable (simbolo es None si el nombre ya estaba visible)"""
         _, tipo, identificador, *valor = nodo
         
-        # Verificar si la variable ya existe
-        if identificador in self.tabla_simbolos:
+        if simbolo is None:
             self.errores.append(f"Error: Variable '{identificador}' ya declarada")
-            return None
-        
-        # Registrar la variable en la tabla de símbolos
-        self.tabla_simbolos[identificador] = {
-            'tipo': tipo,
-            'valor': None,
-            'constante': False
-        }
+            return
+        self._anotar(self.simbolos, nodo, simbolo)
         
         # Procesar valor inicial si existe
         if valor and valor[0] is not None:
-            valor_optimizado = self.optimizar_constantes(valor[0])
-            if valor_optimizado:
-                self.agregar_codigo(f"{identificador} = {valor_optimizado}")
-                self.tabla_simbolos[identificador]['valor'] = valor_optimizado
-            else:
-                valor_temp = self.analizar_nodo(valor[0])
-                if valor_temp:
-                    self.agregar_codigo(f"{identificador} = {valor_temp}")
-                    self.tabla_simbolos[identificador]['valor'] = valor_temp
-        
-        return identificador
+            self._registrar_valor(simbolo, valor[0])
 
-    def procesar_asignacion(self, nodo):
-        """Procesa una asignación"""
+    def visitar_asignacion(self, nodo, simbolo):
+        """Procesa una asignación (simbolo es None si la variable no está declarada)"""
         _, identificador, valor = nodo
         
-        if identificador not in self.tabla_simbolos:
+        if simbolo is None:
             self.errores.append(f"Error: Variable '{identificador}' no declarada")
-            return None
+            return
         
-        if self.tabla_simbolos[identificador]['constante']:
+        if self.tabla_simbolos.constantes[simbolo]:
             self.errores.append(f"Error: No se puede modificar la constante '{identificador}'")
-            return None
-        
-        valor_optimizado = self.optimizar_constantes(valor)
-        if valor_optimizado:
-            self.agregar_codigo(f"{identificador} = {valor_optimizado}")
-            self.tabla_simbolos[identificador]['valor'] = valor_optimizado
-        else:
-            valor_temp = self.analizar_nodo(valor)
-            if valor_temp:
-                self.agregar_codigo(f"{identificador} = {valor_temp}")
-                self.tabla_simbolos[identificador]['valor'] = valor_temp
+            return
         
-        return identificador
+        self._anotar(self.simbolos, nodo, simbolo)
+        self._registrar_valor(simbolo, valor)
 
     def procesar_operacion(self, nodo):
-        """Procesa una operación aritmética"""
-        _, operador, op1, op2 = nodo
-        
-        val1 = self.optimizar_constantes(op1)
-        val2 = self.optimizar_constantes(op2)
-        
-        if val1 and val2:
-            try:
-                resultado = eval(f"{val1} {operador} {val2}")
-                self.constantes[str(resultado)] = str(resultado)
-                return str(resultado)
-            except:
-                pass
+        """Pliega la operación y anota cada subárbol constante (con una pila explícita, ver recorridos.py)"""
+        return reducir_expresion(nodo, constante, self._plegar_operacion)
 
-        temp1 = val1 if val1 else self.analizar_nodo(op1)
-        temp2 = val2 if val2 else self.analizar_nodo(op2)
-        
-        if temp1 and temp2:
-            temp = self.nuevo_temporal()
-            self.agregar_codigo(f"{temp} = {temp1} {operador} {temp2}")
-            return temp
-        return None
+    def _plegar_operacion(self, nodo, izquierdo, derecho):
+        if izquierdo is None or derecho is None:
+            return None
+        resultado = plegar(nodo[1], izquierdo, derecho)
+        if resultado is not None:
+            self._anotar(self.constantes, nodo, resultado)
+        return resultado
 
     def procesar_condicion(self, nodo):
-        """Procesa una condición"""
+        """Procesa una condición (pliega las operaciones de cada lado)"""
         _, operador, op1, op2 = nodo
-        temp1 = self.analizar_nodo(op1)
-        temp2 = self.analizar_nodo(op2)
-        
-        if temp1 and temp2:
-            return f"{temp1} {operador} {temp2}"
+        self.analizar_nodo(op1)
+        self.analizar_nodo(op2)
         return None
 
-    def procesar_si(self, nodo):
-        """Procesa una estructura if simple"""
-        _, condicion, bloque = nodo
-        
-        etiq_verdadera = self.nueva_etiqueta()
-        etiq_fin = self.nueva_etiqueta()
-        
-        cond_temp = self.procesar_condicion(condicion)
-        self.agregar_codigo(f"if {cond_temp} goto {etiq_verdadera}")
-        self.agregar_codigo(f"goto {etiq_fin}")
-        
-        self.agregar_codigo(f"{etiq_verdadera}:")
-        for inst in bloque:
-            self.analizar_nodo(inst)
-        
-        self.agregar_codigo(f"{etiq_fin}:")
+    def entrar_si(self, nodo):
+        """Procesa las condiciones de un si con sus sino y eoc (los bloques los recorre Recorrido)"""
+        for parte in nodo[1:]:
+            if not isinstance(parte, list):
+                self.procesar_condicion(parte)
 
-    def procesar_si_sino(self, nodo):
-        """Procesa una estructura if-else"""
-        _, condicion, bloque_verdadero, condicion2, bloque_falso = nodo
-        
-        etiq_verdadera = self.nueva_etiqueta()
-        etiq_falsa = self.nueva_etiqueta()
-        etiq_fin = self.nueva_etiqueta()
-        
-        cond_temp = self.procesar_condicion(condicion)
-        self.agregar_codigo(f"if {cond_temp} goto {etiq_verdadera}")
-        
-        cond_temp2 = self.procesar_condicion(condicion2)
-        self.agregar_codigo(f"if {cond_temp2} goto {etiq_falsa}")
-        self.agregar_codigo(f"goto {etiq_fin}")
-        
-        self.agregar_codigo(f"{etiq_verdadera}:")
-        for inst in bloque_verdadero:
-            self.analizar_nodo(inst)
-        self.agregar_codigo(f"goto {etiq_fin}")
-        
-        self.agregar_codigo(f"{etiq_falsa}:")
-        for inst in bloque_falso:
-            self.analizar_nodo(inst)
-        
-        self.agregar_codigo(f"{etiq_fin}:")
+    entrar_si_sino = entrar_si_sino_eoc = entrar_si_eoc = entrar_si
 
-    def procesar_mientras(self, nodo):
-        """Procesa una estructura while"""
-        _, condicion, bloque = nodo
-        
-        etiq_inicio = self.nueva_etiqueta()
-        etiq_cuerpo = self.nueva_etiqueta()
-        etiq_fin = self.nueva_etiqueta()
-        
-        self.agregar_codigo(f"{etiq_inicio}:")
-        cond_temp = self.procesar_condicion(condicion)
-        self.agregar_codigo(f"if {cond_temp} goto {etiq_cuerpo}")
-        self.agregar_codigo(f"goto {etiq_fin}")
-        
-        self.agregar_codigo(f"{etiq_cuerpo}:")
-        for inst in bloque:
-            self.analizar_nodo(inst)
-        self.agregar_codigo(f"goto {etiq_inicio}")
-        
-        self.agregar_codigo(f"{etiq_fin}:")
+    def entrar_mientras(self, nodo):
+        """Procesa la condición de una estructura while"""
+        self.procesar_condicion(nodo[1])
 
-    def procesar_para(self, nodo):
-        """Procesa una estructura for"""
-        _, inicializacion, condicion, incremento, bloque = nodo
-        
-        # Procesar inicialización
-        self.analizar_nodo(inicializacion)
-        
-        etiq_inicio = self.nueva_etiqueta()
-        etiq_cuerpo = self.nueva_etiqueta()
-        etiq_fin = self.nueva_etiqueta()
-        
-        self.agregar_codigo(f"{etiq_inicio}:")
-        cond_temp = self.procesar_condicion(condicion)
-        self.agregar_codigo(f"if {cond_temp} goto {etiq_cuerpo}")
-        self.agregar_codigo(f"goto {etiq_fin}")
-        
-        self.agregar_codigo(f"{etiq_cuerpo}:")
-        for inst in bloque:
-            self.analizar_nodo(inst)
-        self.analizar_nodo(incremento)
-        self.agregar_codigo(f"goto {etiq_inicio}")
-        
-        self.agregar_codigo(f"{etiq_fin}:")
+    def parte_para(self, nodo, indice):
+        """Procesa la condición de un for, ya declarada la variable de la inicialización"""
+        if indice == 1:
+            self.procesar_condicion(nodo[2])
 
-    def procesar_imprimir(self, nodo):
+    def visitar_imprimir(self, nodo, simbolo):
         """Procesa una instrucción de impresión"""
-        _, expresion = nodo
-        temp = self.analizar_nodo(expresion)
-        if temp:
-            self.agregar_codigo(f"print {temp}")
+        self.analizar_nodo(nodo[1])
 
 # Ejemplo de uso
 if __name__ == "__main__":
+    from parser import ParserSession
+    
     # Código de prueba
     codigo_prueba = """
     entero x = 5;
-    entero y = 3;
-    entero z = x + y;
+    entero y = 3 * 2 + 1;
+    entero z = x + y * (4 - 2);
     print(z);
     """
     
     analizador = AnalizadorSemantico()
-    # Asumiendo que tienes el parser configurado
-    # ast = parser.parse(codigo_prueba)
-    # for nodo in ast:
-    #     analizador.analizar_nodo(nodo)
+    analizador.analizar(ParserSession().parse(codigo_prueba))
     
-    # Imprimir código intermedio
-    print("\nCódigo intermedio generado:")
-    for linea in analizador.codigo_intermedio:
-        print(linea)
+    print("Errores:", list(analizador.errores))
+    print(f"{len(analizador.simbolos)} sentencias con su símbolo, {len(analizador.constantes)} operaciones plegadas")
     
     # Imprimir tabla de símbolos
     print("\nTabla de símbolos:")
     for var, info in analizador.tabla_simbolos.items():
-        print(f"{var}: {info}")
\ No newline at end of file
+        print(f"{var}: {info}")
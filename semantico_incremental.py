@@ -0,0 +1,367 @@
+"""
+Análisis semántico incremental por sentencia de nivel superior.
+
+En un editor el programa cambia poco de una edición a la siguiente, y
+ParserIncremental devuelve las sentencias que la edición no tocó como los
+mismos objetos. AnalizadorIncremental guarda, por cada sentencia de nivel
+superior, el resultado de analizarla con AnalizadorSemantico: sus errores,
+sus efectos sobre los símbolos globales (la variable que declara y los
+valores que asigna) y las operaciones que pliega.
+
+El resultado de una sentencia depende solo de:
+- su contenido, resumido en una huella (blake2b) del AST normalizado que
+  distingue el literal 'a' del identificador a y los enteros de los decimales;
+- los nombres que declara, asigna o lee y, para cada uno, la declaración
+  global visible antes de ella: la primera sentencia anterior que lo declara
+  en el nivel superior (no hay ocultamiento, ver simbolos.py).
+
+Esas dos cosas forman la clave del resultado. Tras una edición solo se
+analizan las sentencias nuevas y las posteriores que usan un nombre cuya
+declaración global visible cambió; las demás conservan su resultado, y las
+que vuelven a tener una clave conocida (por ejemplo, al deshacer una
+edición) lo toman de los resultados guardados sin analizarse.
+
+Las posiciones de las sentencias siguen el esquema de lexer_incremental: las
+anteriores al punto de corte son absolutas y las posteriores relativas al
+final, así que una edición no obliga a renumerar el resto del programa. Lo
+único que recorre todo el programa es la comparación de identidades que
+encuentra el tramo editado, que se hace en C.
+"""
+import hashlib
+import itertools
+import operator
+
+from pasadas import HIJOS
+from semantic import AnalizadorSemantico
+from simbolos import GLOBAL
+from tipos import BOOLEANOS, Caracter
+
+# Valor de un símbolo global que la sentencia analizada todavía no asignó
+_SIN_VALOR = object()
+
+# Marca de cada clase de hoja en la huella: el literal 'a' no es el identificador a
+_MARCAS = {int: 'i', float: 'f', Caracter: 'c', str: 's', bool: 'b', type(None): 'n'}
+
+# Posiciones de cada sentencia o expresión en las que puede haber un nombre de variable
+_NOMBRES = {'declaracion': (2, 3), 'asignacion': (1, 2), 'operacion': (2, 3), 'condicion': (2, 3),
+            'imprimir': (1,)}
+_NOMBRES.update((tipo, range(1, 6)) for tipo in HIJOS)
+
+
+def resumen(nodo):
+    """
+    (huella, nombres) de una sentencia: la huella de su contenido y los
+    nombres de variable que declara, asigna o lee en cualquier bloque, ordenados.
+
+    Un solo recorrido sin recursión (ver recorridos.py). Cada nodo se escribe
+    con su cantidad de hijos delante, así que la serialización no es ambigua.
+    """
+    partes = []
+    agregar = partes.append
+    nombres = set()
+    pila = [nodo]
+    while pila:
+        n = pila.pop()
+        clase = n.__class__
+        if clase is tuple:
+            agregar(f"({len(n)}")
+            pila.extend(n)
+            for k in _NOMBRES.get(n[0], ()):
+                if k < len(n) and n[k].__class__ is str and n[k] not in BOOLEANOS:
+                    nombres.add(n[k])
+        elif clase is list:
+            agregar(f"[{len(n)}")
+            pila.extend(n)
+        else:
+            agregar(_MARCAS.get(clase, '?') + str(n))
+    huella = hashlib.blake2b("\x00".join(partes).encode(), digest_size=16).digest()
+    return huella, tuple(sorted(nombres))
+
+
+def _operaciones(nodo):
+    """Las operaciones de una sentencia en preorden (el orden con el que se guardan sus constantes)"""
+    pila = [nodo]
+    while pila:
+        n = pila.pop()
+        clase = n.__class__
+        if clase is list:
+            pila.extend(reversed(n))
+        elif clase is tuple:
+            if n[0] == 'operacion':
+                yield n
+            pila.extend(reversed(n[1:]))
+
+
+class _Resultado:
+    """Lo que produce analizar una sentencia con un entorno dado"""
+    __slots__ = ('errores', 'declaracion', 'valores', 'constantes')
+
+    def __init__(self, errores, declaracion, valores, constantes):
+        self.errores = errores
+        # (nombre, tipo, valor) del símbolo global que declara, o None
+        self.declaracion = declaracion
+        # (nombre, valor) asignados a símbolos globales declarados antes
+        self.valores = valores
+        # (posición en _operaciones, Constante) de cada operación plegada
+        self.constantes = constantes
+
+
+class _Sentencia:
+    """Una sentencia de nivel superior con su huella y su último resultado"""
+    __slots__ = ('nodo', 'huella', 'nombres', 'declara', 'indice', 'entorno', 'resultado')
+
+    def __init__(self, nodo):
+        self.nodo = nodo
+        self.huella, self.nombres = resumen(nodo)
+        self.declara = nodo[2] if nodo.__class__ is tuple and nodo[0] == 'declaracion' else None
+        self.indice = 0
+        # Tipo de la declaración global visible de cada nombre (None si no hay)
+        self.entorno = None
+        self.resultado = None
+
+
+class AnalizadorIncremental:
+    """
+    Mantiene el análisis semántico de un programa a través de sucesivas
+    versiones de su AST.
+
+    Args:
+        nombres: Tabla de nombres de la compilación
+    """
+    def __init__(self, nombres=None):
+        # Analiza cada sentencia aislada, sin tope de errores
+        self.analizador = AnalizadorSemantico(nombres, maximo_errores=None)
+        self.sentencias = []
+        self.nodos = []
+        # Las sentencias [0, corte) guardan su posición y las [corte, n) la relativa al final
+        self.corte = 0
+        # nombre -> sentencias que lo declaran en el nivel superior / que lo usan
+        self._declaran = {}
+        self._usan = {}
+        # (huella, entorno) -> _Resultado
+        self._resultados = {}
+        # Sentencias analizadas y resultados reutilizados en la última actualización
+        self.analizadas = 0
+        self.reutilizadas = 0
+
+    def __len__(self):
+        return len(self.sentencias)
+
+    def posicion(self, sentencia):
+        indice = sentencia.indice
+        return indice if indice >= 0 else indice + len(self.sentencias)
+
+    def _mover_corte(self, destino):
+        sentencias = self.sentencias
+        if destino > self.corte:
+            for k in range(self.corte, destino):
+                sentencias[k].indice = k
+        else:
+            n = len(sentencias)
+            for k in range(destino, self.corte):
+                sentencias[k].indice = k - n
+        self.corte = destino
+
+    def actualizar(self, ast):
+        """
+        Analiza una nueva versión del programa (lista de sentencias).
+
+        Las sentencias que siguen siendo los mismos objetos al principio y al
+        final del programa no se vuelven a mirar; las del medio son las nuevas.
+
+        Returns:
+            int: Cantidad de sentencias analizadas
+        """
+        self.analizadas = self.reutilizadas = 0
+        anteriores = self.nodos
+        comunes = min(len(anteriores), len(ast))
+        a = _iguales(anteriores, ast, comunes)
+        sufijo = _iguales(reversed(anteriores), reversed(ast), comunes - a)
+        b_anterior, b_nuevo = len(anteriores) - sufijo, len(ast) - sufijo
+        if a == b_anterior == b_nuevo:
+            return 0
+
+        quitadas = self.sentencias[a:b_anterior]
+        nuevas = [_Sentencia(nodo) for nodo in ast[a:b_nuevo]]
+        declarados = {s.declara for s in quitadas} | {s.declara for s in nuevas}
+        declarados.discard(None)
+        # Declaración que veía la primera sentencia posterior al tramo antes de la edición
+        antes = {nombre: self._declarada(nombre, b_anterior) for nombre in declarados}
+
+        self._mover_corte(a)
+        for sentencia in quitadas:
+            self._olvidar(sentencia)
+        self.sentencias[a:b_anterior] = nuevas
+        self.nodos[a:b_anterior] = ast[a:b_nuevo]
+        for k, sentencia in enumerate(nuevas, a):
+            sentencia.indice = k
+            self._registrar(sentencia)
+        self.corte = b_nuevo
+
+        for sentencia in nuevas:
+            self._analizar(sentencia)
+        # Las posteriores solo dependen de la edición si cambió la declaración global que ven
+        dependientes = set()
+        for nombre in declarados:
+            if self._declarada(nombre, b_nuevo) != antes[nombre]:
+                dependientes.update(self._usan.get(nombre, ()))
+        posteriores = [s for s in dependientes if self.posicion(s) >= b_nuevo]
+        for sentencia in sorted(posteriores, key=self.posicion):
+            self._analizar(sentencia)
+
+        if len(self._resultados) > 2 * len(self.sentencias) + 1000:
+            self._resultados = {(s.huella, s.entorno): s.resultado for s in self.sentencias}
+        return self.analizadas
+
+    def _registrar(self, sentencia):
+        for nombre in sentencia.nombres:
+            self._usan.setdefault(nombre, set()).add(sentencia)
+        if sentencia.declara is not None:
+            self._declaran.setdefault(sentencia.declara, set()).add(sentencia)
+
+    def _olvidar(self, sentencia):
+        for nombre in sentencia.nombres:
+            self._usan[nombre].discard(sentencia)
+        if sentencia.declara is not None:
+            self._declaran[sentencia.declara].discard(sentencia)
+
+    def _declarada(self, nombre, posicion):
+        """Tipo de la primera declaración global del nombre antes de la posición, o None"""
+        primera = tipo = None
+        for sentencia in self._declaran.get(nombre, ()):
+            p = self.posicion(sentencia)
+            if p < posicion and (primera is None or p < primera):
+                primera, tipo = p, sentencia.nodo[1]
+        return tipo
+
+    def _analizar(self, sentencia):
+        posicion = self.posicion(sentencia)
+        entorno = tuple(self._declarada(nombre, posicion) for nombre in sentencia.nombres)
+        if sentencia.resultado is not None and entorno == sentencia.entorno:
+            return
+        sentencia.entorno = entorno
+        clave = (sentencia.huella, entorno)
+        resultado = self._resultados.get(clave)
+        if resultado is None:
+            resultado = self._resultados[clave] = self._analizar_nodo(sentencia.nodo, sentencia.nombres, entorno)
+            self.analizadas += 1
+        else:
+            self.reutilizadas += 1
+        sentencia.resultado = resultado
+
+    def _analizar_nodo(self, nodo, nombres, entorno):
+        """Analiza una sentencia con solo las declaraciones globales que usa"""
+        analizador = self.analizador
+        tabla = analizador.tabla_simbolos
+        tabla.limpiar()
+        analizador.reiniciar()
+        for nombre, tipo in zip(nombres, entorno):
+            if tipo is not None:
+                tabla.valores[tabla.declarar(nombre, tipo)] = _SIN_VALOR
+        previos = len(tabla)
+        analizador.analizar_nodo(nodo)
+
+        declaracion = next(((tabla.nombre(s), tabla.tipos[s], tabla.valores[s])
+                            for s in range(previos, len(tabla)) if tabla.ambitos[s] == GLOBAL), None)
+        valores = tuple((tabla.nombre(s), tabla.valores[s])
+                        for s in range(previos) if tabla.valores[s] is not _SIN_VALOR)
+        plegadas = analizador.constantes
+        constantes = ()
+        if plegadas:
+            constantes = tuple((i, plegadas[id(operacion)])
+                               for i, operacion in enumerate(_operaciones(nodo)) if id(operacion) in plegadas)
+        return _Resultado(tuple(analizador.errores), declaracion, valores, constantes)
+
+    @property
+    def errores(self):
+        """Errores de todo el programa, en orden"""
+        return [error for sentencia in self.sentencias for error in sentencia.resultado.errores]
+
+    def errores_de(self, k):
+        """Errores de la k-ésima sentencia de nivel superior"""
+        return list(self.sentencias[k].resultado.errores)
+
+    def constantes(self, k):
+        """id(operación) -> Constante de cada operación plegada de la k-ésima sentencia"""
+        sentencia = self.sentencias[k]
+        plegadas = dict(sentencia.resultado.constantes)
+        if not plegadas:
+            return {}
+        return {id(operacion): plegadas[i]
+                for i, operacion in enumerate(_operaciones(sentencia.nodo)) if i in plegadas}
+
+    def globales(self):
+        """nombre -> {'tipo', 'valor'} de cada variable global, en orden de declaración"""
+        globales = {}
+        for sentencia in self.sentencias:
+            resultado = sentencia.resultado
+            for nombre, valor in resultado.valores:
+                if nombre in globales:
+                    globales[nombre]['valor'] = valor
+            if resultado.declaracion is not None:
+                nombre, tipo, valor = resultado.declaracion
+                globales.setdefault(nombre, {'tipo': tipo, 'valor': valor})
+        return globales
+
+
+def _iguales(anteriores, nuevos, limite):
+    """Cantidad de elementos iniciales (hasta limite) que son los mismos objetos en ambas secuencias"""
+    # Todo en C: se detiene en el primer par distinto
+    distintos = map(operator.is_not, anteriores, nuevos)
+    return min(next(itertools.compress(itertools.count(), distintos), limite), limite)
+
+
+def analizar_completo(ast, nombres=None):
+    """(errores, globales) de analizar todo el programa de una vez, como referencia"""
+    analizador = AnalizadorSemantico(nombres, maximo_errores=None)
+    analizador.analizar(ast)
+    tabla = analizador.tabla_simbolos
+    globales = {tabla.nombre(s): {'tipo': tabla.tipos[s], 'valor': tabla.valores[s]}
+                for s in range(len(tabla)) if tabla.ambitos[s] == GLOBAL}
+    return list(analizador.errores), globales
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from parser_incremental import ParserIncremental
+
+    codigo = "".join(f"entero v{i} = {i} * 2;\nv{i} = v{i} + 1;\n"
+                     f"si (v{i} > 3) {{ entero w{i} = v{i}; print(w{i}); }}\n" for i in range(2000))
+    incremental = ParserIncremental(codigo)
+    analisis = AnalizadorIncremental()
+    inicio = time.perf_counter()
+    analisis.actualizar(incremental.ast)
+    print(f"Análisis inicial: {len(analisis)} sentencias en {time.perf_counter() - inicio:.3f} s")
+
+    # Cambiar una constante: solo se analiza esa sentencia
+    posicion = codigo.index("v1000 = 1000 * 2") + len("v1000 = ")
+    incremental.editar(posicion, 4, "7")
+    inicio = time.perf_counter()
+    analisis.actualizar(incremental.ast)
+    print(f"Cambio de un valor: {analisis.analizadas} analizadas en {(time.perf_counter() - inicio) * 1e3:.2f} ms")
+
+    # Renombrar una declaración: también sus dependientes, que ahora tienen errores
+    incremental.editar(posicion - len("v1000 = "), 5, "z1000")
+    analisis.actualizar(incremental.ast)
+    print(f"Renombrar una variable: {analisis.analizadas} analizadas, errores: {analisis.errores}")
+
+    # Ediciones al azar (insertar o borrar líneas) comparadas con analizar todo el programa
+    aleatorio = random.Random(0)
+    incremental = ParserIncremental("".join(f"entero v{i} = {i};\nv{i} = v{i} + 1;\n" for i in range(20)))
+    analisis = AnalizadorIncremental()
+    analisis.actualizar(incremental.ast)
+    lineas = ("entero v5 = 1;\n", "v7 = 2 * 3;\n", "decimal q = 1.5;\n", "q = v9;\n", "print(v2);\n",
+              "si (v1 < 2) { v2 = 3; entero t = 4; }\n", "para (entero v3 = 0; v3 < 2; v3 = v3 + 1) { v4 = v3; }\n")
+    iguales = 0
+    for _ in range(300):
+        inicios = [0] + [k + 1 for k, letra in enumerate(incremental.texto) if letra == '\n']
+        k = aleatorio.randrange(len(inicios) - 1)
+        if aleatorio.random() < 0.4:
+            ast = incremental.editar(inicios[k], inicios[k + 1] - inicios[k], "")
+        else:
+            ast = incremental.editar(inicios[k], 0, aleatorio.choice(lineas))
+        analisis.actualizar(ast)
+        iguales += (analisis.errores, analisis.globales()) == analizar_completo(ast)
+    print(f"{iguales}/300 ediciones con los mismos errores y globales que el análisis completo")
@@ -0,0 +1,163 @@
+"""
+Tabla de símbolos con ámbitos de bloque.
+
+Es la única tabla de símbolos del compilador: el parser la llena mientras
+reduce y el análisis semántico, la verificación de tipos y la generación de
+código intermedio la vuelven a recorrer, abriendo y cerrando los mismos
+ámbitos (ver pasadas.py).
+
+Cada símbolo es un índice en arreglos paralelos (nombre, tipo, valor,
+constante, ámbito) en lugar de un diccionario por variable. visible[id del
+nombre] guarda el último símbolo declarado con ese nombre, así que buscar es
+O(1), y cerrar un ámbito solo lo marca como cerrado: sus símbolos dejan de
+ser visibles sin recorrerlos.
+
+Cada bloque de si/sino/eoc/mientras/para abre un ámbito, y la inicialización
+de un para pertenece a un ámbito propio del para. No se puede declarar un
+nombre que sigue visible desde un ámbito exterior (no hay ocultamiento): dos
+variables vivas nunca comparten nombre y el código intermedio puede seguir
+usando los nombres tal cual.
+"""
+import sys
+from array import array
+
+from nombres import TablaNombres
+
+# Ámbito global, abierto durante todo el análisis
+GLOBAL = 0
+
+
+def en_linea(linea):
+    return f" en línea {linea}" if linea is not None else ""
+
+
+class TablaSimbolos:
+    """Símbolos de una compilación en arreglos paralelos indexados por id de símbolo"""
+    __slots__ = ('nombres', 'ids_nombre', 'tipos', 'valores', 'constantes', 'ambitos',
+                 'visible', 'abiertos', 'pila', 'diagnosticos')
+
+    def __init__(self, nombres=None):
+        self.nombres = nombres if nombres is not None else TablaNombres()
+        # Con None cada error se lanza como excepción y detiene el análisis;
+        # parse_con_diagnosticos pone aquí una lista para seguir analizando
+        self.diagnosticos = None
+        self.limpiar()
+
+    def limpiar(self):
+        """Elimina todos los símbolos y deja abierto solo el ámbito global"""
+        self.ids_nombre = array('i')
+        self.tipos = []
+        self.valores = []
+        self.constantes = bytearray()
+        self.ambitos = array('i')
+        # id de nombre -> último símbolo declarado con ese nombre (-1 si ninguno)
+        self.visible = array('i')
+        # Un byte por ámbito abierto alguna vez: 1 mientras sigue abierto
+        self.abiertos = bytearray(b'\x01')
+        self.pila = [GLOBAL]
+
+    def abrir_ambito(self):
+        self.pila.append(len(self.abiertos))
+        self.abiertos.append(1)
+
+    def cerrar_ambito(self):
+        """Cierra el ámbito actual; sus símbolos dejan de ser visibles"""
+        if len(self.pila) > 1:
+            self.abiertos[self.pila.pop()] = 0
+
+    def profundidad(self):
+        """Cantidad de ámbitos abiertos dentro del global"""
+        return len(self.pila) - 1
+
+    def _visible(self, id_nombre):
+        if id_nombre is None or id_nombre >= len(self.visible):
+            return None
+        simbolo = self.visible[id_nombre]
+        if simbolo < 0 or not self.abiertos[self.ambitos[simbolo]]:
+            return None
+        return simbolo
+
+    def buscar(self, nombre):
+        """Id del símbolo visible con ese nombre, o None"""
+        try:
+            simbolo = self.visible[self.nombres.ids[nombre]]
+        except (KeyError, IndexError):
+            return None
+        if simbolo < 0 or not self.abiertos[self.ambitos[simbolo]]:
+            return None
+        return simbolo
+
+    def declarar(self, nombre, tipo, valor=None, constante=False):
+        """Declara el nombre en el ámbito actual; devuelve el id del símbolo, o None si ya está visible"""
+        id_nombre = self.nombres.internar(nombre)
+        if self._visible(id_nombre) is not None:
+            return None
+        visible = self.visible
+        if id_nombre >= len(visible):
+            visible.extend(array('i', [-1]) * (id_nombre + 1 - len(visible)))
+        simbolo = len(self.tipos)
+        visible[id_nombre] = simbolo
+        self.ids_nombre.append(id_nombre)
+        self.tipos.append(tipo)
+        self.valores.append(valor)
+        self.constantes.append(constante)
+        self.ambitos.append(self.pila[-1])
+        return simbolo
+
+    def nombre(self, simbolo):
+        return self.nombres.nombre(self.ids_nombre[simbolo])
+
+    def reportar(self, mensaje):
+        """Lanza el error o, si se están recolectando diagnósticos, lo agrega a la lista"""
+        if self.diagnosticos is None:
+            raise Exception(mensaje)
+        self.diagnosticos.append(mensaje)
+
+    def agregar(self, nombre, tipo, valor=None, linea=None):
+        """Declara el nombre o reporta que ya estaba declarado"""
+        simbolo = self.declarar(nombre, tipo, valor)
+        if simbolo is None:
+            # Al recolectar diagnósticos se conserva la primera declaración
+            self.reportar(f"Error semántico{en_linea(linea)}: La variable '{nombre}' ya ha sido declarada")
+        return simbolo
+
+    def obtener(self, nombre, linea=None):
+        """Id del símbolo, o None si no está declarado y se recolectan diagnósticos"""
+        simbolo = self.buscar(nombre)
+        if simbolo is None:
+            self.reportar(f"Error semántico{en_linea(linea)}: La variable '{nombre}' no ha sido declarada")
+        return simbolo
+
+    def __contains__(self, nombre):
+        return self.buscar(nombre) is not None
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def items(self):
+        """(nombre, entrada) de cada símbolo declarado, en orden de declaración"""
+        for simbolo in range(len(self.tipos)):
+            yield self.nombre(simbolo), {'tipo': self.tipos[simbolo],
+                                         'valor': self.valores[simbolo],
+                                         'constante': bool(self.constantes[simbolo])}
+
+    def memoria(self):
+        """Bytes de los arreglos de la tabla (sin contar los valores)"""
+        return sum(map(sys.getsizeof, (self.ids_nombre, self.tipos, self.valores, self.constantes,
+                                       self.ambitos, self.visible, self.abiertos, self.pila)))
+
+
+if __name__ == "__main__":
+    tabla = TablaSimbolos()
+    tabla.agregar('x', 'entero', 1)
+    tabla.abrir_ambito()
+    tabla.agregar('y', 'decimal', 2.5)
+    print("dentro del bloque:", 'x' in tabla, 'y' in tabla)
+    tabla.cerrar_ambito()
+    print("después del bloque:", 'x' in tabla, 'y' in tabla)
+    tabla.abrir_ambito()
+    print("y se puede declarar en otro bloque:", tabla.declarar('y', 'entero') is not None)
+    print("x no se puede ocultar:", tabla.declarar('x', 'entero') is None)
+    tabla.cerrar_ambito()
+    for nombre, entrada in tabla.items():
+        print(f"{nombre}: {entrada}")
@@ -0,0 +1,321 @@
+"""
+Análisis de terminación de los bucles.
+
+Un bucle que no termina deja colgado al proceso que ejecuta el programa.
+AnalizadorTerminacion es una Pasada (ver pasadas.py) que clasifica cada
+mientras y para antes de generar código:
+
+- TERMINA: se demuestra que termina. O su condición es falsa al llegar al
+  bucle, o compara una variable de inducción entera con un límite que el
+  bucle no modifica, y la variable se acerca al límite en cada iteración.
+  Una variable de inducción cambia solo con `v = v + k` o `v = v - k` (k
+  constante) en el nivel superior del cuerpo o en el incremento del para.
+- NO_TERMINA: si el bucle se ejecuta, no termina: ninguna variable de su
+  condición cambia en el cuerpo ni en el incremento, o la variable de
+  inducción se aleja del límite. Es un error de compilación, salvo que la
+  condición sea falsa al llegar al bucle.
+- PRESUPUESTO: no se pudo demostrar ninguna de las dos cosas. El código
+  final ejecuta el bucle con un presupuesto de iteraciones (ver codegen.py).
+
+El valor de una variable al llegar a un bucle se conoce solo si se le asignó
+una expresión constante fuera de toda sentencia compuesta; una asignación
+dentro de un si o de un bucle lo vuelve desconocido.
+"""
+import operator
+
+from diagnosticos import Diagnosticos, MAXIMO_ERRORES
+from pasadas import HIJOS, Pasada
+from plegado import constante, plegar, plegar_expresion
+from recorridos import en_orden, reducir_expresion
+from simbolos import TablaSimbolos
+from tipos import ENTERO, tipo_literal
+
+TERMINA = 'termina'
+PRESUPUESTO = 'presupuesto'
+NO_TERMINA = 'no_termina'
+
+# Iteraciones que puede hacer un bucle marcado con PRESUPUESTO antes de abortar el programa
+PRESUPUESTO_ITERACIONES = 1_000_000
+
+COMPARAR = {'==': operator.eq, '!=': operator.ne, '<': operator.lt,
+            '>': operator.gt, '<=': operator.le, '>=': operator.ge}
+
+# a op b es lo mismo que b INVERSO[op] a
+INVERSO = {'==': '==', '!=': '!=', '<': '>', '>': '<', '<=': '>=', '>=': '<='}
+
+# Signo del paso que acerca la variable al límite en v op límite
+_SENTIDO = {'<': 1, '<=': 1, '>': -1, '>=': -1}
+
+
+class Bucle:
+    """Clasificación de un mientras o un para"""
+    __slots__ = ('nodo', 'veredicto', 'motivo', 'induccion')
+
+    def __init__(self, nodo, veredicto, motivo, induccion=None):
+        self.nodo = nodo
+        self.veredicto = veredicto
+        self.motivo = motivo
+        # (variable, paso) de la variable de inducción de la condición, si la hay
+        self.induccion = induccion
+
+    def __repr__(self):
+        return f"Bucle({self.veredicto!r}, {self.motivo!r})"
+
+
+def texto_condicion(condicion):
+    """La condición como en el código fuente, para los mensajes"""
+    _, operador, izquierdo, derecho = condicion
+    return (" ".join(map(str, en_orden(izquierdo, str))) + f" {operador} "
+            + " ".join(map(str, en_orden(derecho, str))))
+
+
+def nombres_expresion(nodo):
+    """Nombres de variable que lee una expresión o condición"""
+    nombres = set()
+    pila = [nodo]
+    while pila:
+        n = pila.pop()
+        if n.__class__ is tuple:
+            if n[0] in ('operacion', 'condicion'):
+                pila.append(n[2])
+                pila.append(n[3])
+        elif n.__class__ is str and tipo_literal(n) is None:
+            nombres.add(n)
+    return nombres
+
+
+def asignaciones(bloque):
+    """
+    Genera (asignación, incondicional) de cada asignación de un bloque, en
+    cualquier nivel. incondicional es True si se ejecuta siempre que se
+    ejecuta el bloque (no está dentro de un si ni de otro bucle).
+    """
+    pila = [(sentencia, True) for sentencia in reversed(bloque)]
+    while pila:
+        nodo, incondicional = pila.pop()
+        if nodo.__class__ is not tuple:
+            continue
+        if nodo[0] == 'asignacion':
+            yield nodo, incondicional
+        elif nodo[0] in HIJOS:
+            for posicion in reversed(HIJOS[nodo[0]]):
+                hijo = nodo[posicion]
+                hijos = hijo if hijo.__class__ is list else [hijo]
+                pila.extend((sentencia, False) for sentencia in reversed(hijos))
+
+
+def _plegar_nodo(nodo, izquierdo, derecho):
+    if izquierdo is None or derecho is None:
+        return None
+    return plegar(nodo[1], izquierdo, derecho)
+
+
+class AnalizadorTerminacion(Pasada):
+    """
+    Clasifica cada bucle del programa y reporta los que no terminan.
+
+    Args:
+        nombres: Tabla de nombres de la compilación
+        maximo_errores (int): Cantidad de errores tras la cual se lanza
+            DemasiadosErrores
+        tabla_simbolos: La tabla de símbolos de la compilación (ver simbolos.py)
+        presupuesto (int): Iteraciones permitidas a los bucles marcados con PRESUPUESTO
+    """
+    def __init__(self, nombres=None, maximo_errores=MAXIMO_ERRORES, tabla_simbolos=None,
+                 presupuesto=PRESUPUESTO_ITERACIONES):
+        self.tabla_simbolos = tabla_simbolos if tabla_simbolos is not None else TablaSimbolos(nombres)
+        self.errores = Diagnosticos(maximo_errores)
+        self.presupuesto = presupuesto
+        # id(nodo) -> Bucle de cada mientras y para
+        self.bucles = {}
+        # Mantiene vivos los nodos clasificados para que su id no se reutilice
+        self._nodos = []
+        # símbolo -> Constante que la variable tiene seguro en este punto del programa
+        self._conocidos = {}
+        # Sentencias compuestas abiertas: dentro de ellas una asignación puede no ejecutarse
+        self._anidamiento = 0
+
+    def analizar(self, ast):
+        """Clasifica los bucles de un programa (lista de sentencias); devuelve True si no hubo errores"""
+        self.recorrido.recorrer(ast)
+        return not self.errores
+
+    def bucle(self, nodo):
+        """Bucle con la clasificación de un mientras o un para (None si no se analizó)"""
+        return self.bucles.get(id(nodo))
+
+    def con_presupuesto(self, nodo):
+        """True si el bucle debe ejecutarse con un presupuesto de iteraciones"""
+        bucle = self.bucles.get(id(nodo))
+        return bucle is not None and bucle.veredicto == PRESUPUESTO
+
+    def visitar_declaracion(self, nodo, simbolo):
+        if simbolo is not None:
+            self._asignar(simbolo, nodo[3] if len(nodo) > 3 else None)
+
+    def visitar_asignacion(self, nodo, simbolo):
+        if simbolo is not None:
+            self._asignar(simbolo, nodo[2])
+
+    def _asignar(self, simbolo, valor):
+        valor = self.valor(valor) if valor is not None and not self._anidamiento else None
+        if valor is None:
+            self._conocidos.pop(simbolo, None)
+        else:
+            self._conocidos[simbolo] = valor
+
+    def entrar_si(self, nodo):
+        self._anidamiento += 1
+
+    def salir_si(self, nodo):
+        self._anidamiento -= 1
+
+    entrar_si_sino = entrar_si_sino_eoc = entrar_si_eoc = entrar_si
+    salir_si_sino = salir_si_sino_eoc = salir_si_eoc = salir_si
+
+    def entrar_mientras(self, nodo):
+        _, condicion, bloque = nodo
+        self._clasificar(nodo, 'mientras', condicion, list(asignaciones(bloque)))
+        self._anidamiento += 1
+
+    def salir_mientras(self, nodo):
+        self._anidamiento -= 1
+
+    def parte_para(self, nodo, indice):
+        # Después de la inicialización: la variable del para ya tiene su valor inicial
+        if indice == 1:
+            _, _, condicion, incremento, bloque = nodo
+            cambios = list(asignaciones(bloque))
+            cambios.extend(asignaciones([incremento]))
+            self._clasificar(nodo, 'para', condicion, cambios)
+            self._anidamiento += 1
+
+    def salir_para(self, nodo):
+        self._anidamiento -= 1
+
+    def valor(self, nodo):
+        """Constante de una expresión con los valores conocidos en este punto, o None"""
+        return reducir_expresion(nodo, self._valor_hoja, _plegar_nodo)
+
+    def _valor_hoja(self, nodo):
+        resultado = constante(nodo)
+        if resultado is None and nodo.__class__ is str:
+            simbolo = self.tabla_simbolos.buscar(nodo)
+            if simbolo is not None:
+                return self._conocidos.get(simbolo)
+        return resultado
+
+    def _al_entrar(self, condicion):
+        """Valor de la condición al llegar al bucle: True, False o None si no se conoce"""
+        _, operador, izquierdo, derecho = condicion
+        izquierdo, derecho = self.valor(izquierdo), self.valor(derecho)
+        if izquierdo is None or derecho is None:
+            return None
+        try:
+            return bool(COMPARAR[operador](izquierdo.valor, derecho.valor))
+        except TypeError:
+            return None
+
+    def _clasificar(self, nodo, tipo, condicion, cambios):
+        """Clasifica un bucle; cambios son las (asignación, incondicional) de su cuerpo e incremento"""
+        bucle = self._veredicto(nodo, condicion, cambios)
+        self.bucles[id(nodo)] = bucle
+        self._nodos.append(nodo)
+        if bucle.veredicto == NO_TERMINA:
+            self.errores.append(f"Error de terminación: el bucle {tipo} ({texto_condicion(condicion)}) "
+                                f"no termina si se ejecuta: {bucle.motivo}")
+        # Lo que el bucle modifica deja de tener un valor conocido, también dentro del bucle
+        for asignacion, _ in cambios:
+            simbolo = self.tabla_simbolos.buscar(asignacion[1])
+            if simbolo is not None:
+                self._conocidos.pop(simbolo, None)
+
+    def _veredicto(self, nodo, condicion, cambios):
+        if self._al_entrar(condicion) is False:
+            return Bucle(nodo, TERMINA, "la condición es falsa al llegar al bucle")
+        variables = nombres_expresion(condicion)
+        modificadas = {asignacion[1] for asignacion, _ in cambios}
+        if not variables & modificadas:
+            if not variables:
+                return Bucle(nodo, NO_TERMINA, "la condición es constante")
+            return Bucle(nodo, NO_TERMINA, "ninguna variable de la condición cambia en el bucle")
+
+        # Paso por iteración de cada variable de la condición (None si no es de inducción)
+        pasos = {}
+        for asignacion, incondicional in cambios:
+            variable = asignacion[1]
+            if variable not in variables or (variable in pasos and pasos[variable] is None):
+                continue
+            paso = _paso(variable, asignacion[2]) if incondicional else None
+            pasos[variable] = None if paso is None else pasos.get(variable, 0) + paso
+
+        _, operador, izquierdo, derecho = condicion
+        if _es_nombre(izquierdo) and pasos.get(izquierdo) is not None \
+                and not nombres_expresion(derecho) & modificadas:
+            variable = izquierdo
+        elif _es_nombre(derecho) and pasos.get(derecho) is not None \
+                and not nombres_expresion(izquierdo) & modificadas:
+            variable, operador = derecho, INVERSO[operador]
+        else:
+            return Bucle(nodo, PRESUPUESTO, "no hay una variable de inducción comparada con un límite fijo")
+        paso = pasos[variable]
+        induccion = (variable, paso)
+        if paso == 0:
+            return Bucle(nodo, NO_TERMINA, f"{variable} no cambia (paso 0)", induccion)
+        sentido = _SENTIDO.get(operador)
+        if sentido is not None and sentido * paso < 0:
+            return Bucle(nodo, NO_TERMINA, f"{variable} se aleja del límite (paso {paso})", induccion)
+        # Un paso decimal puede perderse al redondear; solo se demuestra con enteros
+        simbolo = self.tabla_simbolos.buscar(variable)
+        entera = simbolo is not None and self.tabla_simbolos.tipos[simbolo] == ENTERO and isinstance(paso, int)
+        if entera and operador != '!=':
+            return Bucle(nodo, TERMINA, f"{variable} se acerca al límite (paso {paso})", induccion)
+        return Bucle(nodo, PRESUPUESTO, f"no se puede demostrar que {variable} alcance el límite", induccion)
+
+
+def _es_nombre(nodo):
+    return nodo.__class__ is str and tipo_literal(nodo) is None
+
+
+def _paso(variable, valor):
+    """k si valor es variable + k, k + variable o variable - k con k constante numérica; si no, None"""
+    if valor.__class__ is not tuple or valor[0] != 'operacion' or valor[1] not in ('+', '-'):
+        return None
+    _, operador, izquierdo, derecho = valor
+    if izquierdo == variable and _es_nombre(izquierdo):
+        incremento = plegar_expresion(derecho)
+    elif operador == '+' and derecho == variable and _es_nombre(derecho):
+        incremento = plegar_expresion(izquierdo)
+    else:
+        return None
+    if incremento is None or not isinstance(incremento.valor, (int, float)) or isinstance(incremento.valor, bool):
+        return None
+    return incremento.valor if operador == '+' else -incremento.valor
+
+
+if __name__ == "__main__":
+    from parser import ParserSession
+
+    codigo = """entero x = 5;
+entero n = 10;
+mientras (x > 0) { x = x - 1; }
+para (entero i = 0; i < n; i++) { print(i); }
+para (entero j = 10; j > 0; j--) { print(j); }
+mientras (x < 3) { si (x > 1) { x = x + 2; } }
+decimal d = 0.5;
+mientras (d < 2.0) { d = d + 0.1; }
+mientras (x > 100) { print(x); }
+entero y = 1;
+mientras (y > 0) { print(y); }
+para (entero k = 0; k < 5; k = k - 1) { print(k); }
+"""
+    ast = ParserSession().parse(codigo)
+    analizador = AnalizadorTerminacion()
+    print("sin errores:", analizador.analizar(ast))
+    for nodo in ast:
+        bucle = analizador.bucle(nodo)
+        if bucle is not None:
+            print(f"- {nodo[0]} ({texto_condicion(nodo[1] if nodo[0] == 'mientras' else nodo[2])}): "
+                  f"{bucle.veredicto}, {bucle.motivo}")
+    for error in analizador.errores:
+        print(error)
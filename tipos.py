@@ -0,0 +1,36 @@
+"""
+Tipos del lenguaje y tipo de los literales del AST.
+
+En el AST de tuplas los números son int y float, los booleanos son las
+cadenas 'true' y 'false' (palabras reservadas, nunca identificadores) y los
+caracteres son Caracter, una cadena que el parser crea para distinguir el
+literal 'a' del identificador a.
+"""
+
+ENTERO = 'entero'
+DECIMAL = 'decimal'
+CARACTER = 'caracter'
+BOOLEANO = 'booleano'
+
+TIPOS = (ENTERO, DECIMAL, CARACTER, BOOLEANO)
+NUMERICOS = frozenset((ENTERO, DECIMAL))
+
+# Literales booleanos tal como los deja el lexer
+BOOLEANOS = {'true': True, 'false': False}
+
+
+class Caracter(str):
+    """Literal caracter: se compara, se imprime y se hashea igual que su texto"""
+    __slots__ = ()
+
+
+# Tipo de cada clase de literal del AST (bool no es un literal del lenguaje)
+_TIPO_CLASE = {int: ENTERO, float: DECIMAL, Caracter: CARACTER}
+
+
+def tipo_literal(nodo):
+    """Tipo del literal, o None si el nodo es un identificador o no es un literal"""
+    tipo = _TIPO_CLASE.get(nodo.__class__)
+    if tipo is None and nodo.__class__ is str and nodo in BOOLEANOS:
+        return BOOLEANO
+    return tipo